@@ -0,0 +1,36 @@
+"""Add GIN index for task tag containment
+
+Revision ID: 20261016_0900
+Revises: 20250909_2320
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016_0900'
+down_revision: Union[str, Sequence[str], None] = '20250909_2320'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index tasks.tags for @> containment (PostgreSQL only)."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # The expression must match TaskService._json_array_contains: CAST(tags AS JSONB) @> :tags
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_tags_gin "
+        "ON tasks USING gin ((tags::jsonb) jsonb_path_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Drop the tag containment index."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_tasks_tags_gin")
@@ -0,0 +1,36 @@
+"""Add full-text search index for tasks
+
+Revision ID: 20261016_0930
+Revises: 20261016_0900
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016_0930'
+down_revision: Union[str, Sequence[str], None] = '20261016_0900'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index the task search document for @@ queries (PostgreSQL only)."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # The expression must match TaskService._search_document
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_search_gin ON tasks USING gin "
+        "(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '')))"
+    )
+
+
+def downgrade() -> None:
+    """Drop the full-text search index."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_tasks_search_gin")
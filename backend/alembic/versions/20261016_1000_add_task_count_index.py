@@ -0,0 +1,33 @@
+"""Add composite index for filtered task counts
+
+Revision ID: 20261016_1000
+Revises: 20261016_0930
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016_1000'
+down_revision: Union[str, Sequence[str], None] = '20261016_0930'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the (status, assigned_agent_id, created_at) index."""
+    op.create_index(
+        'ix_tasks_status_agent_created',
+        'tasks',
+        ['status', 'assigned_agent_id', 'created_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop the (status, assigned_agent_id, created_at) index."""
+    op.drop_index('ix_tasks_status_agent_created', table_name='tasks')
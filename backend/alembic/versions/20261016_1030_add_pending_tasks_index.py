@@ -0,0 +1,44 @@
+"""Add partial index for the pending task queue
+
+Revision ID: 20261016_1030
+Revises: 20261016_1000
+Create Date: 2026-10-16 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016_1030'
+down_revision: Union[str, Sequence[str], None] = '20261016_1000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index pending tasks in TaskService.get_pending_tasks order."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # Ordered like ORDER BY priority DESC, created_at ASC so no sort node is needed;
+        # INCLUDE allows index-only scans for the agent filter
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_pending_sched "
+            "ON tasks (priority DESC, created_at ASC) "
+            "INCLUDE (assigned_agent_id, name) "
+            "WHERE status = 'PENDING'"
+        )
+    else:
+        op.create_index(
+            'ix_tasks_pending_sched',
+            'tasks',
+            [sa.text('priority DESC'), 'created_at'],
+            unique=False,
+            sqlite_where=sa.text("status = 'PENDING'")
+        )
+
+
+def downgrade() -> None:
+    """Drop the pending task index."""
+    op.drop_index('ix_tasks_pending_sched', table_name='tasks')
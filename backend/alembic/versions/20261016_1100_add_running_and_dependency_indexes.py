@@ -0,0 +1,43 @@
+"""Add indexes for running tasks and dependency lookups
+
+Revision ID: 20261016_1100
+Revises: 20261016_1030
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016_1100'
+down_revision: Union[str, Sequence[str], None] = '20261016_1030'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the running-task partial index and the dependency GIN index."""
+    op.create_index(
+        'ix_tasks_running_agent',
+        'tasks',
+        ['assigned_agent_id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'RUNNING'"),
+        sqlite_where=sa.text("status = 'RUNNING'")
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        # The expression must match TaskService._json_array_contains: CAST(dependencies AS JSONB) @> :ids
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_dependencies_gin "
+            "ON tasks USING gin ((dependencies::jsonb) jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Drop the running-task and dependency indexes."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_tasks_dependencies_gin")
+    op.drop_index('ix_tasks_running_agent', table_name='tasks')
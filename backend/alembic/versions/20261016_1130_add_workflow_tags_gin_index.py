@@ -0,0 +1,36 @@
+"""Add GIN index for workflow tag containment
+
+Revision ID: 20261016_1130
+Revises: 20261016_1100
+Create Date: 2026-10-16 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016_1130'
+down_revision: Union[str, Sequence[str], None] = '20261016_1100'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index workflows.tags for @> containment (PostgreSQL only)."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # The expression must match WorkflowService.search_workflows: CAST(tags AS JSONB) @> :tags
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_workflows_tags_gin "
+        "ON workflows USING gin ((tags::jsonb) jsonb_path_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Drop the tag containment index."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_workflows_tags_gin")
@@ -0,0 +1,41 @@
+"""Add trigram indexes for workflow keyword search
+
+Revision ID: 20261016_1200
+Revises: 20261016_1130
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016_1200'
+down_revision: Union[str, Sequence[str], None] = '20261016_1130'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index workflows.name/description for ILIKE '%term%' (PostgreSQL only)."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_workflows_name_trgm "
+        "ON workflows USING gin (name gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_workflows_description_trgm "
+        "ON workflows USING gin (description gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Drop the trigram indexes (the pg_trgm extension is left installed)."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_workflows_description_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_workflows_name_trgm")
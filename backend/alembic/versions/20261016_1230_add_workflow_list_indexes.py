@@ -0,0 +1,54 @@
+"""Add composite and partial indexes for workflow listing
+
+Revision ID: 20261016_1230
+Revises: 20261016_1200
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016_1230'
+down_revision: Union[str, Sequence[str], None] = '20261016_1200'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index the filter set used by workflow list/search endpoints."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # INCLUDE allows index-only scans for id/name listings
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_workflows_list "
+            "ON workflows (is_active, status, workflow_type, category, created_at DESC) "
+            "INCLUDE (id, name)"
+        )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_workflows_active "
+            "ON workflows (status, created_at DESC) "
+            "WHERE is_active"
+        )
+    else:
+        op.create_index(
+            'ix_workflows_list',
+            'workflows',
+            ['is_active', 'status', 'workflow_type', 'category', sa.text('created_at DESC')],
+            unique=False
+        )
+        op.create_index(
+            'ix_workflows_active',
+            'workflows',
+            ['status', sa.text('created_at DESC')],
+            unique=False,
+            sqlite_where=sa.text('is_active = 1')
+        )
+
+
+def downgrade() -> None:
+    """Drop the workflow listing indexes."""
+    op.drop_index('ix_workflows_active', table_name='workflows')
+    op.drop_index('ix_workflows_list', table_name='workflows')
@@ -0,0 +1,40 @@
+"""Make workflow names unique
+
+Revision ID: 20261016_1300
+Revises: 20261016_1230
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016_1300'
+down_revision: Union[str, Sequence[str], None] = '20261016_1230'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace the plain name index with a unique one.
+
+    WorkflowService.create_workflow relies on it for ON CONFLICT (name).
+    Existing duplicates keep the name on their oldest row; the others are
+    renamed to "<name> (<id>)", truncated to fit the 255-character column.
+    """
+    op.execute(
+        "UPDATE workflows "
+        "SET name = substr(name, 1, 240) || ' (' || CAST(id AS VARCHAR(12)) || ')' "
+        "WHERE id NOT IN (SELECT MIN(id) FROM workflows GROUP BY name)"
+    )
+    op.drop_index(op.f('ix_workflows_name'), table_name='workflows')
+    op.create_index(op.f('ix_workflows_name'), 'workflows', ['name'], unique=True)
+
+
+def downgrade() -> None:
+    """Restore the non-unique name index."""
+    op.drop_index(op.f('ix_workflows_name'), table_name='workflows')
+    op.create_index(op.f('ix_workflows_name'), 'workflows', ['name'], unique=False)
@@ -0,0 +1,41 @@
+"""Add partial index for workflow template listing
+
+Revision ID: 20261016_1330
+Revises: 20261016_1300
+Create Date: 2026-10-16 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016_1330'
+down_revision: Union[str, Sequence[str], None] = '20261016_1300'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index template rows in WorkflowService.get_workflow_templates order."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_workflows_templates "
+            "ON workflows (id DESC) "
+            "WHERE is_template"
+        )
+    else:
+        op.create_index(
+            'ix_workflows_templates',
+            'workflows',
+            [sa.text('id DESC')],
+            unique=False,
+            sqlite_where=sa.text('is_template = 1')
+        )
+
+
+def downgrade() -> None:
+    """Drop the template listing index."""
+    op.drop_index('ix_workflows_templates', table_name='workflows')
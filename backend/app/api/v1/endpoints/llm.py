@@ -261,6 +261,43 @@ async def get_llm_status(provider: LLMProvider, db: Session = Depends(get_db)):
         )
 
 
+@router.get("/status")
+async def get_all_llm_statuses(db: Session = Depends(get_db)):
+    """
+    并发获取所有LLM提供商的连接状态
+
+    Args:
+        db: 数据库会话
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 以提供商为键的连接状态信息
+    """
+    try:
+        llm_service = LLMService(db)
+        statuses = await llm_service.get_all_connection_statuses()
+
+        # 转换数据结构以匹配前端期望的格式
+        return {
+            provider: {
+                "provider": status_info["provider"],
+                "is_connected": status_info["status"] == "connected",
+                "last_test_time": status_info.get("last_check"),
+                "error_message": (
+                    status_info["message"]
+                    if status_info["status"] != "connected"
+                    else None
+                ),
+            }
+            for provider, status_info in statuses.items()
+        }
+    except Exception as e:
+        logger.error(f"Failed to get LLM statuses: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get LLM statuses: {str(e)}",
+        )
+
+
 @router.get("/models/{provider}")
 async def get_available_models(provider: LLMProvider):
     """
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import Any, List
+from typing import Any, List, Optional
 import logging
 import json
 
@@ -20,11 +20,16 @@ def read_workflow_templates(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = None,
 ) -> Any:
     """
     Retrieve workflow templates.
+
+    Pass the id of the last template received as `after_id` to fetch the next page.
     """
-    db_templates = workflow_service.get_workflow_templates(db, skip=skip, limit=limit)
+    db_templates = workflow_service.get_workflow_templates(
+        db, skip=skip, limit=limit, after_id=after_id
+    )
 
     # Manually construct the response to ensure correct date formatting and key casing
     response_data = []
@@ -126,6 +131,9 @@ def create_workflow_template(
             "usageCount": 0,
         }
         return JSONResponse(content=response_data)
+    except ValueError as e:
+        logger.warning(f"Rejected workflow template: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         # Log the full exception traceback to the console
         logger.error("Error creating workflow template:", exc_info=True)
@@ -11,7 +11,7 @@ from typing import List, Optional
 
 from app.core.database import get_db
 from app.schemas.workflow import WorkflowCreate, WorkflowUpdate, WorkflowResponse
-from app.services.workflow_service import WorkflowService
+from app.services.workflow_service import WorkflowService, workflow_service as shared_workflow_service
 
 # 创建路由器
 router = APIRouter()
@@ -39,8 +39,7 @@ async def create_workflow(
         # 记录接收到的数据
         logger.info(f"Received workflow data: {workflow_data.model_dump()}")
         
-        workflow_service = WorkflowService(db)
-        workflow = workflow_service.create_workflow(workflow_data)
+        workflow = shared_workflow_service.create_workflow(db, workflow_data)
         
         logger.info(f"Successfully created workflow with ID: {workflow.id}")
         return workflow
@@ -116,8 +115,8 @@ async def list_workflows(
                 # 如果状态值无效，忽略过滤
                 status_enum = None
         
-        workflow_service = WorkflowService(db)
-        workflows = workflow_service.list_workflows(
+        workflows = shared_workflow_service.list_workflows(
+            db,
             skip=skip, 
             limit=limit, 
             status=status_enum
@@ -177,8 +176,7 @@ async def update_workflow(
         WorkflowResponse: 更新后的工作流信息
     """
     try:
-        workflow_service = WorkflowService(db)
-        workflow = workflow_service.update_workflow(workflow_id, workflow_data)
+        workflow = shared_workflow_service.update_workflow(db, workflow_id, workflow_data)
         
         if not workflow:
             raise HTTPException(
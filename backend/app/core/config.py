@@ -42,6 +42,7 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "crewai_password"
     POSTGRES_DB: str = "crewai_studio"
     POSTGRES_PORT: int = 5432
+    DB_QUERY_CACHE_SIZE: int = 1200
 
     @validator("DATABASE_URL", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: dict) -> str:
@@ -131,6 +132,7 @@ class Settings(BaseSettings):
     # Ollama配置
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "llama2"
+    OLLAMA_TAGS_CACHE_TTL: float = 5.0  # 模型列表缓存时间（秒）
 
     # LLM提供商配置
     DEFAULT_LLM_PROVIDER: str = "openai"
@@ -140,6 +142,18 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
 
+    # 邮件通知配置
+    SMTP_HOST: Optional[str] = None
+    SMTP_PORT: int = 587
+    SMTP_USER: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_TLS: bool = True
+
+    # Webhook通知配置
+    DEFAULT_WEBHOOK_URL: Optional[str] = None
+    SLACK_WEBHOOK_URL: Optional[str] = None
+    DISCORD_WEBHOOK_URL: Optional[str] = None
+
     # 日志配置
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = (
@@ -157,6 +171,10 @@ class Settings(BaseSettings):
     MAX_CONCURRENT_TASKS: int = 5
     MAX_CONCURRENT_WORKFLOWS: int = 3
 
+    # 交互式Agent执行配置
+    MAX_CONCURRENT_AGENTS: int = 8
+    AGENT_EXECUTION_TIMEOUT: int = 600  # 秒
+
     class Config:
         """
         Pydantic配置类
@@ -27,6 +27,7 @@ engine = create_engine(
         else {}
     ),
     echo=settings.DEBUG,  # 开发环境下打印SQL语句
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,  # 编译后SQL语句的缓存条目数
 )
 
 # 创建会话工厂
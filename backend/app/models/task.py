@@ -1,6 +1,6 @@
 """Task数据模型"""
 
-from sqlalchemy import Column, String, Text, Boolean, JSON, Enum, Integer, ForeignKey
+from sqlalchemy import Column, String, Text, Boolean, JSON, Enum, Integer, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 import enum
@@ -32,6 +32,27 @@ class TaskType(enum.Enum):
 class Task(BaseModel):
     """AI任务数据模型"""
     __tablename__ = "tasks"
+    __table_args__ = (
+        # 支持按状态/Agent过滤的计数和按创建时间的分页
+        Index("ix_tasks_status_agent_created", "status", "assigned_agent_id", "created_at"),
+        # 运行中的任务按Agent查找
+        Index(
+            "ix_tasks_running_agent",
+            "assigned_agent_id",
+            postgresql_where=text("status = 'RUNNING'"),
+            sqlite_where=text("status = 'RUNNING'"),
+        ),
+        # 待执行队列，顺序与get_pending_tasks的ORDER BY一致
+        Index(
+            "ix_tasks_pending_sched",
+            text("priority DESC"), "created_at",
+            postgresql_include=["assigned_agent_id", "name"],
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+    )
+    # INSERT/UPDATE时通过RETURNING取回服务端生成的时间戳，TaskService提交后无需再refresh
+    __mapper_args__ = {"eager_defaults": True}
     
     # 基本信息
     name = Column(String(255), nullable=False, index=True)
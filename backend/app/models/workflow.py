@@ -1,6 +1,6 @@
 """Workflow数据模型"""
 
-from sqlalchemy import Column, String, Text, Boolean, JSON, Enum, Integer
+from sqlalchemy import Column, String, Text, Boolean, JSON, Enum, Integer, Index, text
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 import enum
@@ -34,9 +34,31 @@ class ExecutionMode(enum.Enum):
 class Workflow(BaseModel):
     """AI工作流数据模型"""
     __tablename__ = "workflows"
+    __table_args__ = (
+        # 列表/搜索的常用过滤组合，按创建时间倒序分页
+        Index(
+            "ix_workflows_list",
+            "is_active", "status", "workflow_type", "category", text("created_at DESC"),
+            postgresql_include=["id", "name"],
+        ),
+        # 绝大多数查询只关心激活的工作流
+        Index(
+            "ix_workflows_active",
+            "status", text("created_at DESC"),
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+        # 模板只占少数行，模板列表按ID倒序做键集分页
+        Index(
+            "ix_workflows_templates",
+            text("id DESC"),
+            postgresql_where=text("is_template"),
+            sqlite_where=text("is_template = 1"),
+        ),
+    )
     
     # 基本信息
-    name = Column(String(255), nullable=False, index=True)
+    name = Column(String(255), nullable=False, index=True, unique=True)
     description = Column(Text, nullable=True)
     version = Column(String(20), default="1.0.0", nullable=False)
     
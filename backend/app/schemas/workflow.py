@@ -1,10 +1,14 @@
 """Workflow相关的Pydantic schemas"""
 
+import re
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from ..models.workflow import WorkflowStatus, WorkflowType, ExecutionMode
 
+# 语义化版本号格式，如 1.0.0
+_SEMVER_RE = re.compile(r"^\d+\.\d+\.\d+$")
+
 
 class WorkflowBase(BaseModel):
     """Workflow基础模型"""
@@ -77,9 +81,7 @@ class WorkflowBase(BaseModel):
     @field_validator("version")
     @classmethod
     def validate_version(cls, v):
-        import re
-
-        if not re.match(r"^\d+\.\d+\.\d+$", v):
+        if not _SEMVER_RE.match(v):
             raise ValueError("Version must follow semantic versioning (e.g., 1.0.0)")
         return v
 
@@ -315,8 +317,11 @@ class WorkflowSearchRequest(BaseModel):
     sort_by: Optional[str] = Field("created_at", description="排序字段")
     sort_order: Optional[str] = Field("desc", description="排序方向")
 
-    # 分页
-    page: int = Field(1, ge=1, description="页码")
+    # 分页（键集分页：传入上一页最后一条记录的排序值与ID；
+    # 未传游标时按page做OFFSET分页，传入游标时忽略page）
+    cursor_sort_value: Optional[str] = Field(None, description="游标排序值")
+    cursor_id: Optional[int] = Field(None, description="游标ID")
+    page: int = Field(1, ge=1, description="页码（仅在未传游标时生效）")
     size: int = Field(20, ge=1, le=100, description="每页大小")
 
 
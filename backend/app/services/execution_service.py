@@ -1,11 +1,13 @@
 """执行服务层 - 处理任务和工作流的执行管理"""
 
-from typing import List, Optional, Dict, Any, Callable
+from typing import List, Optional, Dict, Any, Callable, Set
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 import json
 import logging
 import asyncio
+import atexit
+import heapq
 import uuid
 from enum import Enum
 from concurrent.futures import ThreadPoolExecutor, Future
@@ -21,6 +23,12 @@ from .crewai_service import CrewAIService
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# 执行状态
+EXECUTION_STATUSES = ("pending", "queued", "running", "completed", "failed", "cancelled")
+
+# 终态执行状态
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
 def _ensure_datetime(dt_value):
     """确保值是datetime对象，如果是字符串则转换为datetime"""
     if isinstance(dt_value, str):
@@ -90,11 +98,18 @@ class ExecutionService:
         finally:
             db.close()
         self.executor = ThreadPoolExecutor(max_workers=8)
+        # 兜底：进程退出时若未经过lifespan关闭，非阻塞地关闭线程池
+        atexit.register(self.executor.shutdown, wait=False)
         self.execution_contexts: Dict[str, ExecutionContext] = {}
+        # 按状态分组的执行ID集合，统计和筛选无需遍历全部上下文
+        self._by_status: Dict[str, Set[str]] = {status: set() for status in EXECUTION_STATUSES}
         self.execution_futures: Dict[str, Future] = {}
         self.execution_callbacks: Dict[str, List[Callable]] = {}
         self.lock = threading.Lock()
         
+        # 终态执行的完成时间索引（最小堆），清理时只需弹出过期项
+        self._terminal_by_time: List[tuple] = []
+        
         # 执行队列
         self.task_queue: List[ExecutionContext] = []
         self.workflow_queue: List[ExecutionContext] = []
@@ -113,6 +128,43 @@ class ExecutionService:
         """获取新的数据库会话"""
         return self.SessionLocal()
     
+    def _register_context(self, context: ExecutionContext) -> None:
+        """
+        登记新的执行上下文
+        
+        Args:
+            context: 执行上下文
+        """
+        with self.lock:
+            self.execution_contexts[context.execution_id] = context
+            self._by_status.setdefault(context.status, set()).add(context.execution_id)
+    
+    def _set_status(self, context: ExecutionContext, status: str) -> None:
+        """
+        更新执行状态并同步状态集合
+        
+        Args:
+            context: 执行上下文
+            status: 新状态
+        """
+        with self.lock:
+            self._by_status.setdefault(context.status, set()).discard(context.execution_id)
+            self._by_status.setdefault(status, set()).add(context.execution_id)
+            context.status = status
+    
+    def _mark_terminal(self, context: ExecutionContext, status: str) -> None:
+        """
+        将执行标记为终态并记录到完成时间索引
+        
+        Args:
+            context: 执行上下文
+            status: 终态状态
+        """
+        context.completed_at = datetime.utcnow()
+        self._set_status(context, status)
+        with self.lock:
+            heapq.heappush(self._terminal_by_time, (context.completed_at, context.execution_id))
+    
     async def execute_task(self, task_id: int, db: Session, inputs: Optional[Dict[str, Any]] = None, user_id: Optional[str] = None) -> str:
         """
         执行单个任务
@@ -144,8 +196,7 @@ class ExecutionService:
             meta_data={"task_name": task.name, "task_type": task.task_type.value if task.task_type else None}
         )
         
-        with self.lock:
-            self.execution_contexts[execution_id] = context
+        self._register_context(context)
         
         # 检查是否可以立即执行
         if self.current_task_executions < self.max_concurrent_tasks:
@@ -153,7 +204,7 @@ class ExecutionService:
         else:
             # 添加到队列
             self.task_queue.append(context)
-            context.status = "queued"
+            self._set_status(context, "queued")
             logger.info(f"Task {task_id} queued for execution (execution_id: {execution_id})")
         
         return execution_id
@@ -196,8 +247,7 @@ class ExecutionService:
             }
         )
         
-        with self.lock:
-            self.execution_contexts[execution_id] = context
+        self._register_context(context)
         
         # 检查是否可以立即执行
         if self.current_workflow_executions < self.max_concurrent_workflows:
@@ -205,7 +255,7 @@ class ExecutionService:
         else:
             # 添加到队列
             self.workflow_queue.append(context)
-            context.status = "queued"
+            self._set_status(context, "queued")
             logger.info(f"Workflow {workflow_id} queued for execution (execution_id: {execution_id})")
         
         return execution_id
@@ -245,8 +295,7 @@ class ExecutionService:
             }
         )
         
-        with self.lock:
-            self.execution_contexts[execution_id] = context
+        self._register_context(context)
         
         # Agent执行不受并发限制（可以根据需要调整）
         await self._start_agent_execution(context, task_description)
@@ -263,7 +312,7 @@ class ExecutionService:
         with self.lock:
             self.current_task_executions += 1
         
-        context.status = "running"
+        self._set_status(context, "running")
         context.started_at = datetime.utcnow()
         
         # 更新数据库中的任务状态
@@ -296,7 +345,7 @@ class ExecutionService:
         with self.lock:
             self.current_workflow_executions += 1
         
-        context.status = "running"
+        self._set_status(context, "running")
         context.started_at = datetime.utcnow()
         
         # 更新数据库中的工作流状态
@@ -327,7 +376,7 @@ class ExecutionService:
             context: 执行上下文
             task_description: 任务描述
         """
-        context.status = "running"
+        self._set_status(context, "running")
         context.started_at = datetime.utcnow()
         
         # 在线程池中执行Agent
@@ -599,9 +648,8 @@ class ExecutionService:
         
         try:
             result = future.result()
-            context.status = "completed"
             context.result = result
-            context.completed_at = datetime.utcnow()
+            self._mark_terminal(context, "completed")
             
             # 更新数据库中的任务状态
             db = self._get_db_session()
@@ -630,9 +678,8 @@ class ExecutionService:
             logger.info(f"Task execution completed: {execution_id}")
             
         except Exception as e:
-            context.status = "failed"
             context.error = str(e)
-            context.completed_at = datetime.utcnow()
+            self._mark_terminal(context, "failed")
             
             # 更新数据库中的任务状态
             db = self._get_db_session()
@@ -682,9 +729,8 @@ class ExecutionService:
         
         try:
             result = future.result()
-            context.status = "completed"
             context.result = result
-            context.completed_at = datetime.utcnow()
+            self._mark_terminal(context, "completed")
             
             # 更新数据库中的工作流状态
             db = self._get_db_session()
@@ -725,9 +771,8 @@ class ExecutionService:
             logger.info(f"Workflow execution completed: {execution_id}")
             
         except Exception as e:
-            context.status = "failed"
             context.error = str(e)
-            context.completed_at = datetime.utcnow()
+            self._mark_terminal(context, "failed")
             
             # 更新数据库中的工作流状态
             db = self._get_db_session()
@@ -779,9 +824,8 @@ class ExecutionService:
         
         try:
             result = future.result()
-            context.status = "completed"
             context.result = result
-            context.completed_at = datetime.utcnow()
+            self._mark_terminal(context, "completed")
             
             # 更新Agent统计信息
             db = self._get_db_session()
@@ -814,9 +858,8 @@ class ExecutionService:
             logger.info(f"Agent execution completed: {execution_id}")
             
         except Exception as e:
-            context.status = "failed"
             context.error = str(e)
-            context.completed_at = datetime.utcnow()
+            self._mark_terminal(context, "failed")
             
             # 更新Agent统计信息
             db = self._get_db_session()
@@ -905,8 +948,7 @@ class ExecutionService:
             if context in self.workflow_queue:
                 self.workflow_queue.remove(context)
             
-            context.status = "cancelled"
-            context.completed_at = datetime.utcnow()
+            self._mark_terminal(context, "cancelled")
             return True
         
         # 如果正在运行，尝试取消Future
@@ -914,8 +956,7 @@ class ExecutionService:
         if future:
             cancelled = future.cancel()
             if cancelled:
-                context.status = "cancelled"
-                context.completed_at = datetime.utcnow()
+                self._mark_terminal(context, "cancelled")
                 
                 # 更新数据库状态
                 db = self._get_db_session()
@@ -971,8 +1012,7 @@ class ExecutionService:
                     logger.error(f"Callback execution failed for {execution_id}: {str(e)}")
         
         # 清理回调
-        if execution_id in self.execution_callbacks:
-            del self.execution_callbacks[execution_id]
+        self.execution_callbacks.pop(execution_id, None)
     
     def get_execution_statistics(self) -> Dict[str, Any]:
         """
@@ -982,10 +1022,10 @@ class ExecutionService:
             Dict[str, Any]: 统计信息
         """
         total_executions = len(self.execution_contexts)
-        running_executions = len([c for c in self.execution_contexts.values() if c.status == "running"])
-        queued_executions = len([c for c in self.execution_contexts.values() if c.status == "queued"])
-        completed_executions = len([c for c in self.execution_contexts.values() if c.status == "completed"])
-        failed_executions = len([c for c in self.execution_contexts.values() if c.status == "failed"])
+        running_executions = len(self._by_status["running"])
+        queued_executions = len(self._by_status["queued"])
+        completed_executions = len(self._by_status["completed"])
+        failed_executions = len(self._by_status["failed"])
         
         return {
             "total_executions": total_executions,
@@ -1012,31 +1052,35 @@ class ExecutionService:
             int: 清理的记录数
         """
         cutoff_time = datetime.utcnow() - timedelta(hours=older_than_hours)
-        cleaned_count = 0
-        
-        execution_ids_to_remove = []
-        for execution_id, context in self.execution_contexts.items():
-            if (context.status in ["completed", "failed", "cancelled"] and 
-                context.completed_at and context.completed_at < cutoff_time):
-                execution_ids_to_remove.append(execution_id)
-        
-        for execution_id in execution_ids_to_remove:
-            del self.execution_contexts[execution_id]
-            if execution_id in self.execution_futures:
-                del self.execution_futures[execution_id]
-            if execution_id in self.execution_callbacks:
-                del self.execution_callbacks[execution_id]
-            cleaned_count += 1
+        
+        # 只弹出索引中早于截止时间的终态执行，无需遍历全部上下文
+        execution_ids_to_remove = set()
+        with self.lock:
+            while self._terminal_by_time and self._terminal_by_time[0][0] < cutoff_time:
+                _, execution_id = heapq.heappop(self._terminal_by_time)
+                context = self.execution_contexts.get(execution_id)
+                if (context and context.status in TERMINAL_STATUSES and
+                    context.completed_at < cutoff_time):
+                    execution_ids_to_remove.add(execution_id)
+            
+            for execution_id in execution_ids_to_remove:
+                context = self.execution_contexts.pop(execution_id)
+                self._by_status[context.status].discard(execution_id)
+                self.execution_futures.pop(execution_id, None)
+                self.execution_callbacks.pop(execution_id, None)
+        
+        cleaned_count = len(execution_ids_to_remove)
         
         logger.info(f"Cleaned up {cleaned_count} completed execution records")
         return cleaned_count
     
-    def __del__(self):
+    async def aclose(self) -> None:
         """
-        析构函数，清理资源
+        关闭执行线程池，取消尚未开始的执行
+        
+        等待运行中的执行结束会阻塞，放到线程中进行，避免阻塞事件循环
         """
-        if hasattr(self, 'executor'):
-            self.executor.shutdown(wait=True)
+        await asyncio.to_thread(self.executor.shutdown, wait=True, cancel_futures=True)
 
 
 # 全局ExecutionService实例
@@ -1057,4 +1101,13 @@ def get_execution_service() -> ExecutionService:
             if _execution_service_instance is None:
                 _execution_service_instance = ExecutionService()
     
-    return _execution_service_instance
\ No newline at end of file
+    return _execution_service_instance
+
+
+async def shutdown_execution_service() -> None:
+    """
+    关闭已创建的ExecutionService实例，在应用关闭时调用
+    """
+    instance = ExecutionService._instance
+    if instance is not None and getattr(instance, '_initialized', False):
+        await instance.aclose()
@@ -1,8 +1,10 @@
 import asyncio
-import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-from fastapi import WebSocket
+import orjson
+from fastapi import WebSocket, WebSocketDisconnect
 from loguru import logger
 
 from crewai import Agent, Task, Crew
@@ -10,10 +12,70 @@ from langchain.callbacks import AsyncIteratorCallbackHandler
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from app.core.config import settings
 from app.services.llm_service import LLMService
 from app.schemas.llm import LLMProvider
 
 
+# Dedicated pool for blocking crew kickoffs so agent sessions don't starve
+# other users of the loop's default executor.
+_agent_executor = ThreadPoolExecutor(
+    max_workers=settings.MAX_CONCURRENT_AGENTS, thread_name_prefix="agent-kickoff"
+)
+
+# Tokens are coalesced into one frame every TOKEN_FLUSH_SIZE tokens or
+# TOKEN_FLUSH_INTERVAL seconds, whichever comes first.
+TOKEN_FLUSH_SIZE = 16
+TOKEN_FLUSH_INTERVAL = 0.02
+
+
+def shutdown_agent_executor() -> None:
+    """
+    Shuts down the agent kickoff thread pool. Called from the app lifespan.
+    """
+    _agent_executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def _stream_tokens(callback: AsyncIteratorCallbackHandler, websocket: WebSocket):
+    """
+    Streams tokens from the callback to the websocket in batched "tokens" frames.
+    """
+    tokens = callback.aiter()
+    buffer: list[str] = []
+    deadline = 0.0
+
+    async def flush():
+        message = {"type": "tokens", "content": "".join(buffer)}
+        await websocket.send_text(orjson.dumps(message).decode())
+        buffer.clear()
+
+    next_token = asyncio.ensure_future(tokens.__anext__())
+    try:
+        while True:
+            timeout = max(deadline - time.monotonic(), 0) if buffer else None
+            # asyncio.wait leaves the pending __anext__ untouched on timeout
+            done, _ = await asyncio.wait({next_token}, timeout=timeout)
+            if done:
+                try:
+                    token = next_token.result()
+                except StopAsyncIteration:
+                    break
+                if not buffer:
+                    deadline = time.monotonic() + TOKEN_FLUSH_INTERVAL
+                buffer.append(token)
+                next_token = asyncio.ensure_future(tokens.__anext__())
+            if buffer and (
+                len(buffer) >= TOKEN_FLUSH_SIZE or time.monotonic() >= deadline
+            ):
+                await flush()
+    finally:
+        if not next_token.done():
+            next_token.cancel()
+
+    if buffer:
+        await flush()
+
+
 async def get_llm_instance(model_name: str):
     """
     Dynamically creates an LLM instance based on the provider's configuration.
@@ -109,26 +171,44 @@ async def run_simple_agent(
 
         # 5. Asynchronous kickoff and streaming
         async def kickoff_and_stream():
-            # This is a blocking call, so we run it in a separate thread
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, crew.kickoff)
+            # This is a blocking call, so we run it on the agent thread pool
+            loop = asyncio.get_running_loop()
+            try:
+                result = await asyncio.wait_for(
+                    loop.run_in_executor(_agent_executor, crew.kickoff),
+                    timeout=settings.AGENT_EXECUTION_TIMEOUT,
+                )
+            except BaseException as e:
+                # Terminate the token iterator so streaming never hangs
+                await callback.on_llm_error(e)
+                raise
             # Signal the end of the main execution
             await callback.on_llm_end({"result": result})
 
         # Start the crew execution in a background task
-        asyncio.create_task(kickoff_and_stream())
+        kickoff_task = asyncio.create_task(kickoff_and_stream())
 
-        # Stream tokens back to the client
-        async for token in callback.aiter():
-            message = {"type": "token", "content": token}
-            await websocket.send_text(json.dumps(message))
+        try:
+            # Stream tokens back to the client
+            await _stream_tokens(callback, websocket)
+            # Surface kickoff failures to the error handler below
+            await kickoff_task
+        finally:
+            if not kickoff_task.done():
+                kickoff_task.cancel()
 
         # Send a final message indicating completion
         final_message = {"type": "end", "content": "Agent execution finished."}
-        await websocket.send_text(json.dumps(final_message))
+        await websocket.send_text(orjson.dumps(final_message).decode())
         logger.info("Agent execution and streaming finished.")
 
+    except WebSocketDisconnect:
+        raise
+    except asyncio.TimeoutError:
+        logger.error("Agent execution timed out.")
+        error_message = {"type": "error", "content": "Error: agent execution timed out"}
+        await websocket.send_text(orjson.dumps(error_message).decode())
     except Exception as e:
         logger.error(f"An error occurred during agent execution: {e}")
         error_message = {"type": "error", "content": f"Error: {e}"}
-        await websocket.send_text(json.dumps(error_message))
+        await websocket.send_text(orjson.dumps(error_message).decode())
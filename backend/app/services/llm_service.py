@@ -7,12 +7,30 @@ LLM配置管理服务
 
 import os
 import json
+import time
 import asyncio
+import tempfile
 from loguru import logger
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
 
+# 可选的提供商SDK，未安装时对应的连接测试直接返回失败
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import openai
+except ImportError:
+    openai = None
+
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
+
 from app.schemas.llm import (
     LLMConfig,
     LLMConfigCreate,
@@ -24,6 +42,256 @@ from app.core.config import get_settings
 
 settings = get_settings()
 
+# 连接测试共享的HTTP会话，复用连接池避免每次重新建立TCP/TLS连接
+_session = None
+
+
+async def _get_session():
+    """
+    获取共享的aiohttp会话，首次调用时惰性创建
+
+    Returns:
+        aiohttp.ClientSession: 共享会话
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100, ttl_dns_cache=300, keepalive_timeout=75
+            )
+        )
+    return _session
+
+
+# 按 (provider, api_key, base_url) 缓存的异步SDK客户端，避免重复初始化HTTP传输层
+_sdk_clients: Dict[tuple, Any] = {}
+
+
+def _get_openai_client(
+    provider: str, api_key: Optional[str], base_url: Optional[str]
+):
+    """
+    获取缓存的OpenAI兼容异步客户端（OpenAI / DeepSeek）
+
+    Args:
+        provider: 提供商标识
+        api_key: API密钥
+        base_url: API基础URL
+
+    Returns:
+        openai.AsyncOpenAI: 异步客户端
+    """
+    key = (provider, api_key, base_url)
+    client = _sdk_clients.get(key)
+    if client is None:
+        client = openai.AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=10.0,  # 10秒超时
+        )
+        _sdk_clients[key] = client
+    return client
+
+
+def _get_anthropic_client(api_key: Optional[str]):
+    """
+    获取缓存的Anthropic异步客户端
+
+    Args:
+        api_key: API密钥
+
+    Returns:
+        anthropic.AsyncAnthropic: 异步客户端
+    """
+    key = (LLMProvider.ANTHROPIC.value, api_key, None)
+    client = _sdk_clients.get(key)
+    if client is None:
+        client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            timeout=10.0,  # 10秒超时
+        )
+        _sdk_clients[key] = client
+    return client
+
+
+# Ollama /api/tags 结果缓存：base_url -> (获取时间, 模型列表)
+_ollama_tags_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+async def _get_ollama_tags(base_url: str, timeout) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    获取Ollama模型标签列表，短时间内的重复请求直接返回缓存
+
+    Args:
+        base_url: Ollama服务地址
+        timeout: 请求超时设置
+
+    Returns:
+        Tuple[int, List[Dict[str, Any]]]: HTTP状态码和模型列表
+    """
+    cached = _ollama_tags_cache.get(base_url)
+    if cached and time.monotonic() - cached[0] < settings.OLLAMA_TAGS_CACHE_TTL:
+        return 200, cached[1]
+
+    session = await _get_session()
+    async with session.get(f"{base_url}/api/tags", timeout=timeout) as response:
+        if response.status != 200:
+            return response.status, []
+        data = await response.json()
+
+    tags = data.get("models", [])
+    _ollama_tags_cache[base_url] = (time.monotonic(), tags)
+    return 200, tags
+
+
+def _sdk_missing_result(package: str) -> Dict[str, Any]:
+    """
+    构造SDK未安装时的连接测试结果
+
+    Args:
+        package: 缺失的包名
+
+    Returns:
+        Dict[str, Any]: 测试结果
+    """
+    return {
+        "success": False,
+        "message": f"{package} not installed",
+        "details": {"error": f"Missing dependency: {package}"},
+    }
+
+
+async def close_http_session():
+    """
+    关闭共享的aiohttp会话，在应用关闭时调用
+    """
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+# LLM配置的内存缓存：配置文件路径 -> (文件修改时间, 配置字典)
+# 读取前比较文件修改时间，其他进程或手动修改文件后会重新加载
+_configs_cache: Dict[str, Tuple[Optional[int], Dict[str, Dict[str, Any]]]] = {}
+
+
+def _config_mtime(config_file: str) -> Optional[int]:
+    """
+    获取配置文件的修改时间
+
+    Args:
+        config_file: 配置文件路径
+
+    Returns:
+        Optional[int]: 修改时间（纳秒），文件不存在时返回None
+    """
+    try:
+        return os.stat(config_file).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _write_configs_file(
+    config_file: str, configs: Dict[str, Dict[str, Any]]
+) -> Optional[int]:
+    """
+    将配置原子地写入文件，失败时抛出异常
+
+    Args:
+        config_file: 配置文件路径
+        configs: 配置字典
+
+    Returns:
+        Optional[int]: 写入后文件的修改时间
+    """
+    fd, tmp_file = tempfile.mkstemp(
+        dir=os.path.dirname(config_file), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(configs, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, config_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    return _config_mtime(config_file)
+
+
+# 静态模型列表（Ollama 除外，其模型从服务动态获取）
+_STATIC_MODELS: Dict[LLMProvider, Tuple[Dict[str, str], ...]] = {
+    LLMProvider.OPENAI: (
+        {
+            "id": "gpt-3.5-turbo",
+            "name": "GPT-3.5 Turbo",
+            "description": "快速、经济的模型",
+        },
+        {"id": "gpt-4", "name": "GPT-4", "description": "最强大的模型"},
+        {
+            "id": "gpt-4-turbo",
+            "name": "GPT-4 Turbo",
+            "description": "更快的GPT-4版本",
+        },
+    ),
+    LLMProvider.DEEPSEEK: (
+        {
+            "id": "deepseek-chat",
+            "name": "DeepSeek Chat",
+            "description": "通用对话模型",
+        },
+        {
+            "id": "deepseek-coder",
+            "name": "DeepSeek Coder",
+            "description": "代码生成专用模型",
+        },
+    ),
+    LLMProvider.ANTHROPIC: (
+        {
+            "id": "claude-3-sonnet-20240229",
+            "name": "Claude 3 Sonnet",
+            "description": "平衡性能和速度",
+        },
+        {
+            "id": "claude-3-opus-20240229",
+            "name": "Claude 3 Opus",
+            "description": "最强大的Claude模型",
+        },
+    ),
+    LLMProvider.GEMINI: (
+        {
+            "id": "gemini-pro",
+            "name": "Gemini Pro",
+            "description": "Google的高性能多模态模型",
+        },
+        {
+            "id": "gemini-pro-vision",
+            "name": "Gemini Pro Vision",
+            "description": "支持图像理解的Gemini模型",
+        },
+        {
+            "id": "gemini-1.5-pro",
+            "name": "Gemini 1.5 Pro",
+            "description": "最新版本的Gemini Pro模型",
+        },
+    ),
+}
+
+# Ollama服务不可用时返回的默认模型列表
+_OLLAMA_DEFAULT_MODELS: Tuple[Dict[str, str], ...] = (
+    {
+        "id": "llama2",
+        "name": "Llama 2",
+        "description": "Meta的开源大语言模型",
+    },
+    {
+        "id": "codellama",
+        "name": "Code Llama",
+        "description": "代码生成专用模型",
+    },
+    {"id": "mistral", "name": "Mistral", "description": "高效的开源模型"},
+)
+
 
 class LLMService:
     """
@@ -47,6 +315,8 @@ class LLMService:
         """
         确保配置文件存在
         """
+        if self.config_file in _configs_cache:
+            return
         os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
         if not os.path.exists(self.config_file):
             with open(self.config_file, "w", encoding="utf-8") as f:
@@ -54,31 +324,42 @@ class LLMService:
 
     def _load_configs(self) -> Dict[str, Dict[str, Any]]:
         """
-        从文件加载配置
+        加载配置，文件未被修改时返回内存缓存
+
+        返回的字典是共享快照，修改前需先复制（写时复制）
 
         Returns:
             Dict[str, Dict[str, Any]]: 配置字典
         """
+        mtime = _config_mtime(self.config_file)
+        cached = _configs_cache.get(self.config_file)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
         try:
             with open(self.config_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+                configs = json.load(f)
         except Exception as e:
             logger.error(f"加载配置文件失败: {str(e)}")
             return {}
 
-    def _save_configs(self, configs: Dict[str, Dict[str, Any]]):
+        _configs_cache[self.config_file] = (mtime, configs)
+        return configs
+
+    async def _save_configs(self, configs: Dict[str, Dict[str, Any]]):
         """
-        保存配置到文件
+        保存配置：在线程中写入文件，写入成功后更新内存缓存
 
         Args:
             configs: 配置字典
+
+        Raises:
+            OSError: 写入配置文件失败
         """
-        try:
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(configs, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"保存配置文件失败: {str(e)}")
-            raise
+        mtime = await asyncio.to_thread(
+            _write_configs_file, self.config_file, configs
+        )
+        _configs_cache[self.config_file] = (mtime, configs)
 
     async def get_all_configs(self) -> List[LLMConfigResponse]:
         """
@@ -90,9 +371,10 @@ class LLMService:
         configs = self._load_configs()
         result = []
 
+        # 配置文件由本服务写入，读取时跳过重复校验
         for provider, config_data in configs.items():
             try:
-                config = LLMConfigResponse(**config_data)
+                config = LLMConfigResponse.model_construct(**config_data)
                 result.append(config)
             except Exception as e:
                 logger.error(f"解析配置失败 {provider}: {str(e)}")
@@ -116,7 +398,7 @@ class LLMService:
 
         if config_data:
             try:
-                return LLMConfigResponse(**config_data)
+                return LLMConfigResponse.model_construct(**config_data)
             except Exception as e:
                 logger.error(f"解析配置失败 {provider}: {str(e)}")
 
@@ -132,12 +414,13 @@ class LLMService:
         Returns:
             LLMConfigResponse: 创建的LLM配置
         """
-        configs = self._load_configs()
+        configs = dict(self._load_configs())
 
         # 添加时间戳
-        config_data = config.dict()
-        config_data["created_at"] = datetime.now().isoformat()
-        config_data["updated_at"] = datetime.now().isoformat()
+        config_data = config.model_dump(mode="json")
+        now_iso = datetime.now().isoformat()
+        config_data["created_at"] = now_iso
+        config_data["updated_at"] = now_iso
         if "is_active" not in config_data:
             config_data["is_active"] = True
 
@@ -148,9 +431,10 @@ class LLMService:
             else config.provider
         )
         configs[provider_key] = config_data
-        self._save_configs(configs)
+        await self._save_configs(configs)
 
-        return LLMConfigResponse(**config_data)
+        # 输入已由LLMConfigCreate校验，无需再次校验
+        return LLMConfigResponse.model_construct(**config_data)
 
     async def update_config(
         self, provider: LLMProvider, config: LLMConfigUpdate
@@ -165,22 +449,23 @@ class LLMService:
         Returns:
             LLMConfigResponse: 更新后的LLM配置
         """
-        configs = self._load_configs()
+        configs = dict(self._load_configs())
         # 处理provider可能是字符串或枚举的情况
         provider_key = provider.value if hasattr(provider, "value") else provider
-        existing_config = configs.get(provider_key, {})
+        existing_config = dict(configs.get(provider_key, {}))
 
         # 更新配置
-        update_data = config.dict(exclude_unset=True)
+        update_data = config.model_dump(mode="json", exclude_unset=True)
         existing_config.update(update_data)
         existing_config["updated_at"] = datetime.now().isoformat()
         if "is_active" not in existing_config:
             existing_config["is_active"] = True
 
         configs[provider_key] = existing_config
-        self._save_configs(configs)
+        await self._save_configs(configs)
 
-        return LLMConfigResponse(**existing_config)
+        # 更新字段已由LLMConfigUpdate校验，其余字段来自已保存的配置
+        return LLMConfigResponse.model_construct(**existing_config)
 
     async def delete_config(self, provider: LLMProvider):
         """
@@ -191,8 +476,9 @@ class LLMService:
         """
         configs = self._load_configs()
         if provider.value in configs:
+            configs = dict(configs)
             del configs[provider.value]
-            self._save_configs(configs)
+            await self._save_configs(configs)
 
     async def test_connection(
         self, provider: LLMProvider, config: LLMConfigCreate
@@ -208,23 +494,14 @@ class LLMService:
             Dict[str, Any]: 测试结果
         """
         try:
-            start_time = datetime.now()
-
-            if provider == LLMProvider.OPENAI:
-                result = await self._test_openai_connection(config)
-            elif provider == LLMProvider.DEEPSEEK:
-                result = await self._test_deepseek_connection(config)
-            elif provider == LLMProvider.ANTHROPIC:
-                result = await self._test_anthropic_connection(config)
-            elif provider == LLMProvider.OLLAMA:
-                result = await self._test_ollama_connection(config)
-            elif provider == LLMProvider.GEMINI:
-                result = await self._test_gemini_connection(config)
-            else:
+            start_time = time.perf_counter()
+
+            tester = self._CONNECTION_TESTERS.get(provider)
+            if tester is None:
                 raise ValueError(f"Unsupported provider: {provider}")
+            result = await tester(self, config)
 
-            end_time = datetime.now()
-            latency = (end_time - start_time).total_seconds() * 1000  # 毫秒
+            latency = (time.perf_counter() - start_time) * 1000  # 毫秒
 
             return {
                 "success": result["success"],
@@ -254,17 +531,18 @@ class LLMService:
         Returns:
             Dict[str, Any]: 测试结果
         """
-        try:
-            import openai
+        if openai is None:
+            return _sdk_missing_result("openai")
 
-            client = openai.OpenAI(
-                api_key=config.api_key or os.getenv("OPENAI_API_KEY"),
-                base_url=config.base_url,
-                timeout=10.0,  # 10秒超时
+        try:
+            client = _get_openai_client(
+                LLMProvider.OPENAI.value,
+                config.api_key or os.getenv("OPENAI_API_KEY"),
+                config.base_url,
             )
 
             # 测试简单的API调用
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model=config.model,
                 messages=[{"role": "user", "content": "Hello"}],
                 max_tokens=5,
@@ -296,9 +574,10 @@ class LLMService:
             Dict[str, Any]: 测试结果
         """
         logger.info("Attempting to test DeepSeek connection...")
-        try:
-            import openai
+        if openai is None:
+            return _sdk_missing_result("openai")
 
+        try:
             api_key_to_use = config.api_key or os.getenv("DEEPSEEK_API_KEY")
             base_url_to_use = config.base_url or "https://api.deepseek.com"
 
@@ -307,14 +586,12 @@ class LLMService:
             )
             logger.info(f"Using Base URL: {base_url_to_use}")
 
-            client = openai.OpenAI(
-                api_key=config.api_key or os.getenv("DEEPSEEK_API_KEY"),
-                base_url=config.base_url or "https://api.deepseek.com",
-                timeout=10.0,  # 10秒超时
+            client = _get_openai_client(
+                LLMProvider.DEEPSEEK.value, api_key_to_use, base_url_to_use
             )
 
             # 测试简单的API调用
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model=config.model,
                 messages=[{"role": "user", "content": "Hello"}],
                 max_tokens=5,
@@ -346,16 +623,16 @@ class LLMService:
         Returns:
             Dict[str, Any]: 测试结果
         """
-        try:
-            import anthropic
+        if anthropic is None:
+            return _sdk_missing_result("anthropic")
 
-            client = anthropic.Anthropic(
-                api_key=config.api_key or os.getenv("ANTHROPIC_API_KEY"),
-                timeout=10.0,  # 10秒超时
+        try:
+            client = _get_anthropic_client(
+                config.api_key or os.getenv("ANTHROPIC_API_KEY")
             )
 
             # 测试简单的API调用
-            response = client.messages.create(
+            response = await client.messages.create(
                 model=config.model,
                 max_tokens=5,
                 messages=[{"role": "user", "content": "Hello"}],
@@ -384,40 +661,38 @@ class LLMService:
         Returns:
             Dict[str, Any]: 测试结果
         """
-        try:
-            import aiohttp
+        if aiohttp is None:
+            return _sdk_missing_result("aiohttp")
 
+        try:
             base_url = config.base_url or "http://localhost:11434"
 
             timeout = aiohttp.ClientTimeout(total=10)  # 10秒超时
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                # 测试Ollama服务是否运行
-                async with session.get(f"{base_url}/api/tags") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        models = [model["name"] for model in data.get("models", [])]
-
-                        if config.model in models:
-                            return {
-                                "success": True,
-                                "message": "Ollama connection successful",
-                                "details": {
-                                    "model": config.model,
-                                    "available_models": models,
-                                },
-                            }
-                        else:
-                            return {
-                                "success": False,
-                                "message": f"Model {config.model} not available",
-                                "details": {"available_models": models},
-                            }
-                    else:
-                        return {
-                            "success": False,
-                            "message": f"Ollama service error: {response.status}",
-                            "details": {"status_code": response.status},
-                        }
+            # 测试Ollama服务是否运行
+            status_code, tags = await _get_ollama_tags(base_url, timeout)
+            if status_code != 200:
+                return {
+                    "success": False,
+                    "message": f"Ollama service error: {status_code}",
+                    "details": {"status_code": status_code},
+                }
+
+            models = [model["name"] for model in tags]
+            if config.model in models:
+                return {
+                    "success": True,
+                    "message": "Ollama connection successful",
+                    "details": {
+                        "model": config.model,
+                        "available_models": models,
+                    },
+                }
+            else:
+                return {
+                    "success": False,
+                    "message": f"Model {config.model} not available",
+                    "details": {"available_models": models},
+                }
 
         except Exception as e:
             return {
@@ -436,9 +711,10 @@ class LLMService:
         Returns:
             Dict[str, Any]: 测试结果
         """
-        try:
-            import aiohttp
+        if aiohttp is None:
+            return _sdk_missing_result("aiohttp")
 
+        try:
             api_key = config.api_key or os.getenv("GEMINI_API_KEY")
             if not api_key:
                 return {
@@ -458,27 +734,27 @@ class LLMService:
             }
 
             timeout = aiohttp.ClientTimeout(total=10)  # 10秒超时
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    f"{url}?key={api_key}", headers=headers, json=data
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return {
-                            "success": True,
-                            "message": "Gemini connection successful",
-                            "details": {"model": config.model, "response": result},
-                        }
-                    else:
-                        error_text = await response.text()
-                        return {
-                            "success": False,
-                            "message": f"Gemini API error: {response.status}",
-                            "details": {
-                                "status_code": response.status,
-                                "error": error_text,
-                            },
-                        }
+            session = await _get_session()
+            async with session.post(
+                f"{url}?key={api_key}", headers=headers, json=data, timeout=timeout
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return {
+                        "success": True,
+                        "message": "Gemini connection successful",
+                        "details": {"model": config.model, "response": result},
+                    }
+                else:
+                    error_text = await response.text()
+                    return {
+                        "success": False,
+                        "message": f"Gemini API error: {response.status}",
+                        "details": {
+                            "status_code": response.status,
+                            "error": error_text,
+                        },
+                    }
 
         except Exception as e:
             return {
@@ -533,6 +809,33 @@ class LLMService:
             "details": test_result["details"],
         }
 
+    async def get_all_connection_statuses(self) -> Dict[str, Dict[str, Any]]:
+        """
+        并发获取所有提供商的连接状态
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 以提供商为键的连接状态信息
+        """
+        providers = list(LLMProvider)
+        results = await asyncio.gather(
+            *[self.get_connection_status(provider) for provider in providers],
+            return_exceptions=True,
+        )
+
+        statuses = {}
+        for provider, result in zip(providers, results):
+            if isinstance(result, Exception):
+                logger.error(f"获取连接状态失败 {provider}: {str(result)}")
+                result = {
+                    "provider": provider.value,
+                    "status": "error",
+                    "message": str(result),
+                    "last_check": datetime.now().isoformat(),
+                }
+            statuses[provider.value] = result
+
+        return statuses
+
     async def get_available_models(self, provider: LLMProvider) -> List[Dict[str, Any]]:
         """
         获取指定提供商的可用模型列表
@@ -543,102 +846,54 @@ class LLMService:
         Returns:
             List[Dict[str, Any]]: 可用模型列表
         """
-        if provider == LLMProvider.OPENAI:
-            return [
-                {
-                    "id": "gpt-3.5-turbo",
-                    "name": "GPT-3.5 Turbo",
-                    "description": "快速、经济的模型",
-                },
-                {"id": "gpt-4", "name": "GPT-4", "description": "最强大的模型"},
-                {
-                    "id": "gpt-4-turbo",
-                    "name": "GPT-4 Turbo",
-                    "description": "更快的GPT-4版本",
-                },
-            ]
-        elif provider == LLMProvider.DEEPSEEK:
-            return [
-                {
-                    "id": "deepseek-chat",
-                    "name": "DeepSeek Chat",
-                    "description": "通用对话模型",
-                },
-                {
-                    "id": "deepseek-coder",
-                    "name": "DeepSeek Coder",
-                    "description": "代码生成专用模型",
-                },
-            ]
-        elif provider == LLMProvider.ANTHROPIC:
-            return [
-                {
-                    "id": "claude-3-sonnet-20240229",
-                    "name": "Claude 3 Sonnet",
-                    "description": "平衡性能和速度",
-                },
-                {
-                    "id": "claude-3-opus-20240229",
-                    "name": "Claude 3 Opus",
-                    "description": "最强大的Claude模型",
-                },
-            ]
-        elif provider == LLMProvider.OLLAMA:
-            # 对于Ollama，尝试从服务获取实际可用的模型
-            try:
-                import aiohttp
-
-                base_url = "http://localhost:11434"
-
-                timeout = aiohttp.ClientTimeout(
-                    total=5
-                )  # 5秒超时，获取模型列表用较短超时
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.get(f"{base_url}/api/tags") as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            return [
-                                {
-                                    "id": model["name"],
-                                    "name": model["name"],
-                                    "description": f"本地模型 - {model.get('size', 'Unknown size')}",
-                                }
-                                for model in data.get("models", [])
-                            ]
-            except Exception as e:
-                logger.error(f"获取Ollama模型列表失败: {str(e)}")
-
-            # 返回默认模型列表
-            return [
-                {
-                    "id": "llama2",
-                    "name": "Llama 2",
-                    "description": "Meta的开源大语言模型",
-                },
-                {
-                    "id": "codellama",
-                    "name": "Code Llama",
-                    "description": "代码生成专用模型",
-                },
-                {"id": "mistral", "name": "Mistral", "description": "高效的开源模型"},
-            ]
-        elif provider == LLMProvider.GEMINI:
-            return [
-                {
-                    "id": "gemini-pro",
-                    "name": "Gemini Pro",
-                    "description": "Google的高性能多模态模型",
-                },
-                {
-                    "id": "gemini-pro-vision",
-                    "name": "Gemini Pro Vision",
-                    "description": "支持图像理解的Gemini模型",
-                },
-                {
-                    "id": "gemini-1.5-pro",
-                    "name": "Gemini 1.5 Pro",
-                    "description": "最新版本的Gemini Pro模型",
-                },
-            ]
-
-        return []
+        static_models = _STATIC_MODELS.get(provider)
+        if static_models is not None:
+            return list(static_models)
+
+        lister = self._MODEL_LISTERS.get(provider)
+        if lister is None:
+            return []
+        return await lister(self)
+
+    async def _list_ollama_models(self) -> List[Dict[str, Any]]:
+        """
+        获取Ollama可用模型列表
+
+        Returns:
+            List[Dict[str, Any]]: 可用模型列表
+        """
+        # 对于Ollama，尝试从服务获取实际可用的模型
+        try:
+            base_url = "http://localhost:11434"
+
+            # 5秒超时，获取模型列表用较短超时
+            timeout = aiohttp.ClientTimeout(total=5)
+            status_code, tags = await _get_ollama_tags(base_url, timeout)
+            if status_code == 200:
+                return [
+                    {
+                        "id": model["name"],
+                        "name": model["name"],
+                        "description": f"本地模型 - {model.get('size', 'Unknown size')}",
+                    }
+                    for model in tags
+                ]
+        except Exception as e:
+            logger.error(f"获取Ollama模型列表失败: {str(e)}")
+
+        # 返回默认模型列表
+        return list(_OLLAMA_DEFAULT_MODELS)
+
+    # 提供商 -> 连接测试方法
+    _CONNECTION_TESTERS = {
+        LLMProvider.OPENAI: _test_openai_connection,
+        LLMProvider.DEEPSEEK: _test_deepseek_connection,
+        LLMProvider.ANTHROPIC: _test_anthropic_connection,
+        LLMProvider.OLLAMA: _test_ollama_connection,
+        LLMProvider.GEMINI: _test_gemini_connection,
+    }
+
+    # 提供商 -> 动态模型列表方法
+    _MODEL_LISTERS = {
+        LLMProvider.OLLAMA: _list_ollama_models,
+    }
@@ -1,21 +1,33 @@
 """通知服务层 - 处理系统通知和消息推送"""
 
-from typing import List, Optional, Dict, Any, Callable
+from typing import List, Optional, Dict, Any, Callable, Awaitable
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-import json
 import logging
 import asyncio
+import random
+import time
+import uuid
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import smtplib
 from email.mime.text import MIMEText as MimeText
 from email.mime.multipart import MIMEMultipart as MimeMultipart
 from email.mime.base import MIMEBase as MimeBase
 from email import encoders
+from email.utils import parsedate_to_datetime
 import aiohttp
+import orjson
+import websockets
 from websockets.server import WebSocketServerProtocol
-from jinja2 import Template
+from jinja2 import Environment, Template
+
+try:
+    import aiosmtplib
+except ImportError:
+    aiosmtplib = None
 
 from ..core.config import get_settings
 from ..models.agent import Agent
@@ -25,7 +37,71 @@ from ..models.workflow import Workflow
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-class NotificationType(Enum):
+# 邮件批量发送：每批最多发送的数量和等待凑批的最长时间（秒）
+EMAIL_BATCH_SIZE = 100
+EMAIL_BATCH_WAIT = 1.0
+
+# 并发消费通知队列的工作协程数量（邮件另有单独的批量发送协程）
+NOTIFICATION_WORKERS = 8
+
+# 关闭服务时等待队列清空的最长时间（秒）
+NOTIFICATION_DRAIN_TIMEOUT = 10.0
+
+# 同步SMTP回退路径的最大并发数
+SMTP_MAX_WORKERS = 4
+
+# 重试退避：首次重试的基础延迟和最大延迟（秒），实际延迟带随机抖动
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 300.0
+
+# 去重窗口（秒）：窗口内相同的通知只发送一次，设为0关闭去重
+NOTIFICATION_DEDUP_WINDOW = 10.0
+
+# 通知历史最多保留的记录数，超出后自动淘汰最旧的记录
+NOTIFICATION_HISTORY_LIMIT = 10000
+
+# WebSocket广播：接收者为该值时发送给所有连接，每批发送的连接数
+WEBSOCKET_BROADCAST_RECIPIENT = "*"
+WEBSOCKET_BROADCAST_BATCH_SIZE = 50
+
+def _json_dumps(obj: Any) -> bytes:
+    """使用orjson序列化，naive datetime按UTC直接输出（带+00:00后缀）
+
+    对外发送的时间戳需先调用isoformat()，保持原有的无时区后缀格式
+    """
+    return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC)
+
+def _utc_now_str() -> str:
+    """返回当前UTC时间的展示字符串，直接格式化time.gmtime()而不构造datetime"""
+    return time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())
+
+# 共享的Jinja2环境，模板在注册时编译一次
+_template_env = Environment(autoescape=False, auto_reload=False)
+
+class NotificationRateLimited(ValueError):
+    """通知渠道返回429限流"""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析Retry-After响应头（秒数或HTTP日期），返回等待秒数"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is not None:
+        retry_at = retry_at.replace(tzinfo=None) - retry_at.utcoffset()
+    return max((retry_at - datetime.utcnow()).total_seconds(), 0.0)
+
+class NotificationType(str, Enum):
     """通知类型枚举"""
     INFO = "info"
     SUCCESS = "success"
@@ -35,8 +111,17 @@ class NotificationType(Enum):
     EXECUTION_COMPLETE = "execution_complete"
     EXECUTION_FAILED = "execution_failed"
     SYSTEM_ALERT = "system_alert"
+    
+    def __init__(self, value: str):
+        # 按声明顺序编号，用作下方颜色元组的下标
+        self.ordinal = len(type(self).__members__)
 
-class NotificationChannel(Enum):
+# 各通知类型在Slack/Discord消息中的颜色，按NotificationType声明顺序排列
+SLACK_COLORS = ("#36a64f", "good", "warning", "danger", "#36a64f", "good", "danger", "warning")
+DISCORD_COLORS = (0x0099ff, 0x00ff00, 0xffff00, 0xff0000, 0x0099ff, 0x00ff00, 0xff0000, 0xffff00)
+assert len(SLACK_COLORS) == len(DISCORD_COLORS) == len(NotificationType)
+
+class NotificationChannel(str, Enum):
     """通知渠道枚举"""
     EMAIL = "email"
     WEBHOOK = "webhook"
@@ -45,7 +130,7 @@ class NotificationChannel(Enum):
     SLACK = "slack"
     DISCORD = "discord"
 
-@dataclass
+@dataclass(slots=True)
 class NotificationMessage:
     """通知消息"""
     id: str
@@ -57,6 +142,7 @@ class NotificationMessage:
     metadata: Optional[Dict[str, Any]] = None
     created_at: Optional[datetime] = None
     sent_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None  # 得到最终结果（成功或放弃重试）并写入历史的时间
     status: str = "pending"  # pending, sent, failed
     retry_count: int = 0
     max_retries: int = 3
@@ -66,7 +152,7 @@ class NotificationMessage:
         if self.created_at is None:
             self.created_at = datetime.utcnow()
 
-@dataclass
+@dataclass(slots=True)
 class NotificationTemplate:
     """通知模板"""
     name: str
@@ -76,29 +162,105 @@ class NotificationTemplate:
     channel: NotificationChannel
     variables: List[str]
     is_active: bool = True
+    _subject_compiled: Optional[Template] = field(default=None, init=False, repr=False, compare=False)
+    _content_compiled: Optional[Template] = field(default=None, init=False, repr=False, compare=False)
+
+@dataclass(slots=True)
+class _RecentNotification:
+    """去重窗口内的通知记录"""
+    notification: NotificationMessage
+    seen_at: float
+    suppressed: int = 0
+    # 窗口结束时发送汇总的定时器
+    timer: Optional[asyncio.TimerHandle] = None
 
 class NotificationService:
     """通知服务类"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session] = None):
         """
-        初始化通知服务
+        初始化通知服务，工作协程由start()启动
         
         Args:
-            db: 数据库会话
+            db: 数据库会话（可选）
         """
         self.db = db
-        self.pending_notifications: List[NotificationMessage] = []
-        self.notification_history: List[NotificationMessage] = []
+        self.pending_notifications: asyncio.Queue = asyncio.Queue()
+        # 邮件通知单独排队，由邮件工作协程批量发送以复用SMTP连接
+        self.email_notifications: asyncio.Queue = asyncio.Queue()
+        # 邮件工作协程复用的异步SMTP连接（需要aiosmtplib）
+        self._smtp = None
+        # 未安装aiosmtplib时同步smtplib使用的专用线程池，与默认执行器隔离
+        self._smtp_pool = ThreadPoolExecutor(max_workers=SMTP_MAX_WORKERS, thread_name_prefix="smtp")
+        self._smtp_semaphore = asyncio.Semaphore(SMTP_MAX_WORKERS)
+        # Webhook/Slack/Discord共享的HTTP会话，惰性创建
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        # 等待重试的后台任务，保留引用避免被垃圾回收
+        self._retry_tasks: set = set()
+        # 去重窗口内最近发送的通知，键为(类型, 渠道, 接收者, 标题, 内容)
+        self._recent_notifications: Dict[tuple, _RecentNotification] = {}
+        self.notification_history: deque = deque(maxlen=NOTIFICATION_HISTORY_LIMIT)
+        # 按接收者和类型分组的历史索引，过滤查询只遍历相关记录
+        self._history_by_recipient: Dict[str, deque] = defaultdict(deque)
+        self._history_by_type: Dict[NotificationType, deque] = defaultdict(deque)
+        # 历史记录的增量统计计数，避免每次统计都遍历历史
+        self._stats: Dict[str, int] = {"total": 0, "sent": 0, "failed": 0}
+        self._type_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"total": 0, "sent": 0, "failed": 0})
+        self._channel_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"total": 0, "sent": 0, "failed": 0})
         self.websocket_connections: Dict[str, websockets.WebSocketServerProtocol] = {}
         self.notification_templates: Dict[str, NotificationTemplate] = {}
         self.subscribers: Dict[NotificationType, List[Callable]] = {}
+        # 渠道到发送方法的分发表，可通过register_channel_handler扩展新渠道
+        self._channel_handlers: Dict[NotificationChannel, Callable[[NotificationMessage], Awaitable[None]]] = {
+            NotificationChannel.EMAIL: self._send_email_notification,
+            NotificationChannel.WEBHOOK: self._send_webhook_notification,
+            NotificationChannel.WEBSOCKET: self._send_websocket_notification,
+            NotificationChannel.SLACK: self._send_slack_notification,
+            NotificationChannel.DISCORD: self._send_discord_notification,
+        }
+        
+        # 发送工作协程，在start()中创建
+        self._workers: List[asyncio.Task] = []
         
         # 初始化默认模板
         self._initialize_default_templates()
+    
+    async def start(self) -> None:
+        """
+        启动通知处理任务：多个工作协程并发消费通用队列，慢渠道不会阻塞其他通知
         
-        # 启动通知处理任务
-        asyncio.create_task(self._process_notifications())
+        启动前入队的通知会在启动后被发送，重复调用无副作用
+        """
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._process_notifications())
+            for _ in range(NOTIFICATION_WORKERS)
+        ]
+        self._workers.append(asyncio.create_task(self._process_email_notifications()))
+        logger.info(f"Notification service started with {NOTIFICATION_WORKERS} workers")
+    
+    async def stop(self, drain_timeout: float = NOTIFICATION_DRAIN_TIMEOUT) -> None:
+        """
+        停止通知服务：等待队列中的通知发送完毕（最多drain_timeout秒），然后关闭工作协程和连接
+        
+        Args:
+            drain_timeout: 等待队列清空的最长时间（秒）
+        """
+        # 汇总通知需在清空队列之前入队
+        self._end_all_dedup_windows()
+        if self._workers:
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(self.pending_notifications.join(), self.email_notifications.join()),
+                    drain_timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Notification queues not drained within {drain_timeout}s, "
+                    f"{self.pending_notifications.qsize() + self.email_notifications.qsize()} notifications dropped"
+                )
+        await self.aclose()
     
     def _initialize_default_templates(self) -> None:
         """
@@ -164,7 +326,18 @@ class NotificationService:
         ]
         
         for template in templates:
-            self.notification_templates[template.name] = template
+            self._register_template(template)
+    
+    def _register_template(self, template: NotificationTemplate) -> None:
+        """
+        编译并注册通知模板
+        
+        Args:
+            template: 通知模板
+        """
+        template._subject_compiled = _template_env.from_string(template.subject_template)
+        template._content_compiled = _template_env.from_string(template.content_template)
+        self.notification_templates[template.name] = template
     
     async def send_notification(
         self,
@@ -189,23 +362,79 @@ class NotificationService:
         Returns:
             str: 通知ID
         """
-        import uuid
+        # 去重窗口内相同的通知直接返回已入队的通知ID，避免告警风暴时重复发送
+        now = time.monotonic()
+        key = (type, channel, recipient, title, content)
+        recent = self._recent_notifications.get(key)
+        if recent is not None:
+            if now - recent.seen_at < NOTIFICATION_DEDUP_WINDOW:
+                recent.suppressed += 1
+                logger.debug(f"Duplicate notification suppressed: {recent.notification.id} - {title}")
+                return recent.notification.id
+            # 窗口已过但定时器尚未触发，提前结束该窗口
+            recent.timer.cancel()
+            self._end_dedup_window(key, recent)
         
         notification = NotificationMessage(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             type=type,
             title=title,
             content=content,
             recipient=recipient,
             channel=channel,
-            meta_data=metadata or {}
+            metadata=metadata or {}
         )
         
-        self.pending_notifications.append(notification)
+        if NOTIFICATION_DEDUP_WINDOW > 0:
+            recent = _RecentNotification(notification, now)
+            recent.timer = asyncio.get_running_loop().call_later(
+                NOTIFICATION_DEDUP_WINDOW, self._end_dedup_window, key, recent
+            )
+            self._recent_notifications[key] = recent
+        
+        await self._enqueue(notification)
         logger.info(f"Notification queued: {notification.id} - {title}")
         
         return notification.id
     
+    def _end_dedup_window(self, key: tuple, recent: _RecentNotification) -> None:
+        """
+        去重窗口结束：移除去重记录，如有被抑制的重复通知则立即发送汇总，
+        不必等到下一次send_notification
+        
+        Args:
+            key: 去重键
+            recent: 去重记录
+        """
+        if self._recent_notifications.get(key) is recent:
+            del self._recent_notifications[key]
+        if not recent.suppressed:
+            return
+        
+        original = recent.notification
+        summary = NotificationMessage(
+            id=uuid.uuid4().hex,
+            type=original.type,
+            title=original.title,
+            content=(
+                f"{original.content}\n\n"
+                f"({recent.suppressed} duplicate notifications suppressed within {NOTIFICATION_DEDUP_WINDOW:g}s)"
+            ),
+            recipient=original.recipient,
+            channel=original.channel,
+            metadata=original.metadata
+        )
+        self._queue_for(summary).put_nowait(summary)
+        logger.info(f"Notification queued: {summary.id} - {recent.suppressed} duplicates of {original.id} suppressed")
+    
+    def _end_all_dedup_windows(self) -> None:
+        """
+        立即结束所有去重窗口，发送尚未发送的汇总（关闭服务时调用）
+        """
+        for key, recent in list(self._recent_notifications.items()):
+            recent.timer.cancel()
+            self._end_dedup_window(key, recent)
+    
     async def send_template_notification(
         self,
         template_name: str,
@@ -233,13 +462,10 @@ class NotificationService:
             logger.warning(f"Template '{template_name}' is not active")
             return ""
         
-        # 渲染模板
-        subject_template = Template(template.subject_template)
-        content_template = Template(template.content_template)
-        
+        # 渲染预编译的模板
         try:
-            title = subject_template.render(**variables)
-            content = content_template.render(**variables)
+            title = template._subject_compiled.render(**variables)
+            content = template._content_compiled.render(**variables)
         except Exception as e:
             logger.error(f"Template rendering failed for '{template_name}': {str(e)}")
             raise ValueError(f"Template rendering failed: {str(e)}")
@@ -270,7 +496,7 @@ class NotificationService:
         variables = {
             "task_name": task.name,
             "task_id": task.id,
-            "start_time": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+            "start_time": _utc_now_str()
         }
         
         return await self.send_template_notification(
@@ -294,7 +520,7 @@ class NotificationService:
         variables = {
             "task_name": task.name,
             "task_id": task.id,
-            "completion_time": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
+            "completion_time": _utc_now_str(),
             "result": result
         }
         
@@ -319,7 +545,7 @@ class NotificationService:
         variables = {
             "task_name": task.name,
             "task_id": task.id,
-            "failure_time": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
+            "failure_time": _utc_now_str(),
             "error_message": error_message
         }
         
@@ -343,7 +569,7 @@ class NotificationService:
         variables = {
             "workflow_name": workflow.name,
             "workflow_id": workflow.id,
-            "start_time": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+            "start_time": _utc_now_str()
         }
         
         return await self.send_template_notification(
@@ -367,7 +593,7 @@ class NotificationService:
         variables = {
             "workflow_name": workflow.name,
             "workflow_id": workflow.id,
-            "completion_time": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
+            "completion_time": _utc_now_str(),
             "result": result
         }
         
@@ -392,7 +618,7 @@ class NotificationService:
         variables = {
             "workflow_name": workflow.name,
             "workflow_id": workflow.id,
-            "failure_time": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"),
+            "failure_time": _utc_now_str(),
             "error_message": error_message
         }
         
@@ -417,7 +643,7 @@ class NotificationService:
         variables = {
             "alert_title": title,
             "alert_message": message,
-            "alert_time": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+            "alert_time": _utc_now_str()
         }
         
         return await self.send_template_notification(
@@ -428,18 +654,36 @@ class NotificationService:
     
     async def _process_notifications(self) -> None:
         """
-        处理待发送的通知
+        处理待发送的通知（工作协程，多个实例并发运行）
         """
         while True:
+            notification = await self.pending_notifications.get()
             try:
-                if self.pending_notifications:
-                    notification = self.pending_notifications.pop(0)
-                    await self._send_notification(notification)
-                else:
-                    await asyncio.sleep(1)  # 等待1秒后再检查
+                await self._send_notification(notification)
             except Exception as e:
                 logger.error(f"Error processing notifications: {str(e)}")
-                await asyncio.sleep(5)  # 出错时等待5秒
+            finally:
+                self.pending_notifications.task_done()
+    
+    async def _enqueue(self, notification: NotificationMessage) -> None:
+        """
+        将通知放入对应的发送队列
+        
+        Args:
+            notification: 通知消息
+        """
+        await self._queue_for(notification).put(notification)
+    
+    def _queue_for(self, notification: NotificationMessage) -> asyncio.Queue:
+        """
+        返回通知对应的发送队列（邮件单独排队）
+        
+        Args:
+            notification: 通知消息
+        """
+        if notification.channel == NotificationChannel.EMAIL:
+            return self.email_notifications
+        return self.pending_notifications
     
     async def _send_notification(self, notification: NotificationMessage) -> None:
         """
@@ -448,56 +692,274 @@ class NotificationService:
         Args:
             notification: 通知消息
         """
+        handler = self._channel_handlers.get(notification.channel)
         try:
-            if notification.channel == NotificationChannel.EMAIL:
-                await self._send_email_notification(notification)
-            elif notification.channel == NotificationChannel.WEBHOOK:
-                await self._send_webhook_notification(notification)
-            elif notification.channel == NotificationChannel.WEBSOCKET:
-                await self._send_websocket_notification(notification)
-            elif notification.channel == NotificationChannel.SLACK:
-                await self._send_slack_notification(notification)
-            elif notification.channel == NotificationChannel.DISCORD:
-                await self._send_discord_notification(notification)
+            if handler is not None:
+                await handler(notification)
             else:
                 logger.warning(f"Unsupported notification channel: {notification.channel}")
                 notification.status = "failed"
                 notification.error_message = f"Unsupported channel: {notification.channel}"
-            
+        except Exception as e:
+            await self._complete_notification(notification, e)
+        else:
+            await self._complete_notification(notification)
+    
+    async def _complete_notification(self, notification: NotificationMessage, error: Optional[Exception] = None) -> None:
+        """
+        记录通知发送结果，失败时安排重试
+        
+        Args:
+            notification: 通知消息
+            error: 发送异常（成功时为None）
+        """
+        if error is None:
             if notification.status != "failed":
                 notification.status = "sent"
                 notification.sent_at = datetime.utcnow()
                 logger.info(f"Notification sent successfully: {notification.id}")
+            self._record_history(notification)
+            return
+        
+        notification.status = "failed"
+        notification.error_message = str(error)
+        notification.retry_count += 1
+        
+        logger.error(f"Failed to send notification {notification.id}: {str(error)}")
+        
+        # 重试逻辑
+        if notification.retry_count < notification.max_retries:
+            delay = self._retry_delay(notification, error)
+            logger.info(f"Retrying notification {notification.id} (attempt {notification.retry_count + 1}) in {delay:.1f}s")
+            # 在后台等待后重新入队，不阻塞发送工作协程
+            task = asyncio.create_task(self._reschedule(notification, delay))
+            self._retry_tasks.add(task)
+            task.add_done_callback(self._retry_tasks.discard)
+        else:
+            logger.error(f"Max retries exceeded for notification {notification.id}")
+            self._record_history(notification)
+    
+    def _retry_delay(self, notification: NotificationMessage, error: Exception) -> float:
+        """
+        计算重试延迟：优先遵循Retry-After，否则使用带抖动的指数退避
+        
+        Args:
+            notification: 通知消息
+            error: 发送异常
             
-        except Exception as e:
-            notification.status = "failed"
-            notification.error_message = str(e)
-            notification.retry_count += 1
-            
-            logger.error(f"Failed to send notification {notification.id}: {str(e)}")
-            
-            # 重试逻辑
-            if notification.retry_count < notification.max_retries:
-                logger.info(f"Retrying notification {notification.id} (attempt {notification.retry_count + 1})")
-                await asyncio.sleep(60)  # 等待1分钟后重试
-                self.pending_notifications.append(notification)
-            else:
-                logger.error(f"Max retries exceeded for notification {notification.id}")
+        Returns:
+            float: 延迟秒数
+        """
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return retry_after
+        delay = min(RETRY_BASE_DELAY * 2 ** (notification.retry_count - 1), RETRY_MAX_DELAY)
+        return delay * random.uniform(0.5, 1.5)
+    
+    async def _reschedule(self, notification: NotificationMessage, delay: float) -> None:
+        """
+        延迟后将通知重新放入发送队列
         
-        finally:
-            # 添加到历史记录
-            self.notification_history.append(notification)
+        Args:
+            notification: 通知消息
+            delay: 延迟秒数
+        """
+        await asyncio.sleep(delay)
+        await self._enqueue(notification)
+    
+    def _record_history(self, notification: NotificationMessage) -> None:
+        """
+        将已有最终结果的通知加入历史记录并更新统计计数
+        
+        历史记录按完成时间（completed_at）追加，重试过的通知可能晚于更新的通知完成，
+        因此历史不按created_at有序
+        
+        Args:
+            notification: 通知消息
+        """
+        if len(self.notification_history) == self.notification_history.maxlen:
+            # 淘汰最旧的记录
+            self._forget_history(self.notification_history.popleft())
+        notification.completed_at = datetime.utcnow()
+        self.notification_history.append(notification)
+        self._history_by_recipient[notification.recipient].append(notification)
+        self._history_by_type[notification.type].append(notification)
+        self._update_statistics(notification, 1)
+    
+    def _forget_history(self, notification: NotificationMessage) -> None:
+        """
+        从索引和统计中移除已移出历史记录的通知
+        
+        索引与历史记录按相同顺序追加，被移出的记录也是各索引中最旧的一条
+        
+        Args:
+            notification: 通知消息
+        """
+        for index, key in (
+            (self._history_by_recipient, notification.recipient),
+            (self._history_by_type, notification.type),
+        ):
+            bucket = index.get(key)
+            if bucket and bucket[0] is notification:
+                bucket.popleft()
+                if not bucket:
+                    del index[key]
+        self._update_statistics(notification, -1)
+    
+    def _update_statistics(self, notification: NotificationMessage, delta: int) -> None:
+        """
+        增量更新统计计数
+        
+        Args:
+            notification: 通知消息
+            delta: 计数变化量（加入历史为1，移出历史为-1）
+        """
+        buckets = (
+            self._stats,
+            self._type_stats[notification.type.value],
+            self._channel_stats[notification.channel.value],
+        )
+        for bucket in buckets:
+            bucket["total"] += delta
+            if notification.status in ("sent", "failed"):
+                bucket[notification.status] += delta
+    
+    async def _process_email_notifications(self) -> None:
+        """
+        批量处理邮件通知：凑满一批或等待超时后，在同一个SMTP连接上发送
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.email_notifications.get()]
+            deadline = loop.time() + EMAIL_BATCH_WAIT
+            while len(batch) < EMAIL_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.email_notifications.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                try:
+                    errors = await self._send_emails(batch)
+                except Exception as e:
+                    errors = [e] * len(batch)
+                
+                for notification, error in zip(batch, errors):
+                    await self._complete_notification(notification, error)
+            except Exception as e:
+                logger.error(f"Error processing email notifications: {str(e)}")
+            finally:
+                for _ in batch:
+                    self.email_notifications.task_done()
     
     async def _send_email_notification(self, notification: NotificationMessage) -> None:
         """
-        发送邮件通知
+        发送单封邮件通知
         
         Args:
             notification: 通知消息
         """
+        errors = await self._send_emails([notification])
+        if errors[0] is not None:
+            raise errors[0]
+    
+    async def _send_emails(self, notifications: List[NotificationMessage]) -> List[Optional[Exception]]:
+        """
+        发送一批邮件，优先使用aiosmtplib，未安装时回退到线程池中的smtplib
+        
+        Args:
+            notifications: 通知消息列表
+            
+        Returns:
+            List[Optional[Exception]]: 每封邮件的发送异常，成功为None
+        """
+        if aiosmtplib is not None:
+            return await self._send_email_batch_async(notifications)
+        
+        # smtplib是同步的，放到专用线程池中执行，信号量限制排队的SMTP任务数
+        loop = asyncio.get_running_loop()
+        async with self._smtp_semaphore:
+            return await loop.run_in_executor(self._smtp_pool, self._send_email_batch, notifications)
+    
+    async def _connect_async_smtp(self):
+        """
+        建立异步SMTP连接并完成TLS和登录
+        
+        Returns:
+            aiosmtplib.SMTP: SMTP连接
+        """
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            start_tls=settings.SMTP_TLS
+        )
+        await smtp.connect()
+        if settings.SMTP_PASSWORD:
+            await smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        return smtp
+    
+    async def _close_async_smtp(self) -> None:
+        """
+        关闭复用的异步SMTP连接
+        """
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            await smtp.quit()
+        except Exception:
+            smtp.close()
+    
+    async def _send_email_batch_async(self, notifications: List[NotificationMessage]) -> List[Optional[Exception]]:
+        """
+        在复用的异步SMTP连接上发送一批邮件
+        
+        Args:
+            notifications: 通知消息列表
+            
+        Returns:
+            List[Optional[Exception]]: 每封邮件的发送异常，成功为None
+        """
         if not settings.SMTP_HOST or not settings.SMTP_USER:
-            raise ValueError("SMTP configuration not found")
+            error = ValueError("SMTP configuration not found")
+            return [error] * len(notifications)
+        
+        # 空闲期间连接可能已被服务器断开
+        if self._smtp is not None:
+            try:
+                healthy = (await self._smtp.noop())[0] == 250
+            except Exception:
+                healthy = False
+            if not healthy:
+                await self._close_async_smtp()
+        
+        errors: List[Optional[Exception]] = []
+        for notification in notifications:
+            try:
+                if self._smtp is None:
+                    self._smtp = await self._connect_async_smtp()
+                await self._smtp.send_message(self._build_email_message(notification))
+                errors.append(None)
+            except Exception as e:
+                # 丢弃可能已损坏的连接，下一封邮件重新连接
+                errors.append(e)
+                await self._close_async_smtp()
         
+        return errors
+    
+    def _build_email_message(self, notification: NotificationMessage) -> MimeMultipart:
+        """
+        构建邮件消息
+        
+        Args:
+            notification: 通知消息
+            
+        Returns:
+            MimeMultipart: 邮件消息
+        """
         msg = MimeMultipart()
         msg['From'] = settings.SMTP_USER
         msg['To'] = notification.recipient
@@ -505,14 +967,84 @@ class NotificationService:
         
         # 添加邮件正文
         msg.attach(MimeText(notification.content, 'plain', 'utf-8'))
+        return msg
+    
+    def _open_smtp_connection(self) -> smtplib.SMTP:
+        """
+        建立SMTP连接并完成TLS和登录
+        
+        Returns:
+            smtplib.SMTP: SMTP连接
+        """
+        server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
+        if settings.SMTP_TLS:
+            server.starttls()
+        if settings.SMTP_PASSWORD:
+            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        return server
+    
+    def _send_email_batch(self, notifications: List[NotificationMessage]) -> List[Optional[Exception]]:
+        """
+        在同一个SMTP连接上发送一批邮件（同步，在线程池中运行）
         
-        # 发送邮件
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            if settings.SMTP_TLS:
-                server.starttls()
-            if settings.SMTP_PASSWORD:
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
+        Args:
+            notifications: 通知消息列表
+            
+        Returns:
+            List[Optional[Exception]]: 每封邮件的发送异常，成功为None
+        """
+        if not settings.SMTP_HOST or not settings.SMTP_USER:
+            error = ValueError("SMTP configuration not found")
+            return [error] * len(notifications)
+        
+        errors: List[Optional[Exception]] = []
+        server = self._open_smtp_connection()
+        try:
+            for notification in notifications:
+                try:
+                    # 连接失效时重新连接
+                    try:
+                        healthy = server.noop()[0] == 250
+                    except smtplib.SMTPException:
+                        healthy = False
+                    if not healthy:
+                        try:
+                            server.close()
+                        finally:
+                            server = self._open_smtp_connection()
+                    
+                    server.send_message(self._build_email_message(notification))
+                    errors.append(None)
+                except Exception as e:
+                    # 单封失败不影响同批其他邮件，失败的交给重试逻辑
+                    errors.append(e)
+        finally:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+        
+        return errors
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """
+        获取共享的HTTP会话，首次调用时创建
+        
+        Returns:
+            aiohttp.ClientSession: HTTP会话
+        """
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={'Content-Type': 'application/json'}
+            )
+        return self._http_session
     
     async def _send_webhook_notification(self, notification: NotificationMessage) -> None:
         """
@@ -527,7 +1059,7 @@ class NotificationService:
         
         payload = {
             "id": notification.id,
-            "type": notification.type.value,
+            "type": notification.type,
             "title": notification.title,
             "content": notification.content,
             "recipient": notification.recipient,
@@ -535,44 +1067,99 @@ class NotificationService:
             "metadata": notification.metadata
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                webhook_url,
-                json=payload,
-                headers={'Content-Type': 'application/json'},
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                if response.status >= 400:
-                    raise ValueError(f"Webhook request failed with status {response.status}")
+        session = self._get_http_session()
+        async with session.post(webhook_url, data=_json_dumps(payload)) as response:
+            if response.status == 429:
+                raise NotificationRateLimited(
+                    f"Webhook request rate limited",
+                    _parse_retry_after(response.headers.get("Retry-After"))
+                )
+            if response.status >= 400:
+                raise ValueError(f"Webhook request failed with status {response.status}")
     
-    async def _send_websocket_notification(self, notification: NotificationMessage) -> None:
+    def _build_websocket_message(self, notification: NotificationMessage) -> Dict[str, Any]:
         """
-        发送WebSocket通知
+        构建WebSocket消息
         
         Args:
             notification: 通知消息
+            
+        Returns:
+            Dict[str, Any]: 消息内容
         """
-        message = {
+        return {
             "id": notification.id,
-            "type": notification.type.value,
+            "type": notification.type,
             "title": notification.title,
             "content": notification.content,
             "timestamp": notification.created_at.isoformat(),
             "metadata": notification.metadata
         }
+    
+    async def _send_websocket_notification(self, notification: NotificationMessage) -> None:
+        """
+        发送WebSocket通知
+        
+        Args:
+            notification: 通知消息
+        """
+        # 广播给所有连接
+        if notification.recipient == WEBSOCKET_BROADCAST_RECIPIENT:
+            await self.broadcast(notification)
+            return
         
-        # 发送给特定用户或广播
+        message = self._build_websocket_message(notification)
+        
+        # 发送给特定用户
         if notification.recipient in self.websocket_connections:
             websocket = self.websocket_connections[notification.recipient]
             try:
-                await websocket.send(json.dumps(message))
+                await websocket.send(_json_dumps(message).decode())
             except websockets.exceptions.ConnectionClosed:
                 # 连接已关闭，从连接列表中移除
-                del self.websocket_connections[notification.recipient]
+                self.websocket_connections.pop(notification.recipient, None)
                 raise ValueError("WebSocket connection closed")
         else:
             raise ValueError(f"WebSocket connection not found for user: {notification.recipient}")
     
+    async def broadcast(self, notification: NotificationMessage, batch_size: int = WEBSOCKET_BROADCAST_BATCH_SIZE) -> int:
+        """
+        向所有WebSocket连接分批广播通知，批次之间让出事件循环
+        
+        Args:
+            notification: 通知消息
+            batch_size: 每批并发发送的连接数
+            
+        Returns:
+            int: 成功送达的连接数
+        """
+        # 消息只序列化一次，所有连接共享同一个字符串
+        payload = _json_dumps(self._build_websocket_message(notification)).decode()
+        connections = list(self.websocket_connections.items())
+        delivered = 0
+        
+        for start in range(0, len(connections), batch_size):
+            batch = connections[start:start + batch_size]
+            results = await asyncio.gather(
+                *[websocket.send(payload) for _, websocket in batch],
+                return_exceptions=True
+            )
+            
+            for (user_id, websocket), result in zip(batch, results):
+                if isinstance(result, websockets.exceptions.ConnectionClosed):
+                    # 连接已关闭，从连接列表中移除
+                    if self.websocket_connections.get(user_id) is websocket:
+                        del self.websocket_connections[user_id]
+                elif isinstance(result, Exception):
+                    logger.warning(f"WebSocket broadcast to {user_id} failed: {str(result)}")
+                else:
+                    delivered += 1
+            
+            # 让出事件循环，避免大量连接时长时间占用
+            await asyncio.sleep(0)
+        
+        return delivered
+    
     async def _send_slack_notification(self, notification: NotificationMessage) -> None:
         """
         发送Slack通知
@@ -584,23 +1171,11 @@ class NotificationService:
         if not slack_webhook:
             raise ValueError("Slack webhook URL not configured")
         
-        # 根据通知类型设置颜色
-        color_map = {
-            NotificationType.SUCCESS: "good",
-            NotificationType.WARNING: "warning",
-            NotificationType.ERROR: "danger",
-            NotificationType.EXECUTION_FAILED: "danger",
-            NotificationType.INFO: "#36a64f",
-            NotificationType.EXECUTION_START: "#36a64f",
-            NotificationType.EXECUTION_COMPLETE: "good",
-            NotificationType.SYSTEM_ALERT: "warning"
-        }
-        
         payload = {
             "text": notification.title,
             "attachments": [
                 {
-                    "color": color_map.get(notification.type, "#36a64f"),
+                    "color": SLACK_COLORS[notification.type.ordinal],
                     "fields": [
                         {
                             "title": "Message",
@@ -609,7 +1184,7 @@ class NotificationService:
                         },
                         {
                             "title": "Type",
-                            "value": notification.type.value,
+                            "value": notification.type,
                             "short": True
                         },
                         {
@@ -622,15 +1197,15 @@ class NotificationService:
             ]
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                slack_webhook,
-                json=payload,
-                headers={'Content-Type': 'application/json'},
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                if response.status >= 400:
-                    raise ValueError(f"Slack webhook request failed with status {response.status}")
+        session = self._get_http_session()
+        async with session.post(slack_webhook, data=_json_dumps(payload)) as response:
+            if response.status == 429:
+                raise NotificationRateLimited(
+                    f"Slack webhook request rate limited",
+                    _parse_retry_after(response.headers.get("Retry-After"))
+                )
+            if response.status >= 400:
+                raise ValueError(f"Slack webhook request failed with status {response.status}")
     
     async def _send_discord_notification(self, notification: NotificationMessage) -> None:
         """
@@ -643,27 +1218,15 @@ class NotificationService:
         if not discord_webhook:
             raise ValueError("Discord webhook URL not configured")
         
-        # 根据通知类型设置颜色
-        color_map = {
-            NotificationType.SUCCESS: 0x00ff00,
-            NotificationType.WARNING: 0xffff00,
-            NotificationType.ERROR: 0xff0000,
-            NotificationType.EXECUTION_FAILED: 0xff0000,
-            NotificationType.INFO: 0x0099ff,
-            NotificationType.EXECUTION_START: 0x0099ff,
-            NotificationType.EXECUTION_COMPLETE: 0x00ff00,
-            NotificationType.SYSTEM_ALERT: 0xffff00
-        }
-        
         embed = {
             "title": notification.title,
             "description": notification.content,
-            "color": color_map.get(notification.type, 0x0099ff),
+            "color": DISCORD_COLORS[notification.type.ordinal],
             "timestamp": notification.created_at.isoformat(),
             "fields": [
                 {
                     "name": "Type",
-                    "value": notification.type.value,
+                    "value": notification.type,
                     "inline": True
                 },
                 {
@@ -678,15 +1241,15 @@ class NotificationService:
             "embeds": [embed]
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                discord_webhook,
-                json=payload,
-                headers={'Content-Type': 'application/json'},
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                if response.status >= 400:
-                    raise ValueError(f"Discord webhook request failed with status {response.status}")
+        session = self._get_http_session()
+        async with session.post(discord_webhook, data=_json_dumps(payload)) as response:
+            if response.status == 429:
+                raise NotificationRateLimited(
+                    f"Discord webhook request rate limited",
+                    _parse_retry_after(response.headers.get("Retry-After"))
+                )
+            if response.status >= 400:
+                raise ValueError(f"Discord webhook request failed with status {response.status}")
     
     def add_websocket_connection(self, user_id: str, websocket: WebSocketServerProtocol) -> None:
         """
@@ -710,6 +1273,21 @@ class NotificationService:
             del self.websocket_connections[user_id]
             logger.info(f"WebSocket connection removed for user: {user_id}")
     
+    def register_channel_handler(
+        self,
+        channel: NotificationChannel,
+        handler: Callable[[NotificationMessage], Awaitable[None]]
+    ) -> None:
+        """
+        注册或替换渠道的发送方法
+        
+        Args:
+            channel: 通知渠道
+            handler: 发送协程函数，失败时应抛出异常以触发重试
+        """
+        self._channel_handlers[channel] = handler
+        logger.info(f"Registered notification channel handler: {channel.value}")
+    
     def subscribe(self, notification_type: NotificationType, callback: Callable[[NotificationMessage], None]) -> None:
         """
         订阅通知类型
@@ -740,7 +1318,7 @@ class NotificationService:
         limit: int = 100
     ) -> List[NotificationMessage]:
         """
-        获取通知历史
+        获取通知历史，按完成时间倒序（最近完成的在前）
         
         Args:
             recipient: 接收者过滤
@@ -750,18 +1328,24 @@ class NotificationService:
         Returns:
             List[NotificationMessage]: 通知历史列表
         """
-        filtered_history = self.notification_history
-        
+        # 优先使用索引缩小遍历范围
         if recipient:
-            filtered_history = [n for n in filtered_history if n.recipient == recipient]
-        
-        if notification_type:
-            filtered_history = [n for n in filtered_history if n.type == notification_type]
-        
-        # 按创建时间倒序排列
-        filtered_history.sort(key=lambda x: x.created_at, reverse=True)
-        
-        return filtered_history[:limit]
+            candidates = self._history_by_recipient.get(recipient, ())
+        elif notification_type:
+            candidates = self._history_by_type.get(notification_type, ())
+        else:
+            candidates = self.notification_history
+        
+        # 历史记录按完成时间顺序追加，倒序遍历即为最近完成优先，取满即停
+        filtered_history = []
+        for notification in reversed(candidates):
+            if notification_type and notification.type != notification_type:
+                continue
+            filtered_history.append(notification)
+            if len(filtered_history) >= limit:
+                break
+        
+        return filtered_history
     
     def get_notification_statistics(self) -> Dict[str, Any]:
         """
@@ -770,34 +1354,14 @@ class NotificationService:
         Returns:
             Dict[str, Any]: 统计信息
         """
-        total_notifications = len(self.notification_history)
-        sent_notifications = len([n for n in self.notification_history if n.status == "sent"])
-        failed_notifications = len([n for n in self.notification_history if n.status == "failed"])
-        pending_notifications = len(self.pending_notifications)
-        
-        # 按类型统计
-        type_stats = {}
-        for notification in self.notification_history:
-            type_name = notification.type.value
-            if type_name not in type_stats:
-                type_stats[type_name] = {"total": 0, "sent": 0, "failed": 0}
-            type_stats[type_name]["total"] += 1
-            if notification.status == "sent":
-                type_stats[type_name]["sent"] += 1
-            elif notification.status == "failed":
-                type_stats[type_name]["failed"] += 1
-        
-        # 按渠道统计
-        channel_stats = {}
-        for notification in self.notification_history:
-            channel_name = notification.channel.value
-            if channel_name not in channel_stats:
-                channel_stats[channel_name] = {"total": 0, "sent": 0, "failed": 0}
-            channel_stats[channel_name]["total"] += 1
-            if notification.status == "sent":
-                channel_stats[channel_name]["sent"] += 1
-            elif notification.status == "failed":
-                channel_stats[channel_name]["failed"] += 1
+        total_notifications = self._stats["total"]
+        sent_notifications = self._stats["sent"]
+        failed_notifications = self._stats["failed"]
+        pending_notifications = self.pending_notifications.qsize() + self.email_notifications.qsize()
+        
+        # 按类型、渠道统计（复制计数，避免调用方修改内部状态）
+        type_stats = {name: dict(stats) for name, stats in self._type_stats.items() if stats["total"]}
+        channel_stats = {name: dict(stats) for name, stats in self._channel_stats.items() if stats["total"]}
         
         return {
             "total_notifications": total_notifications,
@@ -817,7 +1381,7 @@ class NotificationService:
         Args:
             template: 通知模板
         """
-        self.notification_templates[template.name] = template
+        self._register_template(template)
         logger.info(f"Notification template added: {template.name}")
     
     def get_notification_template(self, name: str) -> Optional[NotificationTemplate]:
@@ -843,23 +1407,66 @@ class NotificationService:
     
     def cleanup_notification_history(self, older_than_days: int = 30) -> int:
         """
-        清理通知历史
+        清理通知历史，按完成时间判断是否过期
         
         Args:
-            older_than_days: 清理多少天前的记录
+            older_than_days: 清理多少天前完成的记录
             
         Returns:
             int: 清理的记录数
         """
         cutoff_time = datetime.utcnow() - timedelta(days=older_than_days)
         
-        original_count = len(self.notification_history)
-        self.notification_history = [
-            n for n in self.notification_history 
-            if n.created_at > cutoff_time
-        ]
+        # 历史按completed_at有序，最早完成的在左端，弹出直到遇到未过期的记录
+        cleaned_count = 0
+        while self.notification_history and self.notification_history[0].completed_at <= cutoff_time:
+            self._forget_history(self.notification_history.popleft())
+            cleaned_count += 1
         
-        cleaned_count = original_count - len(self.notification_history)
         logger.info(f"Cleaned up {cleaned_count} notification history records")
         
-        return cleaned_count
\ No newline at end of file
+        return cleaned_count
+    
+    async def aclose(self) -> None:
+        """
+        关闭通知服务的工作协程、待重试任务和连接
+        """
+        for recent in self._recent_notifications.values():
+            recent.timer.cancel()
+        self._recent_notifications.clear()
+        for task in list(self._retry_tasks):
+            task.cancel()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        await self._close_async_smtp()
+        self._smtp_pool.shutdown(wait=False)
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
+
+
+_notification_service_instance: Optional[NotificationService] = None
+
+def get_notification_service() -> NotificationService:
+    """
+    获取NotificationService单例实例
+    
+    Returns:
+        NotificationService: NotificationService实例
+    """
+    global _notification_service_instance
+    
+    if _notification_service_instance is None:
+        _notification_service_instance = NotificationService()
+    
+    return _notification_service_instance
+
+
+async def shutdown_notification_service() -> None:
+    """
+    停止已创建的NotificationService实例，在应用关闭时调用
+    """
+    if _notification_service_instance is not None:
+        await _notification_service_instance.stop()
@@ -1,23 +1,50 @@
 """Task服务层 - 处理Task相关的业务逻辑"""
 
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from typing import List, Optional, Dict, Any, Tuple, Union, Iterator
+from sqlalchemy.orm import Session, Query, selectinload, load_only
+from sqlalchemy import and_, or_, func, select, insert, update, exists, bindparam, cast, literal, literal_column, text, DateTime, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 import json
+from functools import lru_cache
 import logging
 import uuid
 
 def _ensure_datetime(dt_value):
     """确保值是datetime对象，如果是字符串则转换为datetime"""
     if isinstance(dt_value, str):
-        try:
-            return datetime.fromisoformat(dt_value.replace('Z', '+00:00'))
-        except ValueError:
-            logger.warning(f"Failed to parse datetime string: {dt_value}")
-            return None
+        return _parse_datetime(dt_value)
     return dt_value
 
+@lru_cache(maxsize=1024)
+def _parse_datetime(value: str) -> Optional[datetime]:
+    """解析ISO格式时间字符串（结果缓存，同一时间戳在执行过程中会被反复解析）"""
+    if value[-1:] == 'Z':
+        value = value[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        logger.warning(f"Failed to parse datetime string: {value}")
+        return None
+
+def _execution_duration(started_at, completed_at: datetime) -> Optional[int]:
+    """计算执行时长（秒），开始时间缺失或无法解析时返回None"""
+    if not started_at:
+        return None
+    try:
+        started_at = _ensure_datetime(started_at)
+        if started_at:
+            return int((completed_at - started_at).total_seconds())
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Failed to calculate task execution time: {e}")
+    return None
+
+def _isoformat(value) -> Optional[str]:
+    """将时间值转换为ISO字符串，已是字符串（如started_at列）时原样返回"""
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat()
+
 from ..models.task import Task, TaskStatus, TaskPriority
 from ..models.agent import Agent
 from ..schemas.task import TaskCreate, TaskUpdate, TaskSearchRequest
@@ -26,6 +53,137 @@ from ..core.config import get_settings
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# 不带过滤条件计数时，估算行数达到该值才直接使用估算值，小表仍精确计数
+COUNT_ESTIMATE_THRESHOLD = 100000
+
+# 流式读取Task时每批从数据库游标获取的行数
+TASK_STREAM_BATCH_SIZE = 500
+
+# 各状态需要更新的时间戳列（其他状态不更新时间戳）
+_STATUS_TIMESTAMP_COLUMNS = {
+    TaskStatus.RUNNING: "started_at",
+    TaskStatus.COMPLETED: "completed_at",
+    TaskStatus.FAILED: "completed_at",
+    TaskStatus.CANCELLED: "completed_at"
+}
+
+def _sql_execution_duration(completed_at: datetime):
+    """
+    在SQL中根据started_at列计算执行时长（秒，仅PostgreSQL），开始时间为空时保持原值
+    
+    Args:
+        completed_at: 完成时间
+    """
+    elapsed = func.extract("epoch", literal(completed_at, DateTime) - cast(Task.started_at, DateTime))
+    return func.coalesce(cast(func.floor(elapsed), Integer), Task.execution_duration)
+
+# 预构建的热点查询语句，参数通过bindparam传入，每次调用命中同一个编译缓存条目
+_STMT_GET_TASK = select(Task).where(Task.id == bindparam("task_id"))
+
+_STMT_TASK_STATISTICS = select(
+    Task.id,
+    Task.name,
+    Task.status,
+    Task.priority,
+    Task.assigned_agent_id,
+    Task.execution_duration,
+    Task.retry_count,
+    Task.created_at,
+    Task.updated_at,
+    Task.started_at,
+    Task.completed_at,
+    Task.dependencies
+).where(Task.id == bindparam("task_id"))
+
+_STMT_AGENT_EXISTS = select(exists().where(Agent.id == bindparam("agent_id")))
+
+# 摘要列表只需要的列，不加载input_data/output_data等大JSON列
+_TASK_SUMMARY_COLUMNS = (
+    Task.id,
+    Task.name,
+    Task.task_type,
+    Task.status,
+    Task.priority,
+    Task.assigned_agent_id,
+    Task.progress_percentage,
+    Task.tags,
+    Task.created_at,
+    Task.updated_at
+)
+
+# clone_task写入的列，顺序与clone_task中的SELECT一致
+_CLONE_TASK_COLUMNS = (
+    "name",
+    "description",
+    "task_type",
+    "status",
+    "priority",
+    "input_data",
+    "expected_output",
+    "assigned_agent_id",
+    "max_execution_time",
+    "max_retries",
+    "dependencies",
+    "meta_data",
+    "tags"
+)
+
+# list_tasks支持的过滤条件：参数名 -> 过滤的列
+_LIST_TASK_FILTERS = (
+    ("status", Task.status),
+    ("priority", Task.priority),
+    ("agent_id", Task.assigned_agent_id)
+)
+
+@lru_cache(maxsize=1)
+def _get_task_by_execution_id_stmt():
+    """根据执行ID查询Task的语句"""
+    return select(Task).where(Task.execution_id == bindparam("execution_id")).limit(1)
+
+@lru_cache(maxsize=2)
+def _list_tasks_stmt(summary: bool = False):
+    """
+    list_tasks的查询语句：每个过滤条件写成(:param IS NULL OR column = :param)，
+    不使用的条件传None，所有过滤组合共用同一条SQL和同一个缓存条目
+    
+    Args:
+        summary: 是否只加载摘要列
+    """
+    stmt = select(Task).options(selectinload(Task.assigned_agent))
+    if summary:
+        stmt = stmt.options(load_only(*_TASK_SUMMARY_COLUMNS))
+    for name, column in _LIST_TASK_FILTERS:
+        param = bindparam(name, type_=column.type)
+        stmt = stmt.where(or_(param.is_(None), column == param))
+    return stmt.offset(bindparam("skip")).limit(bindparam("limit"))
+
+@lru_cache(maxsize=4)
+def _tasks_by_status_stmt(by_agent: bool, by_priority: bool):
+    """
+    构建并缓存按状态（可选按Agent）查询Task的语句
+    
+    Args:
+        by_agent: 是否按Agent过滤
+        by_priority: 是否按优先级和创建时间排序
+    """
+    stmt = select(Task).options(selectinload(Task.assigned_agent)).where(Task.status == bindparam("status"))
+    if by_agent:
+        stmt = stmt.where(Task.assigned_agent_id == bindparam("agent_id"))
+    if by_priority:
+        stmt = stmt.order_by(Task.priority.desc(), Task.created_at.asc())
+    return stmt
+
+def _search_document():
+    """
+    Task全文检索文档表达式，必须与ix_tasks_search_gin索引表达式完全一致
+    （常量以字面量内联，避免绑定参数导致规划器无法匹配索引）
+    """
+    empty = literal_column("''")
+    return func.to_tsvector(
+        literal_column("'simple'"),
+        func.coalesce(Task.name, empty).op("||")(literal_column("' '")).op("||")(func.coalesce(Task.description, empty))
+    )
+
 class TaskService:
     """Task服务类"""
     
@@ -37,6 +195,44 @@ class TaskService:
             db: 数据库会话
         """
         self.db = db
+        # 本服务实例（每个请求一个）内已加载的Task，避免同一请求中重复查询
+        self._task_cache: Dict[int, Task] = {}
+    
+    def _task_query(self) -> Query:
+        """
+        构建预加载关联Agent的Task查询，避免序列化时逐行懒加载（N+1查询）
+        
+        Returns:
+            Query: Task查询对象
+        """
+        return self.db.query(Task).options(selectinload(Task.assigned_agent))
+    
+    def _agent_exists(self, agent_id: int) -> bool:
+        """
+        检查Agent是否存在（EXISTS查询，不加载Agent对象）
+        
+        Args:
+            agent_id: Agent ID
+            
+        Returns:
+            bool: 是否存在
+        """
+        return self.db.execute(_STMT_AGENT_EXISTS, {"agent_id": agent_id}).scalar()
+    
+    def _commit_keep_loaded(self):
+        """
+        提交事务但不使会话中的对象过期
+        
+        Task的服务端默认值已通过eager_defaults在flush时取回，
+        返回的Task在提交后可直接读取，无需refresh再查询一次。
+        只影响本次提交，会话的expire_on_commit设置保持不变。
+        """
+        expire_on_commit = self.db.expire_on_commit
+        self.db.expire_on_commit = False
+        try:
+            self.db.commit()
+        finally:
+            self.db.expire_on_commit = expire_on_commit
     
     def create_task(self, task_data: TaskCreate) -> Task:
         """
@@ -53,8 +249,7 @@ class TaskService:
         """
         # 验证关联的Agent是否存在
         if task_data.agent_id:
-            agent = self.db.query(Agent).filter(Agent.id == task_data.agent_id).first()
-            if not agent:
+            if not self._agent_exists(task_data.agent_id):
                 raise ValueError(f"Agent with ID {task_data.agent_id} not found")
         
         # 创建新Task
@@ -93,8 +288,7 @@ class TaskService:
         
         try:
             self.db.add(task)
-            self.db.commit()
-            self.db.refresh(task)
+            self._commit_keep_loaded()
             
             logger.info(f"Created new task: {task.title} (ID: {task.id})")
             return task
@@ -106,7 +300,7 @@ class TaskService:
     
     def get_task(self, task_id: int) -> Optional[Task]:
         """
-        根据ID获取Task
+        根据ID获取Task，同一服务实例内重复获取时直接返回已加载的对象
         
         Args:
             task_id: Task ID
@@ -114,7 +308,12 @@ class TaskService:
         Returns:
             Optional[Task]: Task实例或None
         """
-        return self.db.query(Task).filter(Task.id == task_id).first()
+        task = self._task_cache.get(task_id)
+        if task is None:
+            task = self.db.execute(_STMT_GET_TASK, {"task_id": task_id}).scalar_one_or_none()
+            if task is not None:
+                self._task_cache[task_id] = task
+        return task
     
     def get_task_by_execution_id(self, execution_id: str) -> Optional[Task]:
         """
@@ -126,7 +325,9 @@ class TaskService:
         Returns:
             Optional[Task]: Task实例或None
         """
-        return self.db.query(Task).filter(Task.execution_id == execution_id).first()
+        return self.db.execute(
+            _get_task_by_execution_id_stmt(), {"execution_id": execution_id}
+        ).scalar_one_or_none()
     
     def list_tasks(
         self,
@@ -135,8 +336,9 @@ class TaskService:
         status: Optional[TaskStatus] = None,
         priority: Optional[TaskPriority] = None,
         agent_id: Optional[int] = None,
-        category: Optional[str] = None
-    ) -> List[Task]:
+        stream: bool = False,
+        summary: bool = False
+    ) -> Union[List[Task], Iterator[Task]]:
         """
         获取Task列表
         
@@ -145,47 +347,66 @@ class TaskService:
             limit: 限制返回的记录数
             status: 状态过滤
             priority: 优先级过滤
-            agent_id: Agent ID过滤
-            category: 分类过滤
+            agent_id: Agent ID过滤（assigned_agent_id）
+            stream: 是否以迭代器形式分批读取（服务端游标），避免大结果集一次性加载到内存
+            summary: 是否只加载摘要列（_TASK_SUMMARY_COLUMNS），其他列在访问时才逐行加载，
+                只适用于不序列化完整TaskResponse的调用方
             
         Returns:
-            List[Task]: Task列表
-        """
-        query = self.db.query(Task)
-        
-        # 应用过滤条件
-        if status is not None:
-            query = query.filter(Task.status == status)
-        if priority is not None:
-            query = query.filter(Task.priority == priority)
-        if agent_id is not None:
-            query = query.filter(Task.agent_id == agent_id)
-        if category:
-            query = query.filter(Task.category == category)
-        
-        return query.offset(skip).limit(limit).all()
+            Union[List[Task], Iterator[Task]]: Task列表，stream为True时为迭代器
+        """
+        # 未使用的过滤条件传None
+        params = {
+            "status": status,
+            "priority": priority,
+            "agent_id": agent_id,
+            "skip": skip,
+            "limit": limit
+        }
+        stmt = _list_tasks_stmt(summary)
+        if stream:
+            return self.db.execute(
+                stmt, params, execution_options={"yield_per": TASK_STREAM_BATCH_SIZE}
+            ).scalars()
+        return self.db.execute(stmt, params).scalars().all()
     
-    def search_tasks(self, search_request: TaskSearchRequest) -> List[Task]:
+    def search_tasks(
+        self,
+        search_request: TaskSearchRequest,
+        stream: bool = False,
+        summary: bool = False
+    ) -> Union[List[Task], Iterator[Task]]:
         """
         搜索Task
         
         Args:
             search_request: 搜索请求参数
+            stream: 是否以迭代器形式分批读取（服务端游标），避免大结果集一次性加载到内存
+            summary: 是否只加载摘要列（同list_tasks）
             
         Returns:
-            List[Task]: 匹配的Task列表
+            Union[List[Task], Iterator[Task]]: 匹配的Task列表，stream为True时为迭代器
         """
-        query = self.db.query(Task)
+        query = self._task_query()
+        if summary:
+            query = query.options(load_only(*_TASK_SUMMARY_COLUMNS))
         
-        # 关键词搜索
+        # 关键词搜索：PostgreSQL上使用全文检索（ix_tasks_search_gin索引），其他数据库使用ILIKE
         if search_request.query:
-            search_term = f"%{search_request.query}%"
-            query = query.filter(
-                or_(
-                    Task.title.ilike(search_term),
-                    Task.description.ilike(search_term)
+            if self.db.get_bind().dialect.name == "postgresql":
+                query = query.filter(
+                    _search_document().op("@@")(
+                        func.plainto_tsquery(literal_column("'simple'"), search_request.query)
+                    )
+                )
+            else:
+                search_term = f"%{search_request.query}%"
+                query = query.filter(
+                    or_(
+                        Task.name.ilike(search_term),
+                        Task.description.ilike(search_term)
+                    )
                 )
-            )
         
         # 状态过滤
         if search_request.status:
@@ -196,17 +417,16 @@ class TaskService:
             query = query.filter(Task.priority == search_request.priority)
         
         # Agent过滤
-        if search_request.agent_id:
-            query = query.filter(Task.agent_id == search_request.agent_id)
+        if search_request.assigned_agent_id:
+            query = query.filter(Task.assigned_agent_id == search_request.assigned_agent_id)
         
-        # 分类过滤
-        if search_request.category:
-            query = query.filter(Task.category == search_request.category)
+        # 类型过滤
+        if search_request.task_type:
+            query = query.filter(Task.task_type == search_request.task_type)
         
         # 标签过滤
         if search_request.tags:
-            for tag in search_request.tags:
-                query = query.filter(Task.tags.contains([tag]))
+            query = query.filter(self._json_array_contains(Task.tags, search_request.tags))
         
         # 时间过滤
         if search_request.created_after:
@@ -225,7 +445,28 @@ class TaskService:
         
         # 分页
         offset = (search_request.page - 1) * search_request.size
-        return query.offset(offset).limit(search_request.size).all()
+        query = query.offset(offset).limit(search_request.size)
+        if stream:
+            return iter(query.yield_per(TASK_STREAM_BATCH_SIZE))
+        return query.all()
+    
+    def _json_array_contains(self, column, values: List[Any]):
+        """
+        构建JSON数组列的包含条件
+        
+        PostgreSQL上使用单个JSONB @>谓词，与对应的GIN索引表达式
+        （ix_tasks_tags_gin、ix_tasks_dependencies_gin）一致；其他数据库逐个元素匹配
+        
+        Args:
+            column: JSON数组列（Task.tags、Task.dependencies）
+            values: 需要全部包含的元素列表
+            
+        Returns:
+            ColumnElement: 过滤条件
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            return cast(column, JSONB).contains(values)
+        return and_(*(column.contains([value]) for value in values))
     
     def update_task(self, task_id: int, task_data: TaskUpdate) -> Optional[Task]:
         """
@@ -244,8 +485,7 @@ class TaskService:
         
         # 验证Agent ID（如果提供）
         if task_data.agent_id is not None:
-            agent = self.db.query(Agent).filter(Agent.id == task_data.agent_id).first()
-            if not agent:
+            if not self._agent_exists(task_data.agent_id):
                 raise ValueError(f"Agent with ID {task_data.agent_id} not found")
         
         # 更新字段
@@ -257,8 +497,7 @@ class TaskService:
         task.updated_at = datetime.utcnow()
         
         try:
-            self.db.commit()
-            self.db.refresh(task)
+            self._commit_keep_loaded()
             
             logger.info(f"Updated task: {task.title} (ID: {task.id})")
             return task
@@ -285,6 +524,7 @@ class TaskService:
         try:
             self.db.delete(task)
             self.db.commit()
+            self._task_cache.pop(task_id, None)
             
             logger.info(f"Deleted task: {task.title} (ID: {task.id})")
             return True
@@ -294,9 +534,9 @@ class TaskService:
             logger.error(f"Failed to delete task {task_id}: {str(e)}")
             raise
     
-    def update_task_status(self, task_id: int, status: TaskStatus, result: Optional[Dict[str, Any]] = None) -> Optional[Task]:
+    def update_task_status(self, task_id: int, status: TaskStatus, result: Optional[Dict[str, Any]] = None) -> bool:
         """
-        更新Task状态
+        更新Task状态（单条UPDATE，不加载和刷新ORM对象）
         
         Args:
             task_id: Task ID
@@ -304,44 +544,47 @@ class TaskService:
             result: 执行结果（可选）
             
         Returns:
-            Optional[Task]: 更新后的Task实例或None
+            bool: 是否更新成功（Task不存在时为False）
         """
-        task = self.get_task(task_id)
-        if not task:
-            return None
-        
-        old_status = task.status
-        task.update_status(status)
+        now = datetime.utcnow()
+        values: Dict[str, Any] = {"status": status, "updated_at": now}
         
         # 更新结果
         if result is not None:
-            task.output_data = result
-        
-        # 更新时间戳
-        if status == TaskStatus.RUNNING:
-            task.started_at = datetime.utcnow()
-        elif status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
-            task.completed_at = datetime.utcnow()
-            if task.started_at:
-                try:
-                    started_at = _ensure_datetime(task.started_at)
-                    completed_at = _ensure_datetime(task.completed_at)
-                    if started_at and completed_at:
-                        task.execution_time = (completed_at - started_at).total_seconds()
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Failed to calculate task execution time: {e}")
+            values["output_data"] = result
+        
+        # 按状态更新对应的时间戳
+        timestamp_column = _STATUS_TIMESTAMP_COLUMNS.get(status)
+        if timestamp_column is not None:
+            values[timestamp_column] = now
+        
+        # 结束状态需要根据开始时间计算执行时长：PostgreSQL上在UPDATE中计算，其他数据库先读取开始时间
+        if timestamp_column == "completed_at":
+            if self.db.get_bind().dialect.name == "postgresql":
+                values["execution_duration"] = _sql_execution_duration(now)
+            else:
+                started_at = self.db.execute(
+                    select(Task.started_at).where(Task.id == bindparam("task_id")),
+                    {"task_id": task_id}
+                ).scalar()
+                duration = _execution_duration(started_at, now)
+                if duration is not None:
+                    values["execution_duration"] = duration
         
         try:
+            updated = self.db.execute(update(Task).where(Task.id == task_id).values(**values)).rowcount
             self.db.commit()
-            self.db.refresh(task)
-            
-            logger.info(f"Updated task {task.title} status: {old_status} -> {status}")
-            return task
             
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to update task {task_id} status: {str(e)}")
             raise
+        
+        if not updated:
+            return False
+        
+        logger.info(f"Updated task {task_id} status: {status}")
+        return True
     
     def get_pending_tasks(self, agent_id: Optional[int] = None) -> List[Task]:
         """
@@ -353,13 +596,12 @@ class TaskService:
         Returns:
             List[Task]: 待执行的Task列表
         """
-        query = self.db.query(Task).filter(Task.status == TaskStatus.PENDING)
-        
-        if agent_id:
-            query = query.filter(Task.agent_id == agent_id)
-        
         # 按优先级和创建时间排序
-        return query.order_by(Task.priority.desc(), Task.created_at.asc()).all()
+        params: Dict[str, Any] = {"status": TaskStatus.PENDING}
+        if agent_id:
+            params["agent_id"] = agent_id
+        stmt = _tasks_by_status_stmt("agent_id" in params, True)
+        return self.db.execute(stmt, params).scalars().all()
     
     def get_running_tasks(self, agent_id: Optional[int] = None) -> List[Task]:
         """
@@ -371,12 +613,11 @@ class TaskService:
         Returns:
             List[Task]: 正在运行的Task列表
         """
-        query = self.db.query(Task).filter(Task.status == TaskStatus.RUNNING)
-        
+        params: Dict[str, Any] = {"status": TaskStatus.RUNNING}
         if agent_id:
-            query = query.filter(Task.agent_id == agent_id)
-        
-        return query.all()
+            params["agent_id"] = agent_id
+        stmt = _tasks_by_status_stmt("agent_id" in params, False)
+        return self.db.execute(stmt, params).scalars().all()
     
     def get_task_dependencies(self, task_id: int) -> List[Task]:
         """
@@ -392,7 +633,7 @@ class TaskService:
         if not task or not task.dependencies:
             return []
         
-        return self.db.query(Task).filter(Task.id.in_(task.dependencies)).all()
+        return self._task_query().filter(Task.id.in_(task.dependencies)).all()
     
     def get_dependent_tasks(self, task_id: int) -> List[Task]:
         """
@@ -404,7 +645,7 @@ class TaskService:
         Returns:
             List[Task]: 依赖于该Task的任务列表
         """
-        return self.db.query(Task).filter(Task.dependencies.contains([task_id])).all()
+        return self._task_query().filter(self._json_array_contains(Task.dependencies, [task_id])).all()
     
     def can_execute_task(self, task_id: int) -> bool:
         """
@@ -424,18 +665,61 @@ class TaskService:
         if task.status != TaskStatus.PENDING:
             return False
         
-        # 检查依赖
-        if task.dependencies:
-            dependencies = self.get_task_dependencies(task_id)
-            for dep_task in dependencies:
-                if dep_task.status != TaskStatus.COMPLETED:
-                    return False
+        return self._dependencies_completed(task.dependencies)
+    
+    def _dependencies_completed(self, dependencies: Optional[List[int]]) -> bool:
+        """
+        检查依赖是否全部完成：只统计未完成的依赖数量，不加载依赖任务对象
         
-        return True
+        Args:
+            dependencies: 依赖的Task ID列表
+            
+        Returns:
+            bool: 是否全部完成（无依赖时为True）
+        """
+        if not dependencies:
+            return True
+        unfinished = self.db.query(func.count(Task.id)).filter(
+            Task.id.in_(dependencies),
+            Task.status != TaskStatus.COMPLETED
+        ).scalar()
+        return unfinished == 0
+    
+    def can_execute_tasks(self, task_ids: List[int]) -> Dict[int, bool]:
+        """
+        批量检查Task是否可以执行，固定使用两次查询
+        
+        Args:
+            task_ids: Task ID列表
+            
+        Returns:
+            Dict[int, bool]: 每个Task ID是否可以执行（不存在的Task为False）
+        """
+        result = {task_id: False for task_id in task_ids}
+        if not task_ids:
+            return result
+        
+        rows = self.db.query(Task.id, Task.status, Task.dependencies).filter(Task.id.in_(task_ids)).all()
+        pending = [(task_id, dependencies or []) for task_id, status, dependencies in rows if status == TaskStatus.PENDING]
+        
+        # 一次查询出所有依赖中未完成的任务
+        all_dependencies = {dep_id for _, dependencies in pending for dep_id in dependencies}
+        unfinished = set()
+        if all_dependencies:
+            unfinished = {
+                dep_id for (dep_id,) in self.db.query(Task.id).filter(
+                    Task.id.in_(all_dependencies),
+                    Task.status != TaskStatus.COMPLETED
+                )
+            }
+        
+        for task_id, dependencies in pending:
+            result[task_id] = unfinished.isdisjoint(dependencies)
+        return result
     
     def get_task_statistics(self, task_id: int) -> Optional[Dict[str, Any]]:
         """
-        获取Task统计信息
+        获取Task统计信息（只查询需要的列，不加载ORM对象）
         
         Args:
             task_id: Task ID
@@ -443,26 +727,26 @@ class TaskService:
         Returns:
             Optional[Dict[str, Any]]: 统计信息或None
         """
-        task = self.get_task(task_id)
-        if not task:
+        row = self.db.execute(_STMT_TASK_STATISTICS, {"task_id": task_id}).first()
+        if row is None:
             return None
         
+        dependencies = row.dependencies or []
         return {
-            "id": task.id,
-            "title": task.title,
-            "status": task.status.value,
-            "priority": task.priority.value,
-            "execution_id": task.execution_id,
-            "agent_id": task.agent_id,
-            "execution_time": task.execution_time,
-            "retry_count": task.retry_count,
-            "created_at": task.created_at.isoformat(),
-            "updated_at": task.updated_at.isoformat(),
-            "started_at": task.started_at.isoformat() if task.started_at else None,
-            "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-            "has_dependencies": bool(task.dependencies),
-            "dependency_count": len(task.dependencies) if task.dependencies else 0,
-            "can_execute": self.can_execute_task(task_id)
+            "id": row.id,
+            "title": row.name,
+            "status": row.status.value,
+            "priority": row.priority.value,
+            "agent_id": row.assigned_agent_id,
+            "execution_time": row.execution_duration,
+            "retry_count": row.retry_count,
+            "created_at": _isoformat(row.created_at),
+            "updated_at": _isoformat(row.updated_at),
+            "started_at": _isoformat(row.started_at),
+            "completed_at": _isoformat(row.completed_at),
+            "has_dependencies": bool(dependencies),
+            "dependency_count": len(dependencies),
+            "can_execute": row.status == TaskStatus.PENDING and self._dependencies_completed(dependencies)
         }
     
     def validate_task_config(self, task_data: TaskCreate) -> Dict[str, Any]:
@@ -486,9 +770,11 @@ class TaskService:
         if not task_data.description or len(task_data.description.strip()) == 0:
             warnings.append("Task description is recommended")
         
-        # 验证Agent
+        # 验证Agent（只查询需要的列）
         if task_data.agent_id:
-            agent = self.db.query(Agent).filter(Agent.id == task_data.agent_id).first()
+            agent = self.db.execute(
+                select(Agent.name, Agent.is_active).where(Agent.id == task_data.agent_id)
+            ).one_or_none()
             if not agent:
                 errors.append(f"Agent with ID {task_data.agent_id} not found")
             elif not agent.is_active:
@@ -504,11 +790,13 @@ class TaskService:
         if task_data.retry_delay and task_data.retry_delay < 0:
             errors.append("Retry delay cannot be negative")
         
-        # 验证依赖关系
+        # 验证依赖关系：一次查询所有依赖是否存在
         if task_data.dependencies:
+            found = set(self.db.execute(
+                select(Task.id).where(Task.id.in_(task_data.dependencies))
+            ).scalars())
             for dep_id in task_data.dependencies:
-                dep_task = self.get_task(dep_id)
-                if not dep_task:
+                if dep_id not in found:
                     errors.append(f"Dependency task with ID {dep_id} not found")
         
         # 提供建议
@@ -532,6 +820,8 @@ class TaskService:
         """
         克隆Task
         
+        在数据库端用INSERT ... SELECT ... RETURNING完成复制，源Task的JSON数据不经过Python
+        
         Args:
             task_id: 源Task ID
             new_title: 新Task标题
@@ -540,55 +830,119 @@ class TaskService:
         Returns:
             Optional[Task]: 克隆的Task实例或None
         """
-        source_task = self.get_task(task_id)
-        if not source_task:
-            return None
-        
-        # 创建克隆数据
-        clone_data = TaskCreate(
-            title=new_title,
-            description=new_description or f"Clone of {source_task.title}",
-            priority=source_task.priority,
-            
-            input_data=source_task.input_data.copy() if source_task.input_data else {},
-            expected_output=source_task.expected_output,
-            
-            agent_id=source_task.agent_id,
-            timeout=source_task.timeout,
-            max_retries=source_task.max_retries,
-            retry_delay=source_task.retry_delay,
-            
+        if new_description is not None:
+            description = literal(new_description, String)
+        else:
+            description = literal("Clone of ", String) + Task.name
+        
+        # 复制配置，执行状态和结果使用默认值
+        source = select(
+            literal(new_title, String),
+            description,
+            Task.task_type,
+            literal(TaskStatus.PENDING, Task.status.type),
+            Task.priority,
+            Task.input_data,
+            Task.expected_output,
+            Task.assigned_agent_id,
+            Task.max_execution_time,
+            Task.max_retries,
             # 不复制依赖关系，避免循环依赖
-            dependencies=[],
+            literal([], Task.dependencies.type),
+            Task.meta_data,
+            Task.tags
+        ).where(Task.id == task_id)
+        
+        stmt = insert(Task).from_select(_CLONE_TASK_COLUMNS, source).returning(Task)
+        
+        try:
+            task = self.db.execute(select(Task).from_statement(stmt)).scalar_one_or_none()
+            if task is None:
+                return None
+            self._commit_keep_loaded()
             
-            async_execution=source_task.async_execution,
-            auto_retry=source_task.auto_retry,
-            save_output=source_task.save_output,
+            logger.info(f"Cloned task {task_id} as {task.name} (ID: {task.id})")
+            return task
             
-            metadata=source_task.meta_data.copy() if source_task.meta_data else {},
-            tags=source_task.tags.copy() if source_task.tags else [],
-            category=source_task.category
-        )
-        
-        return self.create_task(clone_data)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to clone task {task_id}: {str(e)}")
+            raise
     
-    def get_tasks_count(self, status: Optional[TaskStatus] = None, agent_id: Optional[int] = None) -> int:
+    def get_tasks_count(
+        self,
+        status: Optional[TaskStatus] = None,
+        agent_id: Optional[int] = None,
+        exact: bool = False
+    ) -> int:
         """
         获取Task数量
         
+        PostgreSQL上不带过滤条件时，大表直接返回pg_class中的估算行数，避免全表COUNT
+        
         Args:
             status: 状态过滤
             agent_id: Agent ID过滤
+            exact: 是否强制精确计数
             
         Returns:
             int: Task数量
         """
-        query = self.db.query(Task)
+        if not status and not agent_id and not exact:
+            estimate = self._estimated_task_count()
+            if estimate is not None and estimate >= COUNT_ESTIMATE_THRESHOLD:
+                return estimate
+        
+        stmt = select(func.count(Task.id))
         if status:
-            query = query.filter(Task.status == status)
+            stmt = stmt.where(Task.status == status)
         if agent_id:
-            query = query.filter(Task.agent_id == agent_id)
-        return query.count()
+            stmt = stmt.where(Task.assigned_agent_id == agent_id)
+        return self.db.execute(stmt).scalar_one()
+    
+    def _estimated_task_count(self) -> Optional[int]:
+        """
+        读取PostgreSQL统计信息中的tasks表估算行数
+        
+        Returns:
+            Optional[int]: 估算行数，非PostgreSQL或表尚未分析时为None
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return None
+        estimate = self.db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'tasks'::regclass")
+        ).scalar()
+        # 从未ANALYZE过的表reltuples为-1
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+    
+    def list_tasks_before(
+        self,
+        limit: int = 100,
+        created_before: Optional[datetime] = None,
+        status: Optional[TaskStatus] = None
+    ) -> Tuple[List[Task], bool]:
+        """
+        按创建时间倒序的键集分页，不需要总数和OFFSET
+        
+        Args:
+            limit: 返回的最大记录数
+            created_before: 游标，只返回早于该时间创建的Task（上一页最后一条的created_at）
+            status: 状态过滤
+            
+        Returns:
+            Tuple[List[Task], bool]: Task列表和是否还有更多记录
+        """
+        query = self._task_query()
+        if status is not None:
+            query = query.filter(Task.status == status)
+        if created_before is not None:
+            query = query.filter(Task.created_at < created_before)
+        
+        # 多取一条判断是否还有下一页
+        tasks = query.order_by(Task.created_at.desc()).limit(limit + 1).all()
+        return tasks[:limit], len(tasks) > limit
     
     def get_tasks_by_agent(self, agent_id: int, status: Optional[TaskStatus] = None) -> List[Task]:
         """
@@ -601,55 +955,67 @@ class TaskService:
         Returns:
             List[Task]: Task列表
         """
-        query = self.db.query(Task).filter(Task.agent_id == agent_id)
+        query = self._task_query().filter(Task.assigned_agent_id == agent_id)
         
         if status:
             query = query.filter(Task.status == status)
         
         return query.order_by(Task.created_at.desc()).all()
     
-    def cancel_task(self, task_id: int, reason: Optional[str] = None) -> Optional[Task]:
+    def cancel_task(self, task_id: int, reason: Optional[str] = None) -> bool:
         """
-        取消Task
+        取消Task（直接执行UPDATE，不加载和刷新ORM对象）
         
         Args:
             task_id: Task ID
             reason: 取消原因
             
         Returns:
-            Optional[Task]: 更新后的Task实例或None
+            bool: 是否取消成功（Task不存在时为False）
+            
+        Raises:
+            ValueError: 当Task状态不允许取消时
         """
-        task = self.get_task(task_id)
-        if not task:
-            return None
+        current = self.db.execute(
+            select(Task.status, Task.started_at).where(Task.id == bindparam("task_id")),
+            {"task_id": task_id}
+        ).first()
+        if current is None:
+            return False
         
         # 只能取消待执行或正在运行的任务
-        if task.status not in [TaskStatus.PENDING, TaskStatus.RUNNING]:
-            raise ValueError(f"Cannot cancel task with status {task.status.value}")
+        cancellable = [TaskStatus.PENDING, TaskStatus.RUNNING]
+        if current.status not in cancellable:
+            raise ValueError(f"Cannot cancel task with status {current.status.value}")
         
         # 更新状态和错误信息
-        task.status = TaskStatus.CANCELLED
-        task.completed_at = datetime.utcnow()
-        task.error_message = reason or "Task cancelled by user"
-        task.updated_at = datetime.utcnow()
-        
-        if task.started_at:
-            try:
-                started_at = _ensure_datetime(task.started_at)
-                completed_at = _ensure_datetime(task.completed_at)
-                if started_at and completed_at:
-                    task.execution_time = (completed_at - started_at).total_seconds()
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Failed to calculate task execution time: {e}")
+        now = datetime.utcnow()
+        values: Dict[str, Any] = {
+            "status": TaskStatus.CANCELLED,
+            "completed_at": now,
+            "error_message": reason or "Task cancelled by user",
+            "updated_at": now
+        }
+        duration = _execution_duration(current.started_at, now)
+        if duration is not None:
+            values["execution_duration"] = duration
         
         try:
+            # 状态条件防止与并发的状态变更竞争
+            updated = self.db.execute(
+                update(Task)
+                .where(Task.id == task_id, Task.status.in_(cancellable))
+                .values(**values)
+            ).rowcount
             self.db.commit()
-            self.db.refresh(task)
-            
-            logger.info(f"Cancelled task: {task.title} (ID: {task.id})")
-            return task
             
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to cancel task {task_id}: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+        
+        if not updated:
+            raise ValueError(f"Task {task_id} changed status before it could be cancelled")
+        
+        logger.info(f"Cancelled task: {task_id}")
+        return True
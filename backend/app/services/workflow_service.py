@@ -1,16 +1,163 @@
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    String,
+    Text,
+    case,
+    cast,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+import asyncio
 import json
-from typing import List
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from .. import models, schemas
 from ..models.workflow import WorkflowStatus, WorkflowType, ExecutionMode
+from ..schemas.workflow import (
+    WorkflowCloneRequest,
+    WorkflowSearchRequest,
+    WorkflowValidationResponse,
+    WorkflowVersionRequest,
+)
+
+logger = logging.getLogger(__name__)
+
+# Unfiltered counts above this many rows are served from planner statistics.
+COUNT_ESTIMATE_THRESHOLD = 100000
+
+# Buffered progress updates are written this often (seconds) by the background flusher.
+PROGRESS_FLUSH_INTERVAL = 5.0
+
+# Rows fetched per round-trip when streaming executable workflows.
+EXECUTABLE_WORKFLOWS_BATCH_SIZE = 100
+
+# Columns search_workflows may sort by; anything else falls back to created_at.
+_SEARCH_SORT_COLUMNS = {
+    "created_at": models.Workflow.created_at,
+    "updated_at": models.Workflow.updated_at,
+    "name": models.Workflow.name,
+    "id": models.Workflow.id,
+}
+
+# Columns update_workflow may assign from request data.
+_UPDATABLE_FIELDS = frozenset(models.Workflow.__table__.columns.keys()) - {
+    "id",
+    "created_at",
+    "updated_at",
+}
+
+# Columns written by clone_workflow/create_workflow_version, in SELECT order.
+_COPY_WORKFLOW_COLUMNS = (
+    "name",
+    "description",
+    "version",
+    "status",
+    "parent_workflow_id",
+    "is_latest_version",
+    "execution_history",
+    "execution_count",
+    "success_count",
+    "failure_count",
+    "average_execution_time",
+    "workflow_type",
+    "execution_mode",
+    "workflow_definition",
+    "agents_config",
+    "tasks_config",
+    "max_execution_time",
+    "retry_policy",
+    "error_handling",
+    "schedule_config",
+    "trigger_conditions",
+    "is_template",
+    "is_public",
+    "is_active",
+    "owner_id",
+    "permissions",
+    "meta_data",
+    "tags",
+    "category",
+)
+
+
+# Timestamp column set when a workflow enters each status.
+_STATUS_TIMESTAMP_COLUMNS = {
+    WorkflowStatus.RUNNING: "started_at",
+    WorkflowStatus.COMPLETED: "completed_at",
+    WorkflowStatus.FAILED: "completed_at",
+    WorkflowStatus.CANCELLED: "completed_at",
+}
+
+# Statistics counter incremented when a workflow enters each status.
+_STATUS_COUNTER_COLUMNS = {
+    WorkflowStatus.RUNNING: "execution_count",
+    WorkflowStatus.COMPLETED: "success_count",
+    WorkflowStatus.FAILED: "failure_count",
+}
+
+
+def _elapsed_seconds(started_at: Optional[str], now: datetime) -> Optional[int]:
+    """
+    Seconds between an ISO ``started_at`` string and ``now``, or None if unknown.
+    """
+    if not started_at:
+        return None
+    try:
+        return int((now - datetime.fromisoformat(started_at)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _bump_version(version: str, version_type: str) -> str:
+    """
+    Return ``version`` bumped by ``version_type`` (major, minor or patch).
+    """
+    major, minor, patch = (int(part) for part in version.split("."))
+    if version_type == "major":
+        return f"{major + 1}.0.0"
+    if version_type == "minor":
+        return f"{major}.{minor + 1}.0"
+    if version_type == "patch":
+        return f"{major}.{minor}.{patch + 1}"
+    raise ValueError(f"Unknown version type '{version_type}'")
+
+
+def _cursor_value(column, raw: str) -> Any:
+    """
+    Convert a serialized cursor sort value back to the column's Python type.
+    """
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(raw)
+    if column is models.Workflow.id:
+        return int(raw)
+    return raw
 
 
 class WorkflowService:
+    def __init__(self):
+        # workflow_id -> (completed_steps, current_step) awaiting a flush
+        self._progress_buf: Dict[int, Tuple[int, Optional[str]]] = {}
+        self._progress_lock = threading.Lock()
+
     def create_workflow_template(
         self, db: Session, template: schemas.WorkflowTemplateCreate
     ) -> models.Workflow:
         """
         Create a new workflow template.
+
+        Raises ValueError if a workflow with the same name already exists.
         """
         # The 'definition' is a Pydantic model, so we need to convert it to a dict/JSON string
         # to store in the database. `model_dump_json` is a good way to do this.
@@ -30,23 +177,36 @@ class WorkflowService:
             status=WorkflowStatus.DRAFT,  # Use the enum member
         )
         db.add(db_template)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise ValueError(
+                f"Workflow with name '{template.name}' already exists"
+            )
         db.refresh(db_template)
         return db_template
 
     def get_workflow_templates(
-        self, db: Session, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
     ) -> List[models.Workflow]:
         """
-        Retrieve workflow templates.
+        Retrieve workflow templates, newest first.
+
+        Pass the id of the last template seen as ``after_id`` to get the next
+        page from the partial ix_workflows_templates index; ``skip`` is only
+        honoured for callers that do not send a cursor.
         """
-        return (
-            db.query(models.Workflow)
-            .filter(models.Workflow.is_template == True)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = db.query(models.Workflow).filter(models.Workflow.is_template == True)
+        if after_id is not None:
+            query = query.filter(models.Workflow.id < after_id)
+        elif skip:
+            query = query.offset(skip)
+        return query.order_by(models.Workflow.id.desc()).limit(limit).all()
 
     def get_workflow_template(self, db: Session, template_id: int) -> models.Workflow:
         """
@@ -72,5 +232,778 @@ class WorkflowService:
             db.commit()
         return db_template
 
+    def create_workflow(
+        self, db: Session, workflow_data: schemas.WorkflowCreate
+    ) -> models.Workflow:
+        """
+        Create a workflow.
+
+        Name uniqueness is enforced by the unique index on ``workflows.name``
+        rather than a SELECT beforehand, so concurrent creates cannot race.
+        Raises ValueError when the name is already taken or the definition is
+        inconsistent.
+        """
+        Workflow = models.Workflow
+        values = workflow_data.model_dump()
+        values["total_steps"] = self._validate_workflow_definition(
+            workflow_data.workflow_definition
+        )
+
+        if db.get_bind().dialect.name == "postgresql":
+            stmt = (
+                pg_insert(Workflow)
+                .values(**values)
+                .on_conflict_do_nothing(index_elements=["name"])
+                .returning(Workflow)
+            )
+            workflow = db.scalars(stmt).first()
+            if workflow is None:
+                db.rollback()
+                raise ValueError(
+                    f"Workflow with name '{workflow_data.name}' already exists"
+                )
+            db.commit()
+            return workflow
+
+        workflow = Workflow(**values)
+        db.add(workflow)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise ValueError(
+                f"Workflow with name '{workflow_data.name}' already exists"
+            )
+        return workflow
+
+    def update_workflow(
+        self, db: Session, workflow_id: int, workflow_data: schemas.WorkflowUpdate
+    ) -> Optional[models.Workflow]:
+        """
+        Update a workflow with the fields set on ``workflow_data``.
+
+        updated_at is not assigned here: the column's ``onupdate=func.now()``
+        stamps it with the database clock. Raises ValueError if the new name is
+        taken or the new definition is inconsistent.
+        """
+        workflow = db.get(models.Workflow, workflow_id)
+        if workflow is None:
+            return None
+
+        values = workflow_data.model_dump(exclude_unset=True)
+        if values.get("workflow_definition") is not None:
+            values["total_steps"] = self._validate_workflow_definition(
+                values["workflow_definition"]
+            )
+        for field, value in values.items():
+            if field in _UPDATABLE_FIELDS:
+                setattr(workflow, field, value)
+
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise ValueError(
+                f"Workflow with name '{workflow_data.name}' already exists"
+            )
+        return workflow
+
+    def clone_workflow(
+        self, db: Session, workflow_id: int, clone_request: WorkflowCloneRequest
+    ) -> Optional[models.Workflow]:
+        """
+        Clone a workflow as a new draft.
+
+        The copy is made server-side with INSERT ... SELECT ... RETURNING, so the
+        JSON columns never pass through Python. Returns None if the source does
+        not exist and raises ValueError if the new name is taken.
+        """
+        Workflow = models.Workflow
+        if clone_request.description is not None:
+            description = literal(clone_request.description, Text)
+        else:
+            description = Workflow.description
+
+        if clone_request.copy_execution_history:
+            history = Workflow.execution_history
+        else:
+            history = literal([], Workflow.execution_history.type)
+
+        if clone_request.reset_statistics:
+            statistics = (literal(0), literal(0), literal(0), literal(0))
+        else:
+            statistics = (
+                Workflow.execution_count,
+                Workflow.success_count,
+                Workflow.failure_count,
+                Workflow.average_execution_time,
+            )
+
+        source = select(
+            literal(clone_request.name, String),
+            description,
+            Workflow.version,
+            literal(WorkflowStatus.DRAFT, Workflow.status.type),
+            literal(None, Workflow.parent_workflow_id.type),
+            literal(True),
+            history,
+            *statistics,
+            *self._copied_config_columns(),
+        ).where(Workflow.id == workflow_id)
+
+        workflow = self._insert_workflow_copy(
+            db,
+            source,
+            workflow_id,
+            f"Workflow with name '{clone_request.name}' already exists",
+        )
+        if workflow is not None:
+            db.commit()
+        return workflow
+
+    def create_workflow_version(
+        self, db: Session, workflow_id: int, version_request: WorkflowVersionRequest
+    ) -> Optional[models.Workflow]:
+        """
+        Create a new version of a workflow and mark it as the latest one.
+
+        The new row is copied server-side with INSERT ... SELECT and named
+        ``"<name> v<version>"`` so it does not collide with the parent.
+        Returns None if the source workflow does not exist.
+        """
+        Workflow = models.Workflow
+        current_version = (
+            db.query(Workflow.version).filter(Workflow.id == workflow_id).scalar()
+        )
+        if current_version is None:
+            return None
+        new_version = _bump_version(current_version, version_request.version_type)
+
+        if version_request.description is not None:
+            description = literal(version_request.description, Text)
+        else:
+            description = Workflow.description
+
+        source = select(
+            Workflow.name + literal(f" v{new_version}", String),
+            description,
+            literal(new_version, String),
+            literal(WorkflowStatus.DRAFT, Workflow.status.type),
+            Workflow.id,
+            literal(True),
+            literal([], Workflow.execution_history.type),
+            literal(0),
+            literal(0),
+            literal(0),
+            literal(0),
+            *self._copied_config_columns(),
+        ).where(Workflow.id == workflow_id)
+
+        workflow = self._insert_workflow_copy(
+            db,
+            source,
+            workflow_id,
+            f"Version {new_version} of workflow {workflow_id} already exists",
+        )
+        if workflow is None:
+            return None
+        db.execute(
+            update(Workflow)
+            .where(Workflow.id == workflow_id)
+            .values(is_latest_version=False)
+        )
+        db.commit()
+        return workflow
+
+    def _copied_config_columns(self) -> Tuple[Any, ...]:
+        """
+        Source columns copied unchanged by clone/version, matching the tail of
+        ``_COPY_WORKFLOW_COLUMNS``.
+        """
+        Workflow = models.Workflow
+        return (
+            Workflow.workflow_type,
+            Workflow.execution_mode,
+            Workflow.workflow_definition,
+            Workflow.agents_config,
+            Workflow.tasks_config,
+            Workflow.max_execution_time,
+            Workflow.retry_policy,
+            Workflow.error_handling,
+            Workflow.schedule_config,
+            Workflow.trigger_conditions,
+            Workflow.is_template,
+            Workflow.is_public,
+            Workflow.is_active,
+            Workflow.owner_id,
+            Workflow.permissions,
+            Workflow.meta_data,
+            Workflow.tags,
+            Workflow.category,
+        )
+
+    def _insert_workflow_copy(
+        self, db: Session, source, source_id: int, conflict_message: str
+    ) -> Optional[models.Workflow]:
+        """
+        Run INSERT ... SELECT ... RETURNING for a copied workflow.
+
+        Name conflicts are turned into ValueError (ON CONFLICT DO NOTHING on
+        PostgreSQL, the unique index error elsewhere). Returns None when the
+        source row does not exist.
+        """
+        Workflow = models.Workflow
+        if db.get_bind().dialect.name == "postgresql":
+            stmt = (
+                pg_insert(Workflow)
+                .from_select(_COPY_WORKFLOW_COLUMNS, source)
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+        else:
+            stmt = insert(Workflow).from_select(_COPY_WORKFLOW_COLUMNS, source)
+
+        try:
+            workflow = db.scalars(stmt.returning(Workflow)).first()
+        except IntegrityError:
+            db.rollback()
+            raise ValueError(conflict_message)
+
+        if workflow is None:
+            db.rollback()
+            # Nothing inserted: either the source is missing or the name conflicted
+            if db.query(Workflow.id).filter(Workflow.id == source_id).first():
+                raise ValueError(conflict_message)
+        return workflow
+
+    def get_executable_workflows(self, db: Session) -> Iterator[models.Workflow]:
+        """
+        Stream active workflows that can be executed.
+
+        Rows are fetched ``EXECUTABLE_WORKFLOWS_BATCH_SIZE`` at a time through a
+        server-side cursor (served by ix_workflows_active), so memory stays
+        bounded regardless of table size. Wrap in ``list()`` if a list is needed.
+        """
+        Workflow = models.Workflow
+        return iter(
+            db.query(Workflow)
+            .filter(
+                Workflow.is_active == True,
+                Workflow.status.in_([WorkflowStatus.ACTIVE, WorkflowStatus.PAUSED]),
+            )
+            .yield_per(EXECUTABLE_WORKFLOWS_BATCH_SIZE)
+        )
+
+    def update_workflow_status(
+        self,
+        db: Session,
+        workflow_id: int,
+        status: WorkflowStatus,
+        error_message: Optional[str] = None,
+    ) -> bool:
+        """
+        Update a workflow's status with a single UPDATE.
+
+        The status timestamp and statistics counter are set in the same
+        statement; on PostgreSQL the execution duration is derived from
+        started_at in SQL too. The ORM instance is never loaded.
+        Returns False if the workflow does not exist.
+        """
+        Workflow = models.Workflow
+        now = datetime.utcnow()
+        values: Dict[str, Any] = {"status": status}
+        if error_message is not None:
+            values["error_message"] = error_message
+
+        # Write any buffered progress for this workflow in the same statement
+        with self._progress_lock:
+            pending = self._progress_buf.pop(workflow_id, None)
+        if pending is not None:
+            values.update(self._progress_values(*pending))
+
+        timestamp_column = _STATUS_TIMESTAMP_COLUMNS.get(status)
+        if timestamp_column is not None:
+            values[timestamp_column] = now.isoformat()
+
+        counter_column = _STATUS_COUNTER_COLUMNS.get(status)
+        if counter_column is not None:
+            values[counter_column] = (
+                func.coalesce(getattr(Workflow, counter_column), 0) + 1
+            )
+
+        if timestamp_column == "completed_at":
+            if db.get_bind().dialect.name == "postgresql":
+                elapsed = func.extract(
+                    "epoch",
+                    literal(now, DateTime) - cast(Workflow.started_at, DateTime),
+                )
+                values["execution_duration"] = func.coalesce(
+                    cast(func.floor(elapsed), Integer), Workflow.execution_duration
+                )
+            else:
+                started_at = (
+                    db.query(Workflow.started_at)
+                    .filter(Workflow.id == workflow_id)
+                    .scalar()
+                )
+                duration = _elapsed_seconds(started_at, now)
+                if duration is not None:
+                    values["execution_duration"] = duration
+
+        updated = db.execute(
+            update(Workflow).where(Workflow.id == workflow_id).values(**values)
+        ).rowcount
+        db.commit()
+        return bool(updated)
+
+    def update_workflow_progress(
+        self,
+        workflow_id: int,
+        completed_steps: int,
+        current_step: Optional[str] = None,
+    ) -> None:
+        """
+        Record step progress.
+
+        Progress is buffered per workflow and written every
+        ``PROGRESS_FLUSH_INTERVAL`` seconds by ``run_progress_flusher``; a
+        status change writes the workflow's pending progress along with the
+        new status, so terminal states are never stale.
+        """
+        with self._progress_lock:
+            previous = self._progress_buf.get(workflow_id)
+            if current_step is None and previous is not None:
+                current_step = previous[1]
+            self._progress_buf[workflow_id] = (completed_steps, current_step)
+
+    def flush_workflow_progress(self) -> int:
+        """
+        Write all buffered progress with one UPDATE ... CASE id statement.
+
+        The buffer holds progress from many requests, so it is written on a
+        session of its own rather than on any caller's. Entries are put back
+        if the write fails. Returns the number of workflows updated.
+        """
+        with self._progress_lock:
+            pending, self._progress_buf = self._progress_buf, {}
+        if not pending:
+            return 0
+
+        from ..core.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            updated = self._write_progress(db, pending)
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._progress_lock:
+                for workflow_id, progress in pending.items():
+                    self._progress_buf.setdefault(workflow_id, progress)
+            raise
+        finally:
+            db.close()
+        return updated
+
+    async def run_progress_flusher(self) -> None:
+        """
+        Flush buffered progress every ``PROGRESS_FLUSH_INTERVAL`` seconds until cancelled.
+        """
+        while True:
+            await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+            try:
+                await asyncio.to_thread(self.flush_workflow_progress)
+            except Exception:
+                logger.exception("Failed to flush workflow progress")
+
+    def _write_progress(
+        self, db: Session, pending: Dict[int, Tuple[int, Optional[str]]]
+    ) -> int:
+        """
+        Execute the batched progress UPDATE for ``pending`` on ``db``.
+        """
+        Workflow = models.Workflow
+        completed_steps = case(
+            {workflow_id: steps for workflow_id, (steps, _) in pending.items()},
+            value=Workflow.id,
+        )
+        values: Dict[str, Any] = {
+            "completed_steps": completed_steps,
+            "progress_percentage": self._progress_percentage(completed_steps),
+        }
+        steps = {
+            workflow_id: step
+            for workflow_id, (_, step) in pending.items()
+            if step is not None
+        }
+        if steps:
+            values["current_step"] = case(
+                steps, value=Workflow.id, else_=Workflow.current_step
+            )
+
+        return db.execute(
+            update(Workflow).where(Workflow.id.in_(list(pending))).values(**values)
+        ).rowcount
+
+    def _progress_values(
+        self, completed_steps: int, current_step: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        UPDATE values for a single workflow's progress.
+        """
+        values: Dict[str, Any] = {
+            "completed_steps": completed_steps,
+            "progress_percentage": self._progress_percentage(completed_steps),
+        }
+        if current_step is not None:
+            values["current_step"] = current_step
+        return values
+
+    def _progress_percentage(self, completed_steps) -> Any:
+        """
+        SQL expression deriving progress_percentage from total_steps.
+        """
+        Workflow = models.Workflow
+        return case(
+            (Workflow.total_steps > 0, completed_steps * 100 / Workflow.total_steps),
+            else_=Workflow.progress_percentage,
+        )
+
+    def validate_workflow_config(
+        self, db: Session, workflow_data: schemas.WorkflowCreate
+    ) -> WorkflowValidationResponse:
+        """
+        Validate a workflow configuration before it is saved.
+        """
+        errors: List[str] = []
+        warnings: List[str] = []
+        suggestions: List[str] = []
+
+        if not workflow_data.description:
+            warnings.append("Workflow description is recommended")
+
+        try:
+            self._validate_workflow_definition(workflow_data.workflow_definition)
+        except ValueError as e:
+            errors.append(str(e))
+
+        # Look up every referenced agent with one IN query; only numeric ids
+        # refer to stored agents, others are client-side placeholders.
+        agent_ids = [
+            config["id"]
+            for config in workflow_data.agents_config
+            if isinstance(config.get("id"), int)
+        ]
+        if agent_ids:
+            Agent = models.Agent
+            rows = (
+                db.query(Agent.id, Agent.name, Agent.is_active)
+                .filter(Agent.id.in_(agent_ids))
+                .all()
+            )
+            by_id = {row.id: row for row in rows}
+            for agent_id in agent_ids:
+                agent = by_id.get(agent_id)
+                if agent is None:
+                    errors.append(f"Agent with ID {agent_id} not found")
+                elif not agent.is_active:
+                    warnings.append(f"Agent {agent.name} is not active")
+
+        if not workflow_data.agents_config:
+            suggestions.append("Consider assigning agents to the workflow")
+        if not workflow_data.tasks_config:
+            suggestions.append("Consider configuring tasks for the workflow")
+
+        return WorkflowValidationResponse(
+            is_valid=not errors,
+            errors=errors,
+            warnings=warnings,
+            suggestions=suggestions,
+        )
+
+    def _validate_workflow_definition(self, definition: Dict[str, Any]) -> int:
+        """
+        Check that step ids are unique and connections reference known steps.
+
+        Steps and connections are each scanned once and the first problem found
+        is raised as ValueError. Returns the number of steps, which callers
+        store as ``total_steps`` instead of walking the steps again.
+        """
+        step_ids = set()
+        add_step = step_ids.add
+        for index, step in enumerate(definition.get("steps") or ()):
+            step_id = step.get("id") if isinstance(step, dict) else None
+            if step_id is None:
+                raise ValueError(f"Step {index} is missing an id")
+            if step_id in step_ids:
+                raise ValueError(f"Duplicate step id '{step_id}'")
+            add_step(step_id)
+
+        has_step = step_ids.__contains__
+        for index, connection in enumerate(definition.get("connections") or ()):
+            if not isinstance(connection, dict):
+                raise ValueError(f"Connection {index} must be an object")
+            source, target = connection.get("sourceId"), connection.get("targetId")
+            if not has_step(source):
+                raise ValueError(
+                    f"Connection {index} references unknown source step '{source}'"
+                )
+            if not has_step(target):
+                raise ValueError(
+                    f"Connection {index} references unknown target step '{target}'"
+                )
+        return len(step_ids)
+
+    def list_workflows(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[WorkflowStatus] = None,
+    ) -> List[models.Workflow]:
+        """
+        List workflows, newest first.
+
+        Ordered by (created_at, id) descending like the default search, so
+        ``workflow_cursor`` on the last row continues the listing through
+        ``search_workflows``.
+        """
+        Workflow = models.Workflow
+        query = db.query(Workflow)
+        if status is not None:
+            query = query.filter(Workflow.status == status)
+        query = query.order_by(Workflow.created_at.desc(), Workflow.id.desc())
+        if skip:
+            query = query.offset(skip)
+        return query.limit(limit).all()
+
+    def _is_unfiltered_search(self, search_request: WorkflowSearchRequest) -> bool:
+        """
+        Whether a search has no filters or cursor and uses the default order.
+        """
+        return (
+            not search_request.query
+            and not search_request.tags
+            and search_request.status is None
+            and search_request.workflow_type is None
+            and search_request.execution_mode is None
+            and search_request.category is None
+            and search_request.owner_id is None
+            and search_request.is_template is None
+            and search_request.is_public is None
+            and search_request.created_after is None
+            and search_request.created_before is None
+            and search_request.cursor_id is None
+            and search_request.cursor_sort_value is None
+            and search_request.sort_by in (None, "created_at")
+            and search_request.sort_order == "desc"
+        )
+
+    def search_workflows(
+        self,
+        db: Session,
+        search_request: WorkflowSearchRequest,
+        with_total: bool = False,
+    ) -> Union[List[models.Workflow], Tuple[List[models.Workflow], int]]:
+        """
+        Search workflows using keyset pagination.
+
+        The next page is requested by passing the sort value and id of the last
+        row of the previous page as ``cursor_sort_value``/``cursor_id`` (see
+        ``workflow_cursor``), so every page costs the same regardless of depth.
+
+        With ``with_total`` the result is ``(workflows, total)``, where the total
+        comes from ``count(*) OVER ()`` in the same query. It counts the matches
+        from the cursor onward, i.e. the full total on the first page.
+
+        ``page`` is only honoured for callers that do not send a cursor; it is
+        served with OFFSET, so deep pages cost more than following the cursor.
+        """
+        cursor_given = (
+            search_request.cursor_sort_value is not None
+            and search_request.cursor_id is not None
+        )
+        offset = 0 if cursor_given else (search_request.page - 1) * search_request.size
+
+        if not with_total and self._is_unfiltered_search(search_request):
+            return self.list_workflows(db, skip=offset, limit=search_request.size)
+
+        Workflow = models.Workflow
+        query = db.query(Workflow)
+
+        if search_request.query:
+            # Each whitespace-separated term must match name or description;
+            # the trigram GIN indexes serve these leading-wildcard ILIKEs.
+            for term in search_request.query.split():
+                pattern = f"%{term}%"
+                query = query.filter(
+                    or_(
+                        Workflow.name.ilike(pattern),
+                        Workflow.description.ilike(pattern),
+                    )
+                )
+        # Most selective equality filters first
+        if search_request.owner_id:
+            query = query.filter(Workflow.owner_id == search_request.owner_id)
+        if search_request.category:
+            query = query.filter(Workflow.category == search_request.category)
+        if search_request.status:
+            query = query.filter(Workflow.status == search_request.status)
+        if search_request.workflow_type:
+            query = query.filter(Workflow.workflow_type == search_request.workflow_type)
+        if search_request.execution_mode:
+            query = query.filter(
+                Workflow.execution_mode == search_request.execution_mode
+            )
+        if search_request.is_template is not None:
+            query = query.filter(Workflow.is_template == search_request.is_template)
+        if search_request.is_public is not None:
+            query = query.filter(Workflow.is_public == search_request.is_public)
+        if search_request.created_after:
+            query = query.filter(Workflow.created_at >= search_request.created_after)
+        if search_request.created_before:
+            query = query.filter(Workflow.created_at <= search_request.created_before)
+        if search_request.tags:
+            if db.get_bind().dialect.name == "postgresql":
+                # Single @> predicate; matches the ix_workflows_tags_gin expression
+                query = query.filter(
+                    cast(Workflow.tags, JSONB).contains(search_request.tags)
+                )
+            else:
+                for tag in search_request.tags:
+                    query = query.filter(Workflow.tags.contains([tag]))
+
+        sort_column = _SEARCH_SORT_COLUMNS.get(
+            search_request.sort_by, Workflow.created_at
+        )
+        descending = search_request.sort_order == "desc"
+
+        sort_key = sort_column
+        cursor_value = None
+        if cursor_given:
+            cursor_value = literal(
+                _cursor_value(sort_column, search_request.cursor_sort_value),
+                sort_column.type,
+            )
+        if (
+            isinstance(sort_column.type, DateTime)
+            and db.get_bind().dialect.name == "sqlite"
+        ):
+            # SQLite keeps DateTime as text: server-default CURRENT_TIMESTAMP
+            # values have no fractional part while bound datetimes do, so
+            # compare both sides as Julian day numbers instead of strings.
+            sort_key = func.julianday(sort_column)
+            if cursor_value is not None:
+                cursor_value = func.julianday(cursor_value)
+
+        if cursor_given:
+            key = tuple_(sort_key, Workflow.id)
+            cursor = tuple_(cursor_value, search_request.cursor_id)
+            query = query.filter(key < cursor if descending else key > cursor)
+
+        # id is the tie-breaker that keeps cursors deterministic
+        if descending:
+            query = query.order_by(sort_key.desc(), Workflow.id.desc())
+        else:
+            query = query.order_by(sort_key.asc(), Workflow.id.asc())
+        if offset:
+            query = query.offset(offset)
+
+        if not with_total:
+            return query.limit(search_request.size).all()
+
+        rows = (
+            query.add_columns(func.count().over().label("total_count"))
+            .limit(search_request.size)
+            .all()
+        )
+        total = rows[0].total_count if rows else 0
+        return [row[0] for row in rows], total
+
+    def get_workflows_count(
+        self,
+        db: Session,
+        status: Optional[WorkflowStatus] = None,
+        is_template: Optional[bool] = None,
+        exact: bool = False,
+    ) -> int:
+        """
+        Count workflows.
+
+        Without filters on a large PostgreSQL table this returns the planner's
+        row estimate from pg_class instead of running a full COUNT(*).
+        """
+        if status is None and is_template is None and not exact:
+            estimate = self._estimated_workflow_count(db)
+            if estimate is not None and estimate >= COUNT_ESTIMATE_THRESHOLD:
+                return estimate
+
+        query = db.query(func.count(models.Workflow.id))
+        if status is not None:
+            query = query.filter(models.Workflow.status == status)
+        if is_template is not None:
+            query = query.filter(models.Workflow.is_template == is_template)
+        return query.scalar()
+
+    def _estimated_workflow_count(self, db: Session) -> Optional[int]:
+        """
+        Read the workflows row estimate from PostgreSQL statistics.
+
+        Returns None on other databases or before the table has been analyzed.
+        """
+        if db.get_bind().dialect.name != "postgresql":
+            return None
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'workflows'::regclass")
+        ).scalar()
+        # reltuples is -1 for a table that was never analyzed
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+
+    @staticmethod
+    def workflow_cursor(
+        workflow: models.Workflow, sort_by: Optional[str] = "created_at"
+    ) -> Tuple[str, int]:
+        """
+        Build the ``(cursor_sort_value, cursor_id)`` pair for the page after ``workflow``.
+        """
+        column = _SEARCH_SORT_COLUMNS.get(sort_by, models.Workflow.created_at)
+        value = getattr(workflow, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        return str(value), workflow.id
+
 
 workflow_service = WorkflowService()
+
+# Background task started by start_progress_flusher
+_progress_flush_task: Optional[asyncio.Task] = None
+
+
+def start_progress_flusher() -> None:
+    """
+    Start the periodic progress flush for the shared service; call from the app lifespan.
+    """
+    global _progress_flush_task
+    if _progress_flush_task is None or _progress_flush_task.done():
+        _progress_flush_task = asyncio.create_task(
+            workflow_service.run_progress_flusher()
+        )
+
+
+async def shutdown_workflow_service() -> None:
+    """
+    Stop the periodic flush and write any progress still buffered.
+    """
+    global _progress_flush_task
+    if _progress_flush_task is not None:
+        _progress_flush_task.cancel()
+        try:
+            await _progress_flush_task
+        except asyncio.CancelledError:
+            pass
+        _progress_flush_task = None
+    try:
+        workflow_service.flush_workflow_progress()
+    except Exception:
+        logger.exception("Failed to flush workflow progress on shutdown")
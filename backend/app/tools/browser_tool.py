@@ -1,7 +1,9 @@
 """网页浏览工具 - 抓取网页内容"""
 
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import re
+import aiohttp
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
@@ -9,6 +11,132 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# 默认请求头
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+@lru_cache(maxsize=None)
+def _get_session() -> "requests.Session":
+    """
+    获取共享的HTTP会话，首次调用时创建，复用连接池和keep-alive连接
+    
+    requests在此处才导入，未使用网页浏览工具时不加载
+    
+    Returns:
+        requests.Session: 配置好连接池和重试策略的会话
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=100,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+# 连续空白字符（含换行），清理文本时压缩为单个空格
+_WS_RE = re.compile(r'\s+')
+
+# 异步抓取使用的aiohttp会话及其所属事件循环，首次调用_arun时创建
+_async_session: Optional[aiohttp.ClientSession] = None
+_async_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_async_session() -> aiohttp.ClientSession:
+    """
+    获取当前事件循环上的共享aiohttp会话，首次调用时创建
+    
+    aiohttp会话绑定创建时的事件循环，在其他事件循环中调用时会重新创建
+    
+    Returns:
+        aiohttp.ClientSession: HTTP会话
+    """
+    global _async_session, _async_session_loop
+    loop = asyncio.get_running_loop()
+    if _async_session is None or _async_session.closed or _async_session_loop is not loop:
+        _async_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                ttl_dns_cache=300,
+                keepalive_timeout=30
+            ),
+            headers=DEFAULT_HEADERS
+        )
+        _async_session_loop = loop
+    return _async_session
+
+async def close_browser_session() -> None:
+    """
+    关闭共享的aiohttp会话，在应用关闭时调用
+    """
+    global _async_session, _async_session_loop
+    if _async_session is not None and not _async_session.closed:
+        await _async_session.close()
+    _async_session = None
+    _async_session_loop = None
+
+def _lxml_text(content: bytes) -> str:
+    """
+    使用lxml解析HTML并提取文本，script/style的删除和文本拼接都在libxml2中完成
+    
+    Args:
+        content: 网页原始字节内容
+        
+    Returns:
+        str: 未清理空白的文本内容
+    """
+    import lxml.html
+    from lxml import etree
+    
+    document = lxml.html.fromstring(content)
+    etree.strip_elements(document, 'script', 'style', with_tail=False)
+    return document.text_content()
+
+def _soup_text(content: bytes) -> str:
+    """
+    使用BeautifulSoup和标准库html.parser提取文本，作为lxml不可用时的回退
+    
+    Args:
+        content: 网页原始字节内容
+        
+    Returns:
+        str: 未清理空白的文本内容
+    """
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(content, 'html.parser')
+    
+    # 移除脚本和样式标签
+    for script in soup(["script", "style"]):
+        script.decompose()
+    
+    return soup.get_text()
+
+def _extract_text(content: bytes) -> str:
+    """
+    解析HTML并提取清理后的纯文本
+    
+    Args:
+        content: 网页原始字节内容
+        
+    Returns:
+        str: 网页的纯文本内容
+    """
+    try:
+        text_content = _lxml_text(content)
+    except Exception as e:
+        logger.debug(f"lxml解析失败，回退到html.parser: {str(e)}")
+        text_content = _soup_text(content)
+    
+    # 清理文本：将连续空白压缩为单个空格
+    return _WS_RE.sub(' ', text_content).strip()
+
 class BrowserInput(BaseModel):
     """浏览器工具输入模型"""
     url: str = Field(..., description="要抓取的网页URL")
@@ -43,19 +171,13 @@ class BrowserTool(BaseTool):
         Raises:
             Exception: 当网页抓取失败时
         """
+        import requests
+        
         try:
-            # 设置默认请求头
-            default_headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            if headers:
-                default_headers.update(headers)
-            
-            # 发送HTTP请求
-            response = requests.get(
+            # 发送HTTP请求（默认请求头已设置在会话上，自定义请求头会与其合并）
+            response = _get_session().get(
                 url, 
-                headers=default_headers, 
+                headers=headers, 
                 timeout=timeout,
                 verify=False  # 忽略SSL证书验证
             )
@@ -64,20 +186,8 @@ class BrowserTool(BaseTool):
             if not response.ok:
                 raise Exception(f"HTTP请求失败: {response.status_code} - {response.reason}")
             
-            # 解析HTML内容
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 移除脚本和样式标签
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # 提取文本内容
-            text_content = soup.get_text()
-            
-            # 清理文本：移除多余的空白字符
-            lines = (line.strip() for line in text_content.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+            # 解析HTML内容并提取文本
+            text = _extract_text(response.content)
             
             logger.info(f"成功抓取网页内容: {url}，内容长度: {len(text)}")
             return text
@@ -114,5 +224,41 @@ class BrowserTool(BaseTool):
         Returns:
             str: 网页的纯文本内容
         """
-        # 对于网络请求，直接调用同步方法
-        return self._run(url, timeout, headers)
\ No newline at end of file
+        try:
+            session = _get_async_session()
+            async with session.get(
+                url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                ssl=False  # 忽略SSL证书验证
+            ) as response:
+                # 检查响应状态
+                if response.status >= 400:
+                    raise Exception(f"HTTP请求失败: {response.status} - {response.reason}")
+                content = await response.read()
+            
+            # HTML解析是CPU密集操作，放到线程池执行，避免阻塞事件循环
+            text = await asyncio.get_running_loop().run_in_executor(None, _extract_text, content)
+            
+            logger.info(f"成功抓取网页内容: {url}，内容长度: {len(text)}")
+            return text
+            
+        except asyncio.TimeoutError:
+            error_msg = f"请求超时: {url}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+            
+        except aiohttp.ClientConnectionError:
+            error_msg = f"连接错误: {url}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+            
+        except aiohttp.ClientError as e:
+            error_msg = f"请求异常: {str(e)}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+            
+        except Exception as e:
+            error_msg = f"网页抓取失败: {str(e)}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
\ No newline at end of file
@@ -1,15 +1,125 @@
 """计算器工具 - 执行数学计算"""
 
 import ast
-import operator
 import math
-from typing import Union, Dict, Any
+from functools import lru_cache
+from types import CodeType
+from typing import Union, Dict, Any, Callable
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 支持的运算符
+_OPERATORS = (
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Pow,
+    ast.Mod,
+    ast.USub,
+    ast.UAdd,
+)
+
+# 支持的数学函数
+_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    'abs': abs,
+    'round': round,
+    'min': min,
+    'max': max,
+    'sum': sum,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'asin': math.asin,
+    'acos': math.acos,
+    'atan': math.atan,
+    'sinh': math.sinh,
+    'cosh': math.cosh,
+    'tanh': math.tanh,
+    'log': math.log,
+    'log10': math.log10,
+    'log2': math.log2,
+    'exp': math.exp,
+    'sqrt': math.sqrt,
+    'ceil': math.ceil,
+    'floor': math.floor,
+    'factorial': math.factorial,
+    'degrees': math.degrees,
+    'radians': math.radians,
+}
+
+# 支持的常数
+_CONSTANTS: Dict[str, float] = {
+    'pi': math.pi,
+    'e': math.e,
+    'tau': math.tau,
+    'inf': math.inf,
+}
+
+# 表达式求值时唯一可见的名称，内置函数全部屏蔽
+_GLOBALS: Dict[str, Any] = {'__builtins__': {}, **_FUNCTIONS, **_CONSTANTS}
+
+# 允许出现在表达式中的节点类型
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.Constant,
+    ast.Name,
+    ast.Load,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Call,
+    ast.List,
+    ast.Tuple,
+) + _OPERATORS
+
+class _SafeExpressionValidator(ast.NodeVisitor):
+    """校验表达式AST只包含白名单中的节点、函数和常数"""
+    
+    def generic_visit(self, node: ast.AST) -> None:
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"不支持的节点类型: {type(node).__name__}")
+        super().generic_visit(node)
+    
+    def visit_Constant(self, node: ast.Constant) -> None:
+        if not isinstance(node.value, (int, float, complex)):
+            raise ValueError(f"不支持的常量: {node.value!r}")
+    
+    def visit_Name(self, node: ast.Name) -> None:
+        if node.id not in _CONSTANTS:
+            raise ValueError(f"不支持的变量: {node.id}")
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        if not isinstance(node.func, ast.Name):
+            raise ValueError("不支持的函数调用")
+        if node.func.id not in _FUNCTIONS:
+            raise ValueError(f"不支持的函数: {node.func.id}")
+        if node.keywords:
+            raise ValueError("不支持关键字参数")
+        for arg in node.args:
+            self.visit(arg)
+
+@lru_cache(maxsize=256)
+def _compile_expression(expression: str) -> CodeType:
+    """
+    解析、校验并编译表达式，相同表达式重复计算时直接复用编译结果
+    
+    Args:
+        expression: 已去除首尾空白的表达式字符串
+        
+    Returns:
+        CodeType: 可在受限命名空间中执行的代码对象
+        
+    Raises:
+        SyntaxError: 当表达式语法错误时
+        ValueError: 当表达式包含不支持的操作时
+    """
+    tree = ast.parse(expression, mode='eval')
+    _SafeExpressionValidator().visit(tree)
+    return compile(tree, '<calculator>', 'eval')
+
 class CalculatorInput(BaseModel):
     """计算器工具输入模型"""
     expression: str = Field(..., description="要计算的数学表达式")
@@ -28,106 +138,6 @@ class CalculatorTool(BaseTool):
     description: str = "执行数学计算。输入数学表达式，返回计算结果。支持基本运算和常用数学函数。"
     args_schema: type[BaseModel] = CalculatorInput
     
-    # 支持的运算符
-    _operators = {
-        ast.Add: operator.add,
-        ast.Sub: operator.sub,
-        ast.Mult: operator.mul,
-        ast.Div: operator.truediv,
-        ast.Pow: operator.pow,
-        ast.Mod: operator.mod,
-        ast.USub: operator.neg,
-        ast.UAdd: operator.pos,
-    }
-    
-    # 支持的数学函数
-    _functions = {
-        'abs': abs,
-        'round': round,
-        'min': min,
-        'max': max,
-        'sum': sum,
-        'sin': math.sin,
-        'cos': math.cos,
-        'tan': math.tan,
-        'asin': math.asin,
-        'acos': math.acos,
-        'atan': math.atan,
-        'sinh': math.sinh,
-        'cosh': math.cosh,
-        'tanh': math.tanh,
-        'log': math.log,
-        'log10': math.log10,
-        'log2': math.log2,
-        'exp': math.exp,
-        'sqrt': math.sqrt,
-        'ceil': math.ceil,
-        'floor': math.floor,
-        'factorial': math.factorial,
-        'degrees': math.degrees,
-        'radians': math.radians,
-    }
-    
-    # 支持的常数
-    _constants = {
-        'pi': math.pi,
-        'e': math.e,
-        'tau': math.tau,
-        'inf': math.inf,
-    }
-    
-    def _evaluate_node(self, node: ast.AST) -> Union[int, float]:
-        """
-        安全地评估AST节点
-        
-        Args:
-            node: AST节点
-            
-        Returns:
-            Union[int, float]: 计算结果
-            
-        Raises:
-            ValueError: 当遇到不支持的操作时
-        """
-        if isinstance(node, ast.Constant):  # Python 3.8+
-            return node.value
-        elif isinstance(node, ast.Num):  # Python < 3.8
-            return node.n
-        elif isinstance(node, ast.Name):
-            if node.id in self._constants:
-                return self._constants[node.id]
-            else:
-                raise ValueError(f"不支持的变量: {node.id}")
-        elif isinstance(node, ast.BinOp):
-            left = self._evaluate_node(node.left)
-            right = self._evaluate_node(node.right)
-            op = self._operators.get(type(node.op))
-            if op is None:
-                raise ValueError(f"不支持的二元运算符: {type(node.op).__name__}")
-            return op(left, right)
-        elif isinstance(node, ast.UnaryOp):
-            operand = self._evaluate_node(node.operand)
-            op = self._operators.get(type(node.op))
-            if op is None:
-                raise ValueError(f"不支持的一元运算符: {type(node.op).__name__}")
-            return op(operand)
-        elif isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name):
-                func_name = node.func.id
-                if func_name in self._functions:
-                    args = [self._evaluate_node(arg) for arg in node.args]
-                    return self._functions[func_name](*args)
-                else:
-                    raise ValueError(f"不支持的函数: {func_name}")
-            else:
-                raise ValueError("不支持的函数调用")
-        elif isinstance(node, ast.List):
-            return [self._evaluate_node(item) for item in node.elts]
-        elif isinstance(node, ast.Tuple):
-            return tuple(self._evaluate_node(item) for item in node.elts)
-        else:
-            raise ValueError(f"不支持的节点类型: {type(node).__name__}")
-    
     def _run(self, expression: str) -> Union[int, float]:
         """
         执行数学计算
@@ -148,14 +158,14 @@ class CalculatorTool(BaseTool):
             if not expression:
                 raise ValueError("表达式不能为空")
             
-            # 解析表达式为AST
+            # 解析、校验并编译表达式（带缓存）
             try:
-                tree = ast.parse(expression, mode='eval')
+                code = _compile_expression(expression)
             except SyntaxError as e:
                 raise ValueError(f"表达式语法错误: {str(e)}")
             
-            # 安全地计算结果
-            result = self._evaluate_node(tree.body)
+            # 在只包含白名单函数和常数的命名空间中计算结果
+            result = eval(code, _GLOBALS)
             
             # 检查结果是否为有效数字
             if isinstance(result, (int, float)):
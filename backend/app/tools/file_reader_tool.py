@@ -1,15 +1,61 @@
 """文件读取工具 - 读取本地文件内容"""
 
 import os
+import stat
 import mimetypes
-from pathlib import Path
-from typing import Optional, List
+from functools import lru_cache
+from typing import Optional, List, Iterator
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 流式读取时每块的字符数
+READ_CHUNK_SIZE = 64 * 1024
+
+# 支持的文本文件扩展名
+_TEXT_EXTENSIONS = frozenset({
+    '.txt', '.md', '.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.htm', 
+    '.css', '.scss', '.sass', '.less', '.json', '.xml', '.yaml', '.yml',
+    '.ini', '.cfg', '.conf', '.log', '.sql', '.sh', '.bat', '.ps1',
+    '.java', '.c', '.cpp', '.h', '.hpp', '.cs', '.php', '.rb', '.go',
+    '.rs', '.swift', '.kt', '.scala', '.r', '.m', '.pl', '.lua',
+    '.dockerfile', '.gitignore', '.gitattributes', '.env'
+})
+
+# 编码检测时采样的字节数
+ENCODING_SAMPLE_SIZE = 16 * 1024
+
+# 导入时加载MIME类型表，避免首次判断文件类型时才初始化
+mimetypes.init()
+
+@lru_cache(maxsize=128)
+def _sniff_encoding(file_path: str, mtime_ns: int, size: int) -> str:
+    """
+    对文件开头的采样字节做一次统计检测，得到最可能的编码
+    
+    结果按(路径, 修改时间, 大小)缓存，文件未变化时重复读取不再采样
+    
+    Args:
+        file_path: 文件路径
+        mtime_ns: 文件修改时间（纳秒），仅作为缓存键
+        size: 文件大小，仅作为缓存键
+        
+    Returns:
+        str: 检测到的编码格式，无法判断时为UTF-8
+    """
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:
+        logger.warning("charset-normalizer库未安装，使用默认编码")
+        return 'utf-8'
+    
+    with open(file_path, 'rb') as f:
+        raw_data = f.read(ENCODING_SAMPLE_SIZE)
+    best = from_bytes(raw_data).best()
+    return best.encoding if best else 'utf-8'
+
 class FileReaderInput(BaseModel):
     """文件读取工具输入模型"""
     path: str = Field(..., description="要读取的文件路径")
@@ -30,19 +76,6 @@ class FileReaderTool(BaseTool):
     description: str = "读取本地文件内容。输入文件路径，返回文件的文本内容。支持多种编码格式。"
     args_schema: type[BaseModel] = FileReaderInput
     
-    # 支持的文本文件扩展名
-    _text_extensions = {
-        '.txt', '.md', '.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.htm', 
-        '.css', '.scss', '.sass', '.less', '.json', '.xml', '.yaml', '.yml',
-        '.ini', '.cfg', '.conf', '.log', '.sql', '.sh', '.bat', '.ps1',
-        '.java', '.c', '.cpp', '.h', '.hpp', '.cs', '.php', '.rb', '.go',
-        '.rs', '.swift', '.kt', '.scala', '.r', '.m', '.pl', '.lua',
-        '.dockerfile', '.gitignore', '.gitattributes', '.env'
-    }
-    
-    # 常见编码格式
-    _encodings = ['utf-8', 'utf-16', 'utf-32', 'gbk', 'gb2312', 'big5', 'ascii', 'latin-1']
-    
     def _is_text_file(self, file_path: str) -> bool:
         """
         判断文件是否为文本文件
@@ -53,17 +86,14 @@ class FileReaderTool(BaseTool):
         Returns:
             bool: 是否为文本文件
         """
-        # 检查文件扩展名
-        ext = Path(file_path).suffix.lower()
-        if ext in self._text_extensions:
+        # 检查文件扩展名，命中时无需再推断MIME类型
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext in _TEXT_EXTENSIONS:
             return True
         
         # 检查MIME类型
         mime_type, _ = mimetypes.guess_type(file_path)
-        if mime_type and mime_type.startswith('text/'):
-            return True
-        
-        return False
+        return bool(mime_type and mime_type.startswith('text/'))
     
     def _detect_encoding(self, file_path: str) -> str:
         """
@@ -76,30 +106,32 @@ class FileReaderTool(BaseTool):
             str: 检测到的编码格式
         """
         try:
-            import chardet
-            
-            with open(file_path, 'rb') as f:
-                raw_data = f.read(8192)  # 读取前8KB用于检测
-                result = chardet.detect(raw_data)
-                if result['encoding'] and result['confidence'] > 0.7:
-                    return result['encoding']
-        except ImportError:
-            logger.warning("chardet库未安装，使用默认编码检测")
+            file_stat = os.stat(file_path)
+            return _sniff_encoding(file_path, file_stat.st_mtime_ns, file_stat.st_size)
         except Exception as e:
             logger.warning(f"编码检测失败: {str(e)}")
+            return 'utf-8'  # 默认返回UTF-8
+    
+    def _iter_chunks(self, file_path: str, encoding: str = "utf-8", chunk_size: int = READ_CHUNK_SIZE) -> Iterator[str]:
+        """
+        按块流式读取文件内容，_run拼接各块得到完整内容，能够逐块处理内容的调用方可直接迭代
         
-        # 尝试常见编码
-        for encoding in self._encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    f.read(1024)  # 尝试读取前1KB
-                return encoding
-            except UnicodeDecodeError:
-                continue
-            except Exception:
-                break
+        逐块迭代时内存占用只与块大小有关，与文件大小无关
         
-        return 'utf-8'  # 默认返回UTF-8
+        Args:
+            file_path: 文件路径
+            encoding: 文件编码格式
+            chunk_size: 每块的字符数
+            
+        Returns:
+            Iterator[str]: 文件内容块
+        """
+        with open(file_path, 'r', encoding=encoding, errors='replace', buffering=chunk_size) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
     
     def _run(self, path: str, encoding: str = "utf-8", max_size: int = 10*1024*1024) -> str:
         """
@@ -120,16 +152,18 @@ class FileReaderTool(BaseTool):
             # 规范化路径
             file_path = os.path.abspath(path)
             
-            # 检查文件是否存在
-            if not os.path.exists(file_path):
+            # 一次stat获取存在性、文件类型和大小
+            try:
+                file_stat = os.stat(file_path)
+            except FileNotFoundError:
                 raise FileNotFoundError(f"文件不存在: {file_path}")
             
             # 检查是否为文件
-            if not os.path.isfile(file_path):
+            if not stat.S_ISREG(file_stat.st_mode):
                 raise ValueError(f"路径不是文件: {file_path}")
             
             # 检查文件大小
-            file_size = os.path.getsize(file_path)
+            file_size = file_stat.st_size
             if file_size > max_size:
                 raise ValueError(f"文件过大: {file_size} 字节，超过限制 {max_size} 字节")
             
@@ -144,14 +178,12 @@ class FileReaderTool(BaseTool):
             
             # 读取文件内容
             try:
-                with open(file_path, 'r', encoding=encoding, errors='replace') as f:
-                    content = f.read()
+                content = ''.join(self._iter_chunks(file_path, encoding))
             except UnicodeDecodeError:
                 # 如果指定编码失败，尝试自动检测
                 logger.warning(f"使用编码 {encoding} 读取失败，尝试自动检测")
                 detected_encoding = self._detect_encoding(file_path)
-                with open(file_path, 'r', encoding=detected_encoding, errors='replace') as f:
-                    content = f.read()
+                content = ''.join(self._iter_chunks(file_path, detected_encoding))
                 logger.info(f"使用检测到的编码 {detected_encoding} 成功读取")
             
             logger.info(f"成功读取文件: {file_path}，大小: {len(content)} 字符")
@@ -5,31 +5,9 @@ CrewAI Studio Utils Module
 工具模块初始化
 """
 
-from .logger import setup_logger, get_logger
-
-# Import security utilities with error handling
-try:
-    from .security import (
-        create_access_token,
-        verify_token,
-        get_password_hash,
-        verify_password
-    )
-    _security_available = True
-except ImportError:
-    _security_available = False
-
-# Import validators with error handling
-try:
-    from .validators import (
-        validate_email,
-        validate_url,
-        validate_json_schema
-    )
-    _validators_available = True
-except ImportError:
-    _validators_available = False
+from importlib.util import find_spec
 
+from .logger import setup_logger, get_logger
 from .helpers import (
     generate_uuid,
     format_datetime,
@@ -46,7 +24,6 @@ from .migration import (
     upgrade_to_head
 )
 
-# Build __all__ list dynamically based on available imports
 __all__ = [
     # 日志相关
     "setup_logger",
@@ -68,19 +45,30 @@ __all__ = [
     "upgrade_to_head",
 ]
 
-# Add security utilities if available
-if _security_available:
-    __all__.extend([
+# 安全工具依赖python-jose和passlib，仅在已安装时导出
+if find_spec("jose") and find_spec("passlib"):
+    from .security import (
+        create_access_token,
+        verify_token,
+        get_password_hash,
+        verify_password
+    )
+    __all__ += [
         "create_access_token",
         "verify_token",
         "get_password_hash",
         "verify_password",
-    ])
+    ]
 
-# Add validators if available
-if _validators_available:
-    __all__.extend([
+# 校验工具依赖email-validator和jsonschema，仅在已安装时导出
+if find_spec("email_validator") and find_spec("jsonschema"):
+    from .validators import (
+        validate_email,
+        validate_url,
+        validate_json_schema
+    )
+    __all__ += [
         "validate_email",
         "validate_url",
         "validate_json_schema",
-    ])
\ No newline at end of file
+    ]
@@ -5,6 +5,8 @@ CrewAI Studio Helper Utilities
 辅助工具模块
 """
 
+import os
+import mmap
 import uuid
 import hashlib
 import re
@@ -12,6 +14,13 @@ from datetime import datetime, timezone
 from typing import Any, Optional, Union
 from pathlib import Path
 
+# 文件名中的非法字符
+_ILLEGAL_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+# 蛇形命名转换：单词首字母前、小写字母/数字与大写字母之间
+_CAMEL_WORD_RE = re.compile('(.)([A-Z][a-z]+)')
+_CAMEL_BOUNDARY_RE = re.compile('([a-z0-9])([A-Z])')
+
 
 def generate_uuid() -> str:
     """
@@ -71,7 +80,7 @@ def sanitize_filename(filename: str) -> str:
         str: 清理后的文件名
     """
     # 移除或替换非法字符
-    sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    sanitized = _ILLEGAL_FILENAME_RE.sub('_', filename)
     
     # 移除开头和结尾的空格和点
     sanitized = sanitized.strip(' .')
@@ -82,7 +91,7 @@ def sanitize_filename(filename: str) -> str:
     
     # 限制长度
     if len(sanitized) > 255:
-        name, ext = Path(sanitized).stem, Path(sanitized).suffix
+        name, ext = os.path.splitext(sanitized)
         max_name_length = 255 - len(ext)
         sanitized = name[:max_name_length] + ext
     
@@ -103,13 +112,17 @@ def calculate_file_hash(
     Returns:
         str: 文件哈希值
     """
-    hash_obj = hashlib.new(algorithm)
-    
     with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_obj.update(chunk)
-    
-    return hash_obj.hexdigest()
+        # Python 3.11+：在C层按大块读取并计算
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, algorithm).hexdigest()
+        
+        # 旧版本：内存映射文件后一次update（空文件无法映射）
+        hash_obj = hashlib.new(algorithm)
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hash_obj.update(mm)
+        return hash_obj.hexdigest()
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -157,6 +170,9 @@ def deep_merge_dict(dict1: dict, dict2: dict) -> dict:
     """
     深度合并字典
     
+    使用显式栈迭代合并，嵌套层级不受递归深度限制；
+    只复制需要合并的嵌套字典，dict1本身不会被修改
+    
     Args:
         dict1: 第一个字典
         dict2: 第二个字典
@@ -165,12 +181,18 @@ def deep_merge_dict(dict1: dict, dict2: dict) -> dict:
         dict: 合并后的字典
     """
     result = dict1.copy()
-    
-    for key, value in dict2.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = deep_merge_dict(result[key], value)
-        else:
-            result[key] = value
+    stack = [(result, dict2)]
+    
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                merged = current.copy()
+                target[key] = merged
+                stack.append((merged, value))
+            else:
+                target[key] = value
     
     return result
 
@@ -196,9 +218,9 @@ def convert_to_snake_case(text: str) -> str:
         str: 蛇形命名法字符串
     """
     # 在大写字母前插入下划线
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', text)
+    s1 = _CAMEL_WORD_RE.sub(r'\1_\2', text)
     # 在小写字母和大写字母之间插入下划线
-    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+    return _CAMEL_BOUNDARY_RE.sub(r'\1_\2', s1).lower()
 
 
 def convert_to_camel_case(text: str) -> str:
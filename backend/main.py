@@ -17,6 +17,18 @@ from app.core.config import settings
 from app.api.v1.api import api_router
 from app.core.database import init_db
 from app.core.crewai_init import init_crewai, get_crewai_status
+from app.services.interactive_session_service import shutdown_agent_executor
+from app.services.execution_service import shutdown_execution_service
+from app.services.llm_service import close_http_session
+from app.services.notification_service import (
+    get_notification_service,
+    shutdown_notification_service,
+)
+from app.services.workflow_service import (
+    shutdown_workflow_service,
+    start_progress_flusher,
+)
+from app.tools.browser_tool import close_browser_session
 
 
 @asynccontextmanager
@@ -39,10 +51,34 @@ async def lifespan(app: FastAPI):
     #         "CrewAI framework initialization failed, some features may not be available"
     #     )
 
+    # 启动通知发送工作协程
+    await get_notification_service().start()
+
+    # 定期写入缓冲的工作流进度
+    start_progress_flusher()
+
     yield
 
     logger.info("Shutting down CrewAI Studio Backend...")
 
+    # 停止进度定时写入并写入剩余进度
+    await shutdown_workflow_service()
+
+    # 发送剩余通知并停止通知服务
+    await shutdown_notification_service()
+
+    # 关闭Agent执行线程池
+    shutdown_agent_executor()
+
+    # 关闭执行服务线程池
+    await shutdown_execution_service()
+
+    # 关闭LLM连接测试的共享HTTP会话
+    await close_http_session()
+
+    # 关闭网页浏览工具的共享HTTP会话
+    await close_browser_session()
+
 
 # 创建FastAPI应用实例
 app = FastAPI(
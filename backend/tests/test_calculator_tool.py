@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the calculator tool's expression whitelist
+"""
+
+import ast
+import math
+import sys
+import pytest
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.tools.calculator_tool import (
+    CalculatorTool,
+    _SafeExpressionValidator,
+    _compile_expression,
+)
+
+
+def _validate(expression: str) -> None:
+    _SafeExpressionValidator().visit(ast.parse(expression, mode="eval"))
+
+
+class TestSafeExpressionValidator:
+    """Test suite for the AST whitelist."""
+
+    @pytest.mark.parametrize("expression", [
+        "1 + 2 * 3",
+        "-(4 - 6) ** 2 % 5",
+        "7 / 2",
+        "sqrt(16) + pi",
+        "max([1, 2, 3])",
+        "min((4, 5))",
+        "round(log(e), 2)",
+        "2j * 2",
+    ])
+    def test_allows_arithmetic(self, expression):
+        """Test that arithmetic, whitelisted functions and constants pass."""
+        _validate(expression)
+
+    @pytest.mark.parametrize("expression", [
+        "__import__('os')",
+        "open('/etc/passwd')",
+        "().__class__.__bases__",
+        "(1).real",
+        "'a' * 3",
+        "b'x'",
+        "None",
+        "x + 1",
+        "__builtins__",
+        "[n for n in (1, 2)]",
+        "lambda: 1",
+        "abs(x=1)",
+        "sqrt.__call__(4)",
+        "(lambda: 1)()",
+        "1 if 1 else 2",
+        "{1: 2}",
+        "1 < 2",
+        "1 and 2",
+        "1 << 3",
+        "[1, 2][0]",
+        "(y := 2)",
+        "f'{1}'",
+    ])
+    def test_rejects_everything_else(self, expression):
+        """Test that names, attributes, non-numeric constants and other nodes are rejected."""
+        with pytest.raises(ValueError):
+            _validate(expression)
+
+    def test_nested_call_arguments_are_checked(self):
+        """Test that the arguments of a whitelisted call are validated too."""
+        with pytest.raises(ValueError):
+            _validate("abs(__import__('os'))")
+        with pytest.raises(ValueError):
+            _validate("max([1, ().__class__])")
+
+
+class TestCompileExpression:
+    """Test suite for the cached compile step."""
+
+    def test_compiled_expression_is_cached(self):
+        """Test that repeating an expression reuses the code object."""
+        assert _compile_expression("3 * 14") is _compile_expression("3 * 14")
+
+    def test_rejected_expression_raises(self):
+        """Test that compilation refuses expressions the validator rejects."""
+        with pytest.raises(ValueError):
+            _compile_expression("__import__('os').system('true')")
+
+
+class TestCalculatorTool:
+    """Test suite for CalculatorTool._run results and errors."""
+
+    @pytest.fixture
+    def tool(self):
+        return CalculatorTool()
+
+    @pytest.mark.parametrize("expression, expected", [
+        ("1 + 2 * 3", 7),
+        ("2 ** 10", 1024),
+        ("7 % 3", 1),
+        ("sqrt(16)", 4.0),
+        ("sum([1, 2, 3])", 6),
+        ("factorial(5)", 120),
+        ("  abs(-3)  ", 3),
+    ])
+    def test_evaluates(self, tool, expression, expected):
+        """Test that valid expressions evaluate to the expected value."""
+        assert tool._run(expression) == expected
+
+    def test_constants(self, tool):
+        """Test that constants resolve to their math module values."""
+        assert tool._run("pi") == math.pi
+        assert tool._run("tau / 2") == math.pi
+
+    @pytest.mark.parametrize("expression", [
+        "",
+        "1 +",
+        "1 / 0",
+        "inf",
+        "__import__('os')",
+        "'text'",
+    ])
+    def test_errors(self, tool, expression):
+        """Test that invalid input, division by zero, infinity and unsafe input raise."""
+        with pytest.raises(Exception):
+            tool._run(expression)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for helper utilities
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.helpers import deep_merge_dict
+
+
+def _nested(depth: int, leaf: dict) -> dict:
+    """Build a dict nested ``depth`` levels under the key "n"."""
+    result = leaf
+    for _ in range(depth):
+        result = {"n": result}
+    return result
+
+
+class TestDeepMergeDict:
+    """Test suite for deep_merge_dict."""
+
+    def test_merges_nested_dicts(self):
+        """Test that nested dicts are merged key by key and scalars from the second dict win."""
+        first = {"a": 1, "b": {"x": 1, "y": {"p": 1}}, "c": 3}
+        second = {"b": {"y": {"q": 2}, "z": 3}, "c": 4, "d": 5}
+        assert deep_merge_dict(first, second) == {
+            "a": 1,
+            "b": {"x": 1, "y": {"p": 1, "q": 2}, "z": 3},
+            "c": 4,
+            "d": 5,
+        }
+
+    def test_non_dict_values_replace(self):
+        """Test that a dict and a non-dict under the same key replace rather than merge."""
+        assert deep_merge_dict({"a": {"x": 1}}, {"a": [1, 2]}) == {"a": [1, 2]}
+        assert deep_merge_dict({"a": 1}, {"a": {"x": 1}}) == {"a": {"x": 1}}
+        assert deep_merge_dict({"a": {"x": 1}}, {"a": None}) == {"a": None}
+
+    def test_empty_inputs(self):
+        """Test merging with empty dicts."""
+        assert deep_merge_dict({}, {"a": {"b": 1}}) == {"a": {"b": 1}}
+        assert deep_merge_dict({"a": {"b": 1}}, {}) == {"a": {"b": 1}}
+
+    def test_inputs_are_not_modified(self):
+        """Test that neither argument is mutated, including nested dicts."""
+        first = {"a": {"b": {"c": 1}}, "k": [1]}
+        second = {"a": {"b": {"d": 2}}}
+        first_before = copy.deepcopy(first)
+        second_before = copy.deepcopy(second)
+
+        result = deep_merge_dict(first, second)
+        result["a"]["b"]["e"] = 3
+
+        assert first == first_before
+        assert second == second_before
+
+    def test_deep_nesting_does_not_recurse(self):
+        """Test that nesting far beyond the recursion limit merges without RecursionError."""
+        depth = sys.getrecursionlimit() * 2
+        merged = deep_merge_dict(_nested(depth, {"x": 1}), _nested(depth, {"y": 2}))
+        for _ in range(depth):
+            merged = merged["n"]
+        assert merged == {"x": 1, "y": 2}
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for LLMService config persistence
+"""
+
+import json
+import os
+import sys
+import pytest
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.schemas.llm import LLMConfigCreate, LLMConfigUpdate, LLMProvider
+from app.services import llm_service as llm_module
+from app.services.llm_service import LLMService
+
+
+def _service(config_file: Path) -> LLMService:
+    """Build an LLMService backed by ``config_file`` instead of the data directory."""
+    service = LLMService.__new__(LLMService)
+    service.db = None
+    service.config_file = str(config_file)
+    service._ensure_config_file()
+    return service
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "llm_configs.json"
+    yield path
+    llm_module._configs_cache.pop(str(path), None)
+
+
+class TestConfigPersistence:
+    """Test suite for writing and re-reading the config file."""
+
+    @pytest.mark.asyncio
+    async def test_changes_are_written_before_returning(self, config_file):
+        """Test that create, update and delete reach the file without a flush step."""
+        service = _service(config_file)
+
+        await service.create_config(LLMConfigCreate(provider=LLMProvider.OPENAI, model="gpt-4o"))
+        assert json.loads(config_file.read_text())["openai"]["model"] == "gpt-4o"
+
+        await service.update_config(LLMProvider.OPENAI, LLMConfigUpdate(temperature=0.2))
+        assert json.loads(config_file.read_text())["openai"]["temperature"] == 0.2
+
+        await service.delete_config(LLMProvider.OPENAI)
+        assert json.loads(config_file.read_text()) == {}
+        assert [p.name for p in config_file.parent.iterdir()] == [config_file.name]
+
+    @pytest.mark.asyncio
+    async def test_write_failure_raises_and_keeps_cache(self, config_file, monkeypatch):
+        """Test that a failed write raises and does not leave the change in the cache."""
+        service = _service(config_file)
+        await service.create_config(LLMConfigCreate(provider=LLMProvider.OPENAI))
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(llm_module.os, "replace", fail)
+        with pytest.raises(OSError):
+            await service.create_config(LLMConfigCreate(provider=LLMProvider.OLLAMA))
+
+        assert list(service._load_configs()) == ["openai"]
+        assert [p.name for p in config_file.parent.iterdir()] == [config_file.name]
+
+    @pytest.mark.asyncio
+    async def test_external_edit_is_picked_up(self, config_file):
+        """Test that an edit made by another worker or by hand replaces the cached copy."""
+        service = _service(config_file)
+        await service.create_config(LLMConfigCreate(provider=LLMProvider.OPENAI))
+
+        edited = json.loads(config_file.read_text())
+        edited["openai"]["model"] = "edited-by-hand"
+        config_file.write_text(json.dumps(edited))
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert (await service.get_config(LLMProvider.OPENAI)).model == "edited-by-hand"
+
+        await service.update_config(LLMProvider.OPENAI, LLMConfigUpdate(temperature=0.1))
+        saved = json.loads(config_file.read_text())["openai"]
+        assert saved["model"] == "edited-by-hand"
+        assert saved["temperature"] == 0.1
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for NotificationService queueing and bookkeeping
+"""
+
+import asyncio
+import sys
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import pytest
+import pytest_asyncio
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import notification_service as ns
+from app.services.notification_service import (
+    NotificationChannel,
+    NotificationMessage,
+    NotificationRateLimited,
+    NotificationService,
+    NotificationType,
+    _parse_retry_after,
+)
+
+
+@pytest_asyncio.fixture
+async def service():
+    """Provide a NotificationService whose workers are not started, so queued items stay queued."""
+    svc = NotificationService()
+    yield svc
+    await svc.aclose()
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    """Remove and return everything currently in a queue."""
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+class TestDeduplication:
+    """Test suite for duplicate suppression within the dedup window."""
+
+    @pytest.mark.asyncio
+    async def test_summary_sent_when_window_ends(self, service, monkeypatch):
+        """Test that the suppressed-count summary is queued without a later send."""
+        monkeypatch.setattr(ns, "NOTIFICATION_DEDUP_WINDOW", 0.05)
+        send = dict(
+            type=NotificationType.SYSTEM_ALERT,
+            title="disk full",
+            content="disk is full",
+            recipient="ops",
+            channel=NotificationChannel.WEBHOOK,
+        )
+        first_id = await service.send_notification(**send)
+        assert await service.send_notification(**send) == first_id
+        assert await service.send_notification(**send) == first_id
+        assert len(_drain(service.pending_notifications)) == 1
+
+        await asyncio.sleep(0.1)
+
+        summaries = _drain(service.pending_notifications)
+        assert len(summaries) == 1
+        assert "2 duplicate notifications suppressed" in summaries[0].content
+        assert service._recent_notifications == {}
+
+    @pytest.mark.asyncio
+    async def test_no_summary_without_duplicates(self, service, monkeypatch):
+        """Test that a window with no duplicates ends silently."""
+        monkeypatch.setattr(ns, "NOTIFICATION_DEDUP_WINDOW", 0.05)
+        await service.send_notification(
+            NotificationType.INFO, "hello", "world", "user", NotificationChannel.WEBHOOK
+        )
+        _drain(service.pending_notifications)
+
+        await asyncio.sleep(0.1)
+
+        assert service.pending_notifications.empty()
+        assert service._recent_notifications == {}
+
+    @pytest.mark.asyncio
+    async def test_stop_queues_open_summaries(self, service, monkeypatch):
+        """Test that stopping the service queues summaries for windows still open."""
+        monkeypatch.setattr(ns, "NOTIFICATION_DEDUP_WINDOW", 60.0)
+        for _ in range(3):
+            await service.send_notification(
+                NotificationType.ERROR, "boom", "failed", "ops", NotificationChannel.WEBHOOK
+            )
+        _drain(service.pending_notifications)
+
+        service._end_all_dedup_windows()
+
+        summaries = _drain(service.pending_notifications)
+        assert len(summaries) == 1
+        assert "2 duplicate notifications suppressed" in summaries[0].content
+
+
+def _message(title: str, recipient: str = "user", type: NotificationType = NotificationType.INFO,
+             status: str = "sent", created_at: datetime = None) -> NotificationMessage:
+    """Build a finished notification ready for _record_history."""
+    return NotificationMessage(
+        id=title,
+        type=type,
+        title=title,
+        content=title,
+        recipient=recipient,
+        channel=NotificationChannel.WEBHOOK,
+        created_at=created_at,
+        status=status,
+    )
+
+
+class TestHistoryOrder:
+    """Test suite for history ordering and cleanup by completion time."""
+
+    @pytest.mark.asyncio
+    async def test_history_is_in_completion_order(self, service):
+        """Test that a retried notification created earlier is listed as most recently completed."""
+        retried = _message("retried", created_at=datetime.utcnow() - timedelta(minutes=10))
+        fresh = _message("fresh")
+        service._record_history(fresh)
+        service._record_history(retried)
+
+        history = service.get_notification_history()
+        assert [n.id for n in history] == ["retried", "fresh"]
+        assert history[0].completed_at >= history[1].completed_at
+
+    @pytest.mark.asyncio
+    async def test_cleanup_uses_completion_time(self, service):
+        """Test that cleanup expires by completed_at, not created_at."""
+        expired = _message("expired", recipient="a")
+        late = _message("late", recipient="b", created_at=datetime.utcnow() - timedelta(days=40))
+        service._record_history(expired)
+        service._record_history(late)
+        expired.completed_at = datetime.utcnow() - timedelta(days=31)
+
+        assert service.cleanup_notification_history(older_than_days=30) == 1
+        assert [n.id for n in service.notification_history] == ["late"]
+        assert service.get_notification_history(recipient="a") == []
+        assert service.get_notification_statistics()["total_notifications"] == 1
+
+
+class TestEmailBatching:
+    """Test suite for the batched email worker."""
+
+    @pytest.mark.asyncio
+    async def test_queued_emails_share_one_batch(self, service, monkeypatch):
+        """Test that emails queued together are sent in one batch and each gets its own result."""
+        monkeypatch.setattr(ns, "EMAIL_BATCH_WAIT", 0.01)
+        batches = []
+
+        async def fake_send_emails(notifications):
+            batches.append([n.id for n in notifications])
+            return [None if n.id != "bad" else RuntimeError("rejected") for n in notifications]
+
+        monkeypatch.setattr(service, "_send_emails", fake_send_emails)
+        for title in ("a", "b", "bad", "c"):
+            message = _message(title, status="pending")
+            message.channel = NotificationChannel.EMAIL
+            message.max_retries = 1
+            await service._enqueue(message)
+
+        worker = asyncio.create_task(service._process_email_notifications())
+        try:
+            await asyncio.wait_for(service.email_notifications.join(), 1)
+        finally:
+            worker.cancel()
+
+        assert batches == [["a", "b", "bad", "c"]]
+        statuses = {n.id: n.status for n in service.notification_history}
+        assert statuses == {"a": "sent", "b": "sent", "bad": "failed", "c": "sent"}
+
+    @pytest.mark.asyncio
+    async def test_batch_respects_size_limit(self, service, monkeypatch):
+        """Test that a full queue is split into EMAIL_BATCH_SIZE batches."""
+        monkeypatch.setattr(ns, "EMAIL_BATCH_WAIT", 0.01)
+        monkeypatch.setattr(ns, "EMAIL_BATCH_SIZE", 2)
+        sizes = []
+
+        async def fake_send_emails(notifications):
+            sizes.append(len(notifications))
+            return [None] * len(notifications)
+
+        monkeypatch.setattr(service, "_send_emails", fake_send_emails)
+        for title in ("a", "b", "c", "d", "e"):
+            message = _message(title, status="pending")
+            message.channel = NotificationChannel.EMAIL
+            await service._enqueue(message)
+
+        worker = asyncio.create_task(service._process_email_notifications())
+        try:
+            await asyncio.wait_for(service.email_notifications.join(), 1)
+        finally:
+            worker.cancel()
+
+        assert sizes == [2, 2, 1]
+
+
+class TestRetryBackoff:
+    """Test suite for Retry-After parsing and retry delays."""
+
+    def test_parse_retry_after_seconds(self):
+        """Test the delta-seconds form."""
+        assert _parse_retry_after("120") == 120.0
+        assert _parse_retry_after("1.5") == 1.5
+        assert _parse_retry_after("-3") == 0.0
+
+    def test_parse_retry_after_http_date(self):
+        """Test the HTTP-date form, including dates in the past."""
+        future = datetime.now(timezone.utc) + timedelta(seconds=60)
+        delay = _parse_retry_after(format_datetime(future, usegmt=True))
+        assert 55 <= delay <= 60
+        past = datetime.now(timezone.utc) - timedelta(seconds=60)
+        assert _parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+    def test_parse_retry_after_invalid(self):
+        """Test that missing or malformed values are ignored."""
+        assert _parse_retry_after(None) is None
+        assert _parse_retry_after("") is None
+        assert _parse_retry_after("soon") is None
+
+    @pytest.mark.asyncio
+    async def test_retry_delay_honours_retry_after(self, service):
+        """Test that a rate-limit error's Retry-After wins over backoff."""
+        message = _message("limited", status="failed")
+        message.retry_count = 3
+        error = NotificationRateLimited("429", retry_after=42.0)
+        assert service._retry_delay(message, error) == 42.0
+
+    @pytest.mark.asyncio
+    async def test_retry_delay_backs_off_with_jitter(self, service):
+        """Test exponential growth, jitter bounds and the delay cap."""
+        message = _message("flaky", status="failed")
+        error = RuntimeError("boom")
+        for retry_count in (1, 2, 3, 4):
+            message.retry_count = retry_count
+            base = ns.RETRY_BASE_DELAY * 2 ** (retry_count - 1)
+            for _ in range(20):
+                assert 0.5 * base <= service._retry_delay(message, error) <= 1.5 * base
+
+        message.retry_count = 50
+        for _ in range(20):
+            assert service._retry_delay(message, error) <= 1.5 * ns.RETRY_MAX_DELAY
+
+
+def _record_mixed_history(service: NotificationService, limit: int) -> list:
+    """Record six notifications into a history capped at ``limit`` entries."""
+    service.notification_history = deque(maxlen=limit)
+    messages = [
+        _message("m0", recipient="alice", type=NotificationType.INFO, status="sent"),
+        _message("m1", recipient="bob", type=NotificationType.ERROR, status="failed"),
+        _message("m2", recipient="alice", type=NotificationType.ERROR, status="sent"),
+        _message("m3", recipient="carol", type=NotificationType.INFO, status="failed"),
+        _message("m4", recipient="bob", type=NotificationType.INFO, status="sent"),
+        _message("m5", recipient="alice", type=NotificationType.WARNING, status="sent"),
+    ]
+    for message in messages:
+        service._record_history(message)
+    return messages
+
+
+class TestHistoryStatistics:
+    """Test suite for incremental statistics as history entries are evicted."""
+
+    @pytest.mark.asyncio
+    async def test_statistics_follow_evictions(self, service):
+        """Test that counters only reflect notifications still in history."""
+        _record_mixed_history(service, limit=3)
+        kept = list(service.notification_history)
+        assert [n.id for n in kept] == ["m3", "m4", "m5"]
+
+        stats = service.get_notification_statistics()
+        statuses = Counter(n.status for n in kept)
+        assert stats["total_notifications"] == 3
+        assert stats["sent_notifications"] == statuses["sent"]
+        assert stats["failed_notifications"] == statuses["failed"]
+        assert stats["type_statistics"] == {
+            "info": {"total": 2, "sent": 1, "failed": 1},
+            "warning": {"total": 1, "sent": 1, "failed": 0},
+        }
+        assert stats["channel_statistics"] == {"webhook": {"total": 3, "sent": 2, "failed": 1}}
+
+    @pytest.mark.asyncio
+    async def test_statistics_after_cleanup(self, service):
+        """Test that cleanup removes entries from the counters too."""
+        messages = _record_mixed_history(service, limit=10)
+        for message in messages[:4]:
+            message.completed_at = datetime.utcnow() - timedelta(days=40)
+
+        assert service.cleanup_notification_history(older_than_days=30) == 4
+        stats = service.get_notification_statistics()
+        assert stats["total_notifications"] == 2
+        assert stats["failed_notifications"] == 0
+        assert set(stats["type_statistics"]) == {"info", "warning"}
+
+
+class TestHistoryIndexes:
+    """Test suite for the recipient and type history indexes."""
+
+    @pytest.mark.asyncio
+    async def test_filtered_history_uses_indexes(self, service):
+        """Test filtering by recipient, type and both, newest first."""
+        _record_mixed_history(service, limit=10)
+        ids = lambda history: [n.id for n in history]
+
+        assert ids(service.get_notification_history(recipient="alice")) == ["m5", "m2", "m0"]
+        assert ids(service.get_notification_history(notification_type=NotificationType.INFO)) == ["m4", "m3", "m0"]
+        assert ids(service.get_notification_history(
+            recipient="alice", notification_type=NotificationType.ERROR
+        )) == ["m2"]
+        assert ids(service.get_notification_history(limit=2)) == ["m5", "m4"]
+
+    @pytest.mark.asyncio
+    async def test_indexes_drop_evicted_entries(self, service):
+        """Test that evicted notifications disappear from every index and empty buckets are removed."""
+        _record_mixed_history(service, limit=3)
+
+        assert service.get_notification_history(recipient="bob") == [service.notification_history[1]]
+        assert "carol" in service._history_by_recipient
+        assert NotificationType.ERROR not in service._history_by_type
+        assert service.get_notification_history(notification_type=NotificationType.ERROR) == []
+        indexed = {n.id for bucket in service._history_by_recipient.values() for n in bucket}
+        assert indexed == {n.id for n in service.notification_history}
+
+
+class TestPayloadFormat:
+    """Test suite for the JSON encoding of outgoing payloads."""
+
+    @pytest.mark.asyncio
+    async def test_timestamp_keeps_isoformat(self, service):
+        """Test that timestamps are sent as naive isoformat strings, without a +00:00 suffix."""
+        created_at = datetime(2024, 1, 2, 3, 4, 5, 6)
+        message = service._build_websocket_message(_message("m", created_at=created_at))
+
+        encoded = ns._json_dumps(message)
+        assert b'"timestamp":"2024-01-02T03:04:05.000006"' in encoded
+        assert b"+00:00" not in encoded
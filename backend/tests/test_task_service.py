@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for TaskService list queries
+"""
+
+import sys
+import pytest
+from pathlib import Path
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.agent import Agent
+from app.models.task import Task, TaskStatus, TaskPriority, TaskType
+from app.schemas.task import TaskSearchRequest
+from app.services.task_service import TaskService
+
+
+@pytest.fixture
+def task_db(clean_sqlite_db: Engine):
+    """Provide a session over an SQLite database holding two agents and three tasks."""
+    tables = [Agent.__table__, Task.__table__]
+    Agent.metadata.create_all(bind=clean_sqlite_db, tables=tables)
+    with Session(clean_sqlite_db) as session:
+        first = Agent(name="researcher", role="research", goal="find facts")
+        second = Agent(name="writer", role="writing", goal="write reports")
+        session.add_all([first, second])
+        session.flush()
+        session.add_all([
+            Task(name="collect", description="collect sources",
+                 status=TaskStatus.PENDING, priority=TaskPriority.HIGH,
+                 assigned_agent_id=first.id),
+            Task(name="summarize", description="summarize sources",
+                 status=TaskStatus.RUNNING, priority=TaskPriority.MEDIUM,
+                 assigned_agent_id=first.id),
+            Task(name="draft", description="draft the report",
+                 status=TaskStatus.PENDING, priority=TaskPriority.MEDIUM,
+                 assigned_agent_id=second.id),
+        ])
+        session.commit()
+        yield session, first.id, second.id
+    Agent.metadata.drop_all(bind=clean_sqlite_db, tables=tables)
+
+
+class TestListTasks:
+    """Test suite for TaskService.list_tasks filters."""
+
+    @staticmethod
+    def _names(tasks):
+        return sorted(task.name for task in tasks)
+
+    def test_list_tasks_without_filters(self, task_db):
+        """Test that an unfiltered call returns every task."""
+        session, _, _ = task_db
+        assert self._names(TaskService(session).list_tasks()) == ["collect", "draft", "summarize"]
+
+    def test_list_tasks_by_status(self, task_db):
+        """Test filtering by status."""
+        session, _, _ = task_db
+        tasks = TaskService(session).list_tasks(status=TaskStatus.PENDING)
+        assert self._names(tasks) == ["collect", "draft"]
+
+    def test_list_tasks_by_priority(self, task_db):
+        """Test filtering by priority."""
+        session, _, _ = task_db
+        tasks = TaskService(session).list_tasks(priority=TaskPriority.HIGH)
+        assert self._names(tasks) == ["collect"]
+
+    def test_list_tasks_by_agent(self, task_db):
+        """Test that agent_id filters on assigned_agent_id."""
+        session, first_id, second_id = task_db
+        service = TaskService(session)
+        assert self._names(service.list_tasks(agent_id=first_id)) == ["collect", "summarize"]
+        assert self._names(service.list_tasks(agent_id=second_id)) == ["draft"]
+
+    def test_list_tasks_combined_filters(self, task_db):
+        """Test that several filters are applied together."""
+        session, first_id, _ = task_db
+        tasks = TaskService(session).list_tasks(status=TaskStatus.PENDING, agent_id=first_id)
+        assert self._names(tasks) == ["collect"]
+
+    def test_list_tasks_pagination_and_stream(self, task_db):
+        """Test skip/limit and the streaming variant."""
+        session, _, _ = task_db
+        service = TaskService(session)
+        assert len(service.list_tasks(skip=1, limit=1)) == 1
+        assert self._names(service.list_tasks(stream=True)) == ["collect", "draft", "summarize"]
+
+
+class TestCloneTask:
+    """Test suite for the server-side TaskService.clone_task copy."""
+
+    def test_clone_copies_configuration(self, task_db):
+        """Test that the clone copies configuration, resets state and drops dependencies."""
+        session, first_id, _ = task_db
+        source = session.query(Task).filter(Task.name == "summarize").one()
+        source.input_data = {"sources": [1, 2]}
+        source.tags = ["research"]
+        source.dependencies = [1]
+        session.commit()
+
+        clone = TaskService(session).clone_task(source.id, "summarize again")
+
+        assert clone is not None and clone.id != source.id
+        assert clone.name == "summarize again"
+        assert clone.description == "Clone of summarize"
+        assert clone.status == TaskStatus.PENDING
+        assert clone.priority == source.priority
+        assert clone.assigned_agent_id == first_id
+        assert clone.input_data == {"sources": [1, 2]}
+        assert clone.tags == ["research"]
+        assert clone.dependencies == []
+        assert clone.is_template is False
+
+    def test_clone_with_description(self, task_db):
+        """Test that an explicit description replaces the default one."""
+        session, _, _ = task_db
+        source = session.query(Task).filter(Task.name == "draft").one()
+        clone = TaskService(session).clone_task(source.id, "draft v2", "second draft")
+        assert clone.description == "second draft"
+
+    def test_clone_is_loaded_without_reselect(self, task_db):
+        """Test that the clone is read once, by INSERT ... RETURNING, and not reloaded after commit."""
+        session, _, _ = task_db
+        source = session.query(Task).filter(Task.name == "draft").one()
+        statements = []
+        record = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(session.bind, "before_cursor_execute", record)
+        try:
+            clone = TaskService(session).clone_task(source.id, "draft v3")
+            assert clone.created_at is not None and clone.updated_at is not None
+            assert clone.name == "draft v3"
+            assert len(statements) == 1 and statements[0].startswith("INSERT")
+        finally:
+            event.remove(session.bind, "before_cursor_execute", record)
+
+        # Only TaskService commits skip expiry; the session itself still expires on commit
+        assert session.expire_on_commit is True
+        session.commit()
+        assert "name" in inspect(source).expired_attributes
+
+    def test_clone_missing_task(self, task_db):
+        """Test that cloning an unknown id returns None and inserts nothing."""
+        session, _, _ = task_db
+        assert TaskService(session).clone_task(10_000, "ghost") is None
+        assert session.query(Task).count() == 3
+
+
+class TestTasksByStatus:
+    """Test suite for the prebuilt pending/running task statements."""
+
+    def test_pending_tasks(self, task_db):
+        """Test pending tasks with and without the agent filter."""
+        session, first_id, second_id = task_db
+        service = TaskService(session)
+        assert sorted(t.name for t in service.get_pending_tasks()) == ["collect", "draft"]
+        assert [t.name for t in service.get_pending_tasks(agent_id=first_id)] == ["collect"]
+        assert [t.name for t in service.get_pending_tasks(agent_id=second_id)] == ["draft"]
+
+    def test_running_tasks(self, task_db):
+        """Test running tasks with and without the agent filter."""
+        session, first_id, second_id = task_db
+        service = TaskService(session)
+        assert [t.name for t in service.get_running_tasks()] == ["summarize"]
+        assert [t.name for t in service.get_running_tasks(agent_id=first_id)] == ["summarize"]
+        assert service.get_running_tasks(agent_id=second_id) == []
+
+
+class TestTaskCountAndSearch:
+    """Test suite for get_tasks_count and search_tasks filters."""
+
+    def test_tasks_count(self, task_db):
+        """Test counting with no filter, by status, by agent and both."""
+        session, first_id, second_id = task_db
+        service = TaskService(session)
+        assert service.get_tasks_count() == 3
+        assert service.get_tasks_count(status=TaskStatus.PENDING) == 2
+        assert service.get_tasks_count(agent_id=first_id) == 2
+        assert service.get_tasks_count(status=TaskStatus.PENDING, agent_id=second_id) == 1
+
+    def test_search_by_keyword(self, task_db):
+        """Test the non-PostgreSQL keyword search over name and description."""
+        session, _, _ = task_db
+        service = TaskService(session)
+        names = lambda request: sorted(t.name for t in service.search_tasks(request))
+        assert names(TaskSearchRequest(query="draft")) == ["draft"]
+        assert names(TaskSearchRequest(query="sources")) == ["collect", "summarize"]
+
+    def test_search_filters(self, task_db):
+        """Test status, priority, agent, type and tag filters."""
+        session, first_id, _ = task_db
+        source = session.query(Task).filter(Task.name == "collect").one()
+        source.task_type = TaskType.RESEARCH
+        source.tags = ["web"]
+        session.commit()
+
+        service = TaskService(session)
+        names = lambda **filters: sorted(t.name for t in service.search_tasks(TaskSearchRequest(**filters)))
+        assert names() == ["collect", "draft", "summarize"]
+        assert names(status=TaskStatus.RUNNING) == ["summarize"]
+        assert names(priority=TaskPriority.HIGH) == ["collect"]
+        assert names(assigned_agent_id=first_id) == ["collect", "summarize"]
+        assert names(task_type=TaskType.RESEARCH) == ["collect"]
+        assert names(tags=["web"]) == ["collect"]
+        assert names(status=TaskStatus.PENDING, assigned_agent_id=first_id) == ["collect"]
+
+
+class TestTasksByAgent:
+    """Test suite for get_tasks_by_agent."""
+
+    def test_tasks_by_agent(self, task_db):
+        """Test the agent listing with and without a status filter."""
+        session, first_id, second_id = task_db
+        service = TaskService(session)
+        assert sorted(t.name for t in service.get_tasks_by_agent(first_id)) == ["collect", "summarize"]
+        assert [t.name for t in service.get_tasks_by_agent(first_id, TaskStatus.RUNNING)] == ["summarize"]
+        assert [t.name for t in service.get_tasks_by_agent(second_id)] == ["draft"]
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit tests for WorkflowService search paging
+"""
+
+import sys
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.workflow import Workflow
+from app.schemas.workflow import (
+    WorkflowSearchRequest,
+    WorkflowTemplateCreate,
+    WorkflowTemplateDefinition,
+)
+from app.services.workflow_service import WorkflowService
+
+
+@pytest.fixture
+def workflow_db(clean_sqlite_db: Engine):
+    """
+    Provide a session over six workflows: three with explicit creation times
+    (stored with microseconds) and three stamped by the server default in the
+    same second (stored without), so created_at ties are broken by id.
+    """
+    tables = [Workflow.__table__]
+    Workflow.metadata.create_all(bind=clean_sqlite_db, tables=tables)
+    with Session(clean_sqlite_db) as session:
+        base = datetime.utcnow() - timedelta(days=1)
+        session.add_all([
+            Workflow(name=f"s{i}", created_at=base + timedelta(minutes=i, microseconds=i))
+            for i in range(3)
+        ])
+        session.flush()
+        session.add_all([Workflow(name=f"s{i}") for i in range(3, 6)])
+        session.commit()
+        yield session
+    Workflow.metadata.drop_all(bind=clean_sqlite_db, tables=tables)
+
+
+def _walk(service: WorkflowService, session: Session, **filters) -> list:
+    """Follow workflow_cursor from page to page and return the names in order."""
+    names = []
+    request = WorkflowSearchRequest(size=2, **filters)
+    for _ in range(10):
+        page = service.search_workflows(session, request)
+        if not page:
+            return names
+        names.extend(w.name for w in page)
+        sort_value, cursor_id = service.workflow_cursor(page[-1], request.sort_by)
+        request = request.model_copy(
+            update={"cursor_sort_value": sort_value, "cursor_id": cursor_id}
+        )
+    raise AssertionError(f"paging did not terminate: {names}")
+
+
+class TestSearchWorkflowsPaging:
+    """Test suite for keyset and page-number paging in search_workflows."""
+
+    def test_created_at_cursor_advances(self, workflow_db):
+        """Test that created_at cursors move past server-default and explicit timestamps."""
+        names = _walk(WorkflowService(), workflow_db)
+        assert names == ["s5", "s4", "s3", "s2", "s1", "s0"]
+
+    def test_created_at_cursor_ascending(self, workflow_db):
+        """Test ascending created_at paging."""
+        names = _walk(WorkflowService(), workflow_db, sort_order="asc")
+        assert names == ["s0", "s1", "s2", "s3", "s4", "s5"]
+
+    @pytest.mark.parametrize("sort_by", ["id", "name"])
+    def test_other_sort_cursors(self, workflow_db, sort_by):
+        """Test that id and name cursors page through every row once."""
+        names = _walk(WorkflowService(), workflow_db, sort_by=sort_by)
+        assert names == ["s5", "s4", "s3", "s2", "s1", "s0"]
+
+    def test_filtered_created_at_cursor(self, workflow_db):
+        """Test that filtered searches follow the cursor too."""
+        names = _walk(WorkflowService(), workflow_db, is_template=False)
+        assert names == ["s5", "s4", "s3", "s2", "s1", "s0"]
+
+    @pytest.mark.parametrize("filters", [{}, {"is_template": False}])
+    def test_page_without_cursor(self, workflow_db, filters):
+        """Test that page numbers are honoured when no cursor is sent."""
+        service = WorkflowService()
+        pages = [
+            [w.name for w in service.search_workflows(
+                workflow_db, WorkflowSearchRequest(page=page, size=2, **filters)
+            )]
+            for page in (1, 2, 3, 4)
+        ]
+        assert pages == [["s5", "s4"], ["s3", "s2"], ["s1", "s0"], []]
+
+    def test_cursor_takes_precedence_over_page(self, workflow_db):
+        """Test that page is ignored once a cursor is sent."""
+        service = WorkflowService()
+        first = service.search_workflows(workflow_db, WorkflowSearchRequest(size=2))
+        sort_value, cursor_id = service.workflow_cursor(first[-1])
+        page = service.search_workflows(workflow_db, WorkflowSearchRequest(
+            size=2, page=3, cursor_sort_value=sort_value, cursor_id=cursor_id
+        ))
+        assert [w.name for w in page] == ["s3", "s2"]
+
+
+class TestCreateWorkflowTemplate:
+    """Test suite for create_workflow_template."""
+
+    def test_duplicate_name_raises_value_error(self, workflow_db):
+        """Test that a taken name raises ValueError and leaves the session usable."""
+        service = WorkflowService()
+        template = WorkflowTemplateCreate(
+            name="s0", description="duplicate", definition=WorkflowTemplateDefinition()
+        )
+        with pytest.raises(ValueError, match="already exists"):
+            service.create_workflow_template(workflow_db, template)
+
+        created = service.create_workflow_template(
+            workflow_db, template.model_copy(update={"name": "template"})
+        )
+        assert created.is_template is True
+        assert workflow_db.query(Workflow).count() == 7
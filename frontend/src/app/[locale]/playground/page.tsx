@@ -8,7 +8,7 @@ import { v4 as uuidv4 } from 'uuid';
 
 // 定义从后端接收的 WebSocket 消息的类型
 type WebSocketMessage = {
-  type: 'token' | 'thought' | 'tool_usage' | 'end' | 'error';
+  type: 'token' | 'tokens' | 'thought' | 'tool_usage' | 'end' | 'error';
   content: string;
 };
 
@@ -54,6 +54,8 @@ export default function PlaygroundPage() {
               ];
             
             case 'token':
+            case 'tokens':
+              // Batched 'tokens' frames carry a delta and are appended the same way.
               // If the last message was from the agent and was a standard message, append the token.
               // Otherwise, create a new agent message.
               if (lastMessage?.sender === 'agent' && lastMessage?.type === 'message') {